@@ -4,8 +4,15 @@ mp3/mp4 파일 관리, 파형 생성, ffmpeg 내보내기
 실행: python app.py
 """
 
-import os, json, struct, hashlib, threading, subprocess
+import os, json, struct, hashlib, tempfile, threading, subprocess
+from collections import deque
 from flask import Flask, render_template, jsonify, request, send_file
+from project_catalog import ProjectCatalog
+from media_library import MediaLibrary
+from relink_index import RelinkIndex
+from pcm_cache import PcmCache
+import project_journal
+import silence
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 4 * 1024 * 1024 * 1024  # 4GB
@@ -49,6 +56,7 @@ def _load_settings():
     defaults = {
         'projectDir': os.path.join(WORKSPACE, '_projects'),
         'exportDir': WORKSPACE,
+        'libraryDirs': [],          # 옮겨진 미디어를 찾을 폴더 (WORKSPACE 는 항상 포함)
     }
     if os.path.exists(SETTINGS_FILE):
         try:
@@ -65,13 +73,68 @@ def _save_settings(settings):
 
 settings = _load_settings()
 # ─── 상태 ─────────────────────────────────────────────────
-files_db = {}                       # fid → file info dict
+files_db = MediaLibrary(os.path.join(WORKSPACE, '_media.sqlite'))   # fid → file info dict (영구 저장)
 export_state = {'running': False, 'progress': 0, 'message': '', 'path': ''}
 
 def _fid(path):
     return hashlib.md5(path.encode()).hexdigest()[:12]
 
+# ─── 파생 산출물: 단일 실행(single-flight) + 원자적 캐시 쓰기 ─────
+class _Flight:
+    """진행 중인 계산 1건 – 뒤따라온 요청은 event 를 기다려 결과를 공유"""
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+_inflight = {}                      # key → _Flight
+_inflight_lock = threading.Lock()
+
+def _single_flight(key, fn, *args):
+    """
+    같은 key 의 계산(파형, probe, 썸네일/프록시 등)이 이미 진행 중이면
+    새로 시작하지 않고 그 결과를 함께 받는다.
+    """
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+    if not leader:
+        flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    try:
+        flight.result = fn(*args)
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.event.set()
+
+def _atomic_write(path, data):
+    """임시 파일에 쓴 뒤 rename – 읽는 쪽은 완성된 파일만 보게 됨"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path),
+                               prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
 def _probe(path):
+    return _single_flight(('probe', path), _run_probe, path)
+
+def _run_probe(path):
     cmd = [FFPROBE, '-v', 'quiet', '-print_format', 'json',
            '-show_format', '-show_streams', path]
     try:
@@ -82,6 +145,16 @@ def _probe(path):
     except Exception:
         return None
 
+# 업로드 허용 미디어 (확장자 → MIME) – 다운로더 원본 오디오 모드의 m4a/opus/webm 포함
+MEDIA_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.mp4': 'video/mp4',
+    '.m4a': 'audio/mp4',
+    '.opus': 'audio/ogg',
+    '.ogg': 'audio/ogg',
+    '.webm': 'video/webm',
+}
+
 # ─── 라우트 ───────────────────────────────────────────────
 @app.route('/')
 def index():
@@ -93,7 +166,7 @@ def upload_files():
     for f in request.files.getlist('files'):
         name = f.filename
         ext = os.path.splitext(name)[1].lower()
-        if ext not in ('.mp3', '.mp4'):
+        if ext not in MEDIA_TYPES:
             continue
         save_path = os.path.join(WORKSPACE, name)
         base = os.path.splitext(name)[0]
@@ -103,33 +176,105 @@ def upload_files():
             i += 1
         f.save(save_path)
 
-        fid = _fid(save_path)
-        info = _probe(save_path)
-        if not info:
-            continue
+        entry = _probe_entry(save_path)
+        if entry:
+            results.append(entry)
+    files_db.put_many(results)
+    _note_fingerprints([e['path'] for e in results])
+    return jsonify(results)
 
-        fmt = info.get('format', {})
-        duration = float(fmt.get('duration', 0))
-        has_video = has_audio = False
-        width = height = 0
-        for s in info.get('streams', []):
-            ct = s.get('codec_type', '')
-            if ct == 'video' and s.get('codec_name') not in ('mjpeg', 'png'):
-                has_video = True
-                width  = int(s.get('width', 0))
-                height = int(s.get('height', 0))
-            elif ct == 'audio':
-                has_audio = True
-        if duration <= 0:
-            continue
+def _probe_entry(path):
+    """ffprobe 결과 → files_db 항목 (재생 가능한 길이가 없으면 None)"""
+    info = _probe(path)
+    if not info:
+        return None
 
-        entry = dict(id=fid, path=save_path, name=os.path.basename(save_path),
-                     duration=round(duration, 3),
-                     hasVideo=has_video, hasAudio=has_audio,
-                     width=width, height=height)
-        files_db[fid] = entry
-        results.append(entry)
-    return jsonify(results)
+    fmt = info.get('format', {})
+    duration = float(fmt.get('duration', 0))
+    has_video = has_audio = False
+    width = height = 0
+    for s in info.get('streams', []):
+        ct = s.get('codec_type', '')
+        if ct == 'video' and s.get('codec_name') not in ('mjpeg', 'png'):
+            has_video = True
+            width  = int(s.get('width', 0))
+            height = int(s.get('height', 0))
+        elif ct == 'audio':
+            has_audio = True
+    if duration <= 0:
+        return None
+
+    return dict(id=_fid(path), path=path, name=os.path.basename(path),
+                duration=round(duration, 3),
+                hasVideo=has_video, hasAudio=has_audio,
+                width=width, height=height)
+
+# ─── 다운로더 연동 (받은 파일을 복사 없이 바로 등록) ──────────
+INGEST_KEEP = 1000                  # 에디터가 놓친 등록을 따라잡을 수 있는 최근 항목 수
+_ingested = deque(maxlen=INGEST_KEEP)   # 등록 순서대로 fid – 에디터가 seq 이후 것만 가져감
+_ingest_seq = [0]                   # 지금까지 등록한 총 개수 (= 마지막 seq)
+_ingest_lock = threading.Lock()
+
+def _meta_entry(path, meta):
+    """
+    다운로더가 보낸 yt-dlp 메타 → files_db 항목 (ffprobe 생략).
+    형식이 맞지 않거나 길이를 모르면 None → ffprobe 로 대체
+    """
+    if not isinstance(meta, dict) or 'hasVideo' not in meta or 'hasAudio' not in meta:
+        return None
+    try:
+        duration = float(meta.get('duration'))
+        width = int(meta.get('width') or 0)
+        height = int(meta.get('height') or 0)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if not 0 < duration < float('inf'):
+        return None
+    return dict(id=_fid(path), path=path, name=os.path.basename(path),
+                duration=round(duration, 3),
+                hasVideo=bool(meta['hasVideo']), hasAudio=bool(meta['hasAudio']),
+                width=width, height=height)
+
+@app.route('/api/ingest', methods=['POST'])
+def ingest_file():
+    """
+    다운로더(editor_ingest.py)가 완료 파일을 알려 줌 → 그 자리에서 files_db 등록.
+    meta 에 yt-dlp 가 이미 아는 길이/스트림 정보가 있으면 ffprobe 생략,
+    파형은 파일이 아직 페이지 캐시에 있을 때 백그라운드에서 바로 생성
+    """
+    data = request.get_json(silent=True)
+    data = data if isinstance(data, dict) else {}
+    path = data.get('path')
+    path = os.path.abspath(path) if isinstance(path, str) and path else ''
+    if os.path.splitext(path)[1].lower() not in MEDIA_TYPES or not os.path.isfile(path):
+        return jsonify({'error': '지원하지 않는 파일'}), 400
+
+    entry = _meta_entry(path, data.get('meta'))
+    if entry is None:
+        entry = _probe_entry(path)
+        if not entry:
+            return jsonify({'error': '미디어 정보를 읽을 수 없습니다'}), 400
+
+    fid = entry['id']
+    files_db[fid] = entry
+    with _ingest_lock:
+        _ingested.append(fid)
+        _ingest_seq[0] += 1
+    _note_fingerprints([path])
+    if entry['hasAudio']:
+        threading.Thread(target=_warm_waveforms, args=([fid],), daemon=True).start()
+    return jsonify(entry)
+
+@app.route('/api/ingest/recent')
+def ingest_recent():
+    """after(이전 응답의 seq) 이후 등록된 파일"""
+    after = request.args.get('after', 0, type=int)
+    with _ingest_lock:
+        seq = _ingest_seq[0]
+        base = seq - len(_ingested)         # _ingested[0] 의 seq (오래된 것은 밀려남)
+        fids = list(_ingested)[max(0, after - base):] if after < seq else []
+    files = [files_db[fid] for fid in fids if fid in files_db]
+    return jsonify({'seq': seq, 'files': files})
 
 # ─── 커버 이미지 (썸네일 / 오디오 전용 배경) ──────────────
 cover_image_path = None  # 현재 설정된 커버 이미지 경로
@@ -162,7 +307,33 @@ def delete_cover():
 
 @app.route('/api/files')
 def list_files():
-    return jsonify(list(files_db.values()))
+    """
+    미디어 라이브러리 페이지.
+    ?type=video|audio&q=이름&minDuration=&maxDuration=&pending=waveform|thumbs|proxy
+     &sort=recent|name|duration&offset=0&limit=100 → {total, offset, limit, files: [...]}
+    """
+    args = request.args
+    offset = max(0, args.get('offset', 0, type=int))
+    limit = max(1, min(500, args.get('limit', 100, type=int)))
+    total, files = files_db.query(kind=args.get('type'),
+                                  search=(args.get('q') or '').strip(),
+                                  min_duration=args.get('minDuration', type=float),
+                                  max_duration=args.get('maxDuration', type=float),
+                                  pending=args.get('pending'),
+                                  sort=args.get('sort', 'recent'),
+                                  offset=offset, limit=limit)
+    for f in files:
+        f['missing'] = not os.path.exists(f['path'])
+    return jsonify({'total': total, 'offset': offset, 'limit': limit, 'files': files})
+
+@app.route('/api/files/<fid>')
+def file_info(fid):
+    """항목 1개 (+ 파생 산출물 상태)"""
+    entry = files_db.get(fid)
+    if entry is None:
+        return 'Not found', 404
+    return jsonify(dict(entry, artifacts=files_db.artifacts(fid),
+                        missing=not os.path.exists(entry['path'])))
 
 @app.route('/api/media/<fid>')
 def serve_media(fid):
@@ -170,42 +341,134 @@ def serve_media(fid):
         return 'Not found', 404
     path = files_db[fid]['path']
     ext = os.path.splitext(path)[1].lower()
-    mime = {'.mp4': 'video/mp4', '.mp3': 'audio/mpeg'}.get(ext, 'application/octet-stream')
+    mime = MEDIA_TYPES.get(ext, 'application/octet-stream')
     return send_file(path, mimetype=mime, conditional=True)
 
+# ─── 분석용 PCM 캐시 ──────────────────────────────────────
+# 파일당 1회 디코드한 mono int16 PCM 을 메모리 맵으로 공유 – 파형 등 분석기는 모두 여기서 읽음
+pcm_cache = PcmCache(os.path.join(WORKSPACE, '_pcm'), FFMPEG)
+
+def _pcm(fid):
+    """
+    files_db 항목의 PcmView (캐시 없으면 디코드) – with 로 써서 맵을 바로 닫을 것
+    (Windows 에서는 열린 맵이 캐시 정리를 막음). 디코드 실패는 RuntimeError/OSError
+    """
+    return pcm_cache.open(fid, files_db[fid]['path'])
+
+# ─── 파형 ────────────────────────────────────────────────
+WAVE_SR   = pcm_cache.rate  # 파형 분석 샘플레이트 (PCM 캐시와 같음)
+PEAK_RATE = 50      # 바이너리 파형: 초당 min/max 컬럼 수
+PEAK_NUM  = 800     # JSON 요약 파형 막대 수
+
+def _peak_columns(samples):
+    """바이너리 파형: int8 [min0, max0, min1, max1, ...] – 에디터 워커가 줌 단계별로 다운샘플링"""
+    step = WAVE_SR // PEAK_RATE
+    cols = bytearray()
+    for i in range(0, len(samples), step):
+        chunk = samples[i:i + step]
+        lo = max(-127, min(chunk) * 127 // 32767)
+        hi = max(chunk) * 127 // 32767
+        cols.append(lo & 0xFF)
+        cols.append(hi & 0xFF)
+    return bytes(cols)
+
+def _peak_summary(samples):
+    """JSON 요약 파형 막대 PEAK_NUM 개"""
+    if not samples:
+        return []
+    chunk = max(1, len(samples) // PEAK_NUM)
+    peaks = []
+    for i in range(0, len(samples), chunk):
+        part = samples[i:i + chunk]
+        peaks.append(round(max(max(part), -min(part)) / 32768.0, 4))
+    return peaks[:PEAK_NUM]
+
+def _build_waveform(fid):
+    """PCM 캐시에서 JSON 요약(<fid>.peaks.json)과 바이너리 min/max 컬럼(<fid>.peaks.bin) 생성"""
+    # 구간 memoryview 는 위 함수들 안에서만 살아 있음 → with 를 나갈 때 맵을 닫을 수 있음
+    with _pcm(fid) as pcm:
+        cols = _peak_columns(pcm.samples)
+        peaks = _peak_summary(pcm.samples)
+    _atomic_write(os.path.join(WORKSPACE, f'{fid}.peaks.bin'), cols)
+
+    result = {'peaks': peaks, 'duration': files_db[fid]['duration']}
+    _atomic_write(os.path.join(WORKSPACE, f'{fid}.peaks.json'),
+                  json.dumps(result).encode('utf-8'))
+    return result
+
+def _ensure_waveform(fid):
+    """파형 캐시 보장 – 같은 파일에 대한 동시 요청은 ffmpeg 디코드 1회를 공유"""
+    def _build_if_missing():
+        if not (os.path.exists(os.path.join(WORKSPACE, f'{fid}.peaks.bin')) and
+                os.path.exists(os.path.join(WORKSPACE, f'{fid}.peaks.json'))):
+            _build_waveform(fid)
+        files_db.set_artifact(fid, 'waveform')
+    _single_flight(('waveform', fid), _build_if_missing)
+
+def _waveform_error(fid):
+    """파형 캐시 생성 – 디코드 실패(손상 파일, 오디오 없음, ffmpeg 없음)는 JSON 오류 응답, 성공은 None"""
+    try:
+        _ensure_waveform(fid)
+    except (RuntimeError, OSError) as e:
+        return jsonify({'error': f'오디오 디코드 실패: {e}'}), 500
+    return None
+
 @app.route('/api/waveform/<fid>')
 def waveform(fid):
     if fid not in files_db:
         return 'Not found', 404
     cache = os.path.join(WORKSPACE, f'{fid}.peaks.json')
-    if os.path.exists(cache):
-        with open(cache) as fp:
-            return jsonify(json.load(fp))
-
-    path = files_db[fid]['path']
-    cmd = [FFMPEG, '-i', path, '-ac', '1', '-ar', '8000',
-           '-f', 's16le', '-acodec', 'pcm_s16le', '-v', 'quiet', 'pipe:1']
-    r = subprocess.run(cmd, capture_output=True,
-                       creationflags=subprocess.CREATE_NO_WINDOW)
-    data = r.stdout
-    samples = []
-    for i in range(0, len(data) - 1, 2):
-        samples.append(abs(struct.unpack_from('<h', data, i)[0]))
-
-    num = 800
-    if not samples:
-        peaks = []
-    else:
-        chunk = max(1, len(samples) // num)
-        peaks = []
-        for i in range(0, len(samples), chunk):
-            peaks.append(round(max(samples[i:i + chunk]) / 32768.0, 4))
-        peaks = peaks[:num]
-
-    result = {'peaks': peaks, 'duration': files_db[fid]['duration']}
-    with open(cache, 'w') as fp:
-        json.dump(result, fp)
-    return jsonify(result)
+    if not os.path.exists(cache):
+        err = _waveform_error(fid)
+        if err:
+            return err
+    with open(cache) as fp:
+        return jsonify(json.load(fp))
+
+@app.route('/api/waveform/<fid>/bin')
+def waveform_bin(fid):
+    """min/max 컬럼 바이너리 (int8 쌍, 초당 PEAK_RATE 컬럼)"""
+    if fid not in files_db:
+        return 'Not found', 404
+    cache = os.path.join(WORKSPACE, f'{fid}.peaks.bin')
+    if not os.path.exists(cache):
+        err = _waveform_error(fid)
+        if err:
+            return err
+    resp = send_file(cache, mimetype='application/octet-stream')
+    resp.headers['X-Peak-Rate'] = str(PEAK_RATE)
+    return resp
+
+# ─── 무음 감지 ───────────────────────────────────────────
+@app.route('/api/silence/<fid>')
+def detect_silence(fid):
+    """
+    PCM 캐시에서 무음 구간 찾기.
+    ?start=&end= (원본 초, 클립 트림 구간) &threshold=-40 (dB) &minSilence=0.5 &pad=0.1
+    → {fid, ranges: [[시작, 끝], ...] (원본 초), threshold, engine}
+    """
+    if fid not in files_db:
+        return 'Not found', 404
+    if not files_db[fid]['hasAudio']:
+        return jsonify({'error': '오디오가 없는 파일입니다'}), 400
+    args = request.args
+    start = max(0.0, args.get('start', 0.0, type=float))
+    end = args.get('end', type=float)
+    threshold = args.get('threshold', silence.THRESHOLD_DB, type=float)
+    min_silence = max(0.05, args.get('minSilence', silence.MIN_SILENCE, type=float))
+    pad = max(0.0, args.get('pad', silence.PAD, type=float))
+    try:
+        with _pcm(fid) as pcm:
+            window = pcm.window(start, end)
+            try:
+                base = pcm.index(start) / pcm.rate
+                ranges = silence.detect(window, pcm.rate, threshold, min_silence, pad)
+            finally:
+                window.release()
+    except (RuntimeError, OSError) as e:
+        return jsonify({'error': f'오디오 디코드 실패: {e}'}), 500
+    return jsonify({'fid': fid, 'threshold': threshold, 'engine': silence.ENGINE,
+                    'ranges': [[round(base + a, 3), round(base + b, 3)] for a, b in ranges]})
 
 # ─── 설정 API ───────────────────────────────────────
 @app.route('/api/settings', methods=['GET'])
@@ -226,6 +489,9 @@ def update_settings():
         if p:
             settings['exportDir'] = p
             os.makedirs(p, exist_ok=True)
+    if 'libraryDirs' in data:
+        settings['libraryDirs'] = [p.strip() for p in data['libraryDirs'] if p.strip()]
+        _start_relink_refresh()
     _save_settings(settings)
     return jsonify({'status': 'ok', **settings})
 
@@ -249,20 +515,122 @@ def browse_folder():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# ─── 미디어 다시 연결 (지문 인덱스) ──────────────────────
+relink = RelinkIndex(os.path.join(WORKSPACE, '_relink.sqlite'), MEDIA_TYPES)
+_relink_lock = threading.Lock()     # 폴더 훑기는 한 번에 하나만
+
+def _library_dirs():
+    return [WORKSPACE] + [d for d in settings.get('libraryDirs', []) if d != WORKSPACE]
+
+def _note_fingerprints(paths):
+    """등록된 파일 지문을 백그라운드에서 기록 (바뀌지 않은 파일은 stat 만)"""
+    if paths:
+        threading.Thread(target=relink.note, args=(list(paths),), daemon=True).start()
+
+def _refresh_relink():
+    if not _relink_lock.acquire(blocking=False):
+        return None
+    try:
+        stats = relink.refresh(_library_dirs())
+        print(f'[RELINK] 라이브러리 폴더 인덱스: {stats}', flush=True)
+        return stats
+    finally:
+        _relink_lock.release()
+
+def _start_relink_refresh():
+    threading.Thread(target=_refresh_relink, daemon=True).start()
+
+@app.route('/api/relink/rescan', methods=['POST'])
+def relink_rescan():
+    """라이브러리 폴더 다시 훑기 (바뀐 파일만 해시) → {scanned, hashed, gone}"""
+    stats = _refresh_relink()
+    if stats is None:
+        return jsonify({'status': 'busy'})
+    return jsonify(dict(stats, status='ok'))
+
 # ─── 프로젝트 저장/불러오기 ────────────────────────────
+# 프로젝트 목록 요약 인덱스 (바뀐 .meproj 만 다시 파싱)
+catalog = ProjectCatalog(os.path.join(WORKSPACE, '_projects.sqlite'))
+
 def _get_projects_dir():
     d = settings.get('projectDir', os.path.join(WORKSPACE, '_projects'))
     os.makedirs(d, exist_ok=True)
     return d
 
+def _restore_project(proj):
+    """
+    프로젝트의 미디어 파일을 files_db 에 복원하고 응답용 dict 반환.
+    없는 경로는 relink 인덱스(지문)로 옮겨진 위치를 찾아 다시 연결 (fid 는 그대로)
+    """
+    restored_files = {}
+    missing = {}                    # fid → 옛 경로
+    for fid, finfo in proj.get('files', {}).items():
+        path = finfo.get('path', '')
+        if os.path.exists(path):
+            restored_files[fid] = dict(finfo, id=fid)
+        else:
+            missing[fid] = path
+
+    relinked_files = []
+    found = relink.resolve([p for p in missing.values() if p]) if missing else {}
+    missing_files = []
+    for fid, old in missing.items():
+        finfo = proj['files'][fid]
+        new = found.get(old)
+        if new:
+            restored_files[fid] = dict(finfo, id=fid, path=new, name=os.path.basename(new))
+            relinked_files.append({'name': finfo.get('name', fid), 'from': old, 'to': new})
+        else:
+            missing_files.append(finfo.get('name', fid))
+    files_db.put_many(restored_files.values())
+    _note_fingerprints([f['path'] for f in restored_files.values()])
+
+    return {
+        'status': 'ok',
+        'name': proj.get('name', 'project'),
+        'files': restored_files,
+        'clips': proj.get('clips', []),
+        'tracks': proj.get('tracks', 1),
+        'missingFiles': missing_files,
+        'relinkedFiles': relinked_files,
+    }
+
+def _project_path(name):
+    """프로젝트 이름 → 프로젝트 폴더의 .meproj 경로"""
+    import re as _re
+    safe = _re.sub(r'[<>:"/\\|?*]', '_', name).strip() or 'project'
+    return os.path.join(_get_projects_dir(), f'{safe}.meproj')
+
+def _read_project_file(filename):
+    """
+    프로젝트 폴더의 .meproj 읽기 → (proj, error_response).
+    자동 저장 저널이 남아 있으면(비정상 종료) 재생해서 스냅샷에 합친 결과를 돌려준다
+    """
+    import re as _re
+    safe = _re.sub(r'[<>:"/\\|?*]', '_', filename).strip()
+    fpath = os.path.join(_get_projects_dir(), safe)
+    if project_journal.has_journal(fpath):
+        try:
+            proj = project_journal.compact(fpath, os.path.splitext(safe)[0])
+        except Exception as e:
+            return None, (jsonify({'error': f'자동 저장 복구 오류: {e}'}), 400)
+        catalog.record(fpath, proj)
+        return proj, None
+    if not os.path.exists(fpath):
+        return None, (jsonify({'error': '파일을 찾을 수 없습니다'}), 404)
+    try:
+        with open(fpath, 'r', encoding='utf-8') as fp:
+            return json.load(fp), None
+    except Exception as e:
+        return None, (jsonify({'error': f'파싱 오류: {e}'}), 400)
+
 @app.route('/api/project/save', methods=['POST'])
 def project_save():
     """프로젝트를 .meproj (JSON) 파일로 저장"""
     data = request.json
     name = (data.get('name') or 'project').strip()
-    import re as _re
-    safe = _re.sub(r'[<>:"/\\|?*]', '_', name).strip() or 'project'
-    proj_path = os.path.join(_get_projects_dir(), f'{safe}.meproj')
+    proj_path = _project_path(name)
+    safe = os.path.splitext(os.path.basename(proj_path))[0]
 
     # 사용 중인 파일 정보만 포함
     used_fids = set()
@@ -277,10 +645,60 @@ def project_save():
         'clips': data.get('clips', []),
         'tracks': data.get('tracks', 1),
     }
-    with open(proj_path, 'w', encoding='utf-8') as fp:
-        json.dump(proj, fp, ensure_ascii=False, indent=2)
+    # 전체 스냅샷이 최신 → 자동 저장 저널은 필요 없음
+    project_journal.replace_snapshot(proj_path, proj)
+    catalog.record(proj_path, proj)
     return jsonify({'status': 'ok', 'path': proj_path, 'name': safe})
 
+# ─── 자동 저장 (append-only 저널) ─────────────────────────
+@app.route('/api/project/journal', methods=['POST'])
+def project_journal_append():
+    """
+    편집기 자동 저장: {name, ops: [...], compact?: bool}
+    ops 를 저널에 한 줄 추가 (O(편집)), 저널이 커지거나 compact 요청이면 스냅샷에 합침
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    name = (data.get('name') or '').strip()
+    if not name:
+        return jsonify({'error': '프로젝트 이름 없음'}), 400
+    ops = data.get('ops') or []
+    if not project_journal.valid_ops(ops):
+        return jsonify({'error': '잘못된 op 형식'}), 400
+    proj_path = _project_path(name)
+    size = project_journal.append(proj_path, ops) if ops else 0
+    compacted = False
+    if data.get('compact') or size > project_journal.COMPACT_BYTES:
+        if project_journal.has_journal(proj_path):
+            proj = project_journal.compact(proj_path, name)
+            catalog.record(proj_path, proj)
+            compacted = True
+    return jsonify({'status': 'ok', 'compacted': compacted})
+
+@app.route('/api/project/recover')
+def project_recover():
+    """합쳐지지 않은 저널이 남은 프로젝트 (편집기/서버 비정상 종료) → 복구 후보"""
+    pdir = _get_projects_dir()
+    found = []
+    for fname in os.listdir(pdir):
+        if fname.endswith('.meproj' + project_journal.JOURNAL_SUFFIX):
+            proj_file = fname[:-len(project_journal.JOURNAL_SUFFIX)]
+            if project_journal.has_journal(os.path.join(pdir, proj_file)):
+                mtime = os.path.getmtime(os.path.join(pdir, fname))
+                found.append({'filename': proj_file, 'name': os.path.splitext(proj_file)[0],
+                              'modified': mtime})
+    found.sort(key=lambda x: -x['modified'])
+    return jsonify(found)
+
+@app.route('/api/project/journal/discard', methods=['POST'])
+def project_journal_discard():
+    """복구하지 않기로 한 저널 삭제"""
+    data = request.json or {}
+    import re as _re
+    safe = _re.sub(r'[<>:"/\\|?*]', '_', data.get('filename', '')).strip()
+    if safe.endswith('.meproj'):
+        project_journal.discard(os.path.join(_get_projects_dir(), safe))
+    return jsonify({'status': 'ok'})
+
 @app.route('/api/project/load', methods=['POST'])
 def project_load():
     """저장된 .meproj 파일 불러오기"""
@@ -292,81 +710,90 @@ def project_load():
     except Exception as e:
         return jsonify({'error': f'파일 파싱 오류: {e}'}), 400
 
-    # 파일 DB에 미디어 파일 복원
-    restored_files = {}
-    missing_files = []
-    for fid, finfo in proj.get('files', {}).items():
-        path = finfo.get('path', '')
-        if os.path.exists(path):
-            files_db[fid] = finfo
-            restored_files[fid] = finfo
-        else:
-            missing_files.append(finfo.get('name', fid))
-
-    return jsonify({
-        'status': 'ok',
-        'name': proj.get('name', 'project'),
-        'files': restored_files,
-        'clips': proj.get('clips', []),
-        'tracks': proj.get('tracks', 1),
-        'missingFiles': missing_files,
-    })
+    return jsonify(_restore_project(proj))
 
 @app.route('/api/project/list')
 def project_list():
-    """저장된 프로젝트 목록"""
-    projects = []
+    """
+    저장된 프로젝트 목록 (최근 수정 순).
+    ?q=검색어&offset=0&limit=50 → {total, offset, limit, projects: [...]}
+    """
     pdir = _get_projects_dir()
-    if os.path.isdir(pdir):
-        for fname in os.listdir(pdir):
-            if fname.endswith('.meproj'):
-                fpath = os.path.join(pdir, fname)
-                try:
-                    with open(fpath, 'r', encoding='utf-8') as fp:
-                        p = json.load(fp)
-                    projects.append({
-                        'name': p.get('name', fname),
-                        'filename': fname,
-                        'tracks': p.get('tracks', 0),
-                        'clips': len(p.get('clips', [])),
-                        'files': len(p.get('files', {})),
-                    })
-                except Exception:
-                    pass
-    return jsonify(projects)
+    catalog.refresh(pdir)
+    q = (request.args.get('q') or '').strip()
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = max(1, min(500, request.args.get('limit', 50, type=int)))
+    total, projects = catalog.query(pdir, q, offset, limit)
+    return jsonify({'total': total, 'offset': offset, 'limit': limit, 'projects': projects})
 
 @app.route('/api/project/open/<filename>')
 def project_open(filename):
     """서버에 저장된 프로젝트 파일 직접 열기"""
-    import re as _re
-    safe = _re.sub(r'[<>:"/\\|?*]', '_', filename).strip()
-    fpath = os.path.join(_get_projects_dir(), safe)
-    if not os.path.exists(fpath):
-        return jsonify({'error': '파일을 찾을 수 없습니다'}), 404
-    try:
-        with open(fpath, 'r', encoding='utf-8') as fp:
-            proj = json.load(fp)
-    except Exception as e:
-        return jsonify({'error': f'파싱 오류: {e}'}), 400
+    proj, err = _read_project_file(filename)
+    if err:
+        return err
+    return jsonify(_restore_project(proj))
 
-    restored_files = {}
-    missing_files = []
-    for fid, finfo in proj.get('files', {}).items():
-        path = finfo.get('path', '')
-        if os.path.exists(path):
-            files_db[fid] = finfo
-            restored_files[fid] = finfo
+# ─── 프로젝트 부트스트랩 (한 번의 요청으로 프로젝트 + 파형) ─────
+BOOTSTRAP_MAGIC = b'MEB1'
+
+def _warm_waveforms(fids):
+    """캐시 없는 파형을 백그라운드에서 순차 생성 – 한 파일의 실패는 기록만 하고 다음 파일로"""
+    for fid in fids:
+        try:
+            if fid in files_db:
+                _ensure_waveform(fid)
+        except Exception as e:
+            print(f'[WAVEFORM] {fid} 생성 실패: {e}', flush=True)
+
+def _bootstrap_response(proj):
+    """
+    바이너리 응답:  MAGIC(4) | uint32 LE 헤더 길이 | JSON 헤더 | 파형 min/max 컬럼들
+    JSON 헤더 = 프로젝트 복원 결과 + waveforms[{fid, rate, offset, length}] + pendingWaveforms
+    """
+    result = _restore_project(proj)
+    blobs, waves, pending = [], [], []
+    offset = 0
+    for fid, finfo in result['files'].items():
+        if not finfo.get('hasAudio'):
+            continue
+        cache = os.path.join(WORKSPACE, f'{fid}.peaks.bin')
+        if os.path.exists(cache):
+            with open(cache, 'rb') as fp:
+                data = fp.read()
+            waves.append({'fid': fid, 'rate': PEAK_RATE, 'offset': offset, 'length': len(data)})
+            blobs.append(data)
+            offset += len(data)
         else:
-            missing_files.append(finfo.get('name', fid))
+            pending.append(fid)
+    if pending:
+        threading.Thread(target=_warm_waveforms, args=(pending,), daemon=True).start()
+
+    result['waveforms'] = waves
+    result['pendingWaveforms'] = pending
+    header = json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    body = b''.join([BOOTSTRAP_MAGIC, struct.pack('<I', len(header)), header] + blobs)
+    return app.response_class(body, mimetype='application/octet-stream')
+
+@app.route('/api/project/bootstrap', methods=['POST'])
+def project_bootstrap_upload():
+    """업로드된 .meproj 를 프로젝트 + 파일 테이블 + 캐시된 파형과 함께 한 번에 반환"""
+    f = request.files.get('project')
+    if not f:
+        return jsonify({'error': '파일이 없습니다'}), 400
+    try:
+        proj = json.loads(f.read().decode('utf-8'))
+    except Exception as e:
+        return jsonify({'error': f'파일 파싱 오류: {e}'}), 400
+    return _bootstrap_response(proj)
 
-    return jsonify({
-        'status': 'ok',
-        'name': proj.get('name', 'project'),
-        'files': restored_files,
-        'clips': proj.get('clips', []),
-        'tracks': proj.get('tracks', 1),
-        'missingFiles': missing_files,
-    })
+@app.route('/api/project/bootstrap/<filename>')
+def project_bootstrap(filename):
+    """서버에 저장된 프로젝트를 부트스트랩 형식으로 열기"""
+    proj, err = _read_project_file(filename)
+    if err:
+        return err
+    return _bootstrap_response(proj)
 
 # ─── 내보내기 ─────────────────────────────────────────────
 @app.route('/api/export', methods=['POST'])
@@ -601,4 +1028,5 @@ if __name__ == '__main__':
     print(f'\n  🎬 Media Editor')
     print(f'  📌 {url}\n')
     threading.Timer(1.0, lambda: webbrowser.open(url)).start()
+    _start_relink_refresh()
     app.run(host='127.0.0.1', port=port, debug=False, threaded=True)
@@ -0,0 +1,169 @@
+"""
+다운로드 대역폭 스케줄러
+- 전체 대역폭 상한: 동시에 받는 항목들에 측정 속도 기준 water-filling 으로 나눠 줌
+- 호스트별 연결 수 상한: 항목마다 조각(fragment) 동시 연결 수를 빌려 가고 끝나면 반납
+- 조각 동시 연결 수 자동 조절: progress_hook 의 측정 속도로 늘려서 빨라지면 유지,
+  느려지면(서버 스로틀링 등) 줄임
+yt-dlp 는 params['ratelimit'] / params['concurrent_fragment_downloads'] 를 전송 중에 다시 읽으므로
+Lease.bind(ydl.params) 로 연결해 두면 다음 조각/포맷부터 바로 반영된다.
+GUI/yt_dlp 의존성 없음
+"""
+
+import threading
+import time
+
+DEFAULT_PER_HOST = 16       # 호스트당 최대 연결 수 (모든 항목의 조각 연결 합)
+ADJUST_INTERVAL = 2.0       # 조각 수 조절 / 대역폭 재분배 주기 (초)
+EWMA_ALPHA = 0.3
+MIN_RATE = 64 * 1024        # 항목당 최소 배분 (B/s)
+GROW_GAIN = 1.10            # 연결 +1 이 이만큼 빨라야 유지
+SHRINK_RATIO = 0.75         # 최고 속도 대비 이 아래로 떨어지면 연결 -1
+
+
+class Lease:
+    """항목 1개가 빌린 연결 / 대역폭 몫"""
+
+    def __init__(self, scheduler, host, fragments, max_fragments):
+        self.scheduler = scheduler
+        self.host = host
+        self.fragments = fragments
+        self.max_fragments = max_fragments
+        self.rate_limit = None      # 항목 전체 B/s (None = 무제한)
+        self.speed = 0.0            # EWMA 측정 속도
+        self.samples = {}           # 조각 수 → 그 설정에서 측정한 최고 속도
+        self.last_adjust = scheduler.clock()
+        self.fragmented = False     # HLS/DASH 조각 다운로드 여부 (progress 의 fragment_count 로 판별)
+        self.params = None
+
+    def bind(self, params):
+        """yt-dlp params dict 연결 (YoutubeDL 생성 직후)"""
+        self.params = params
+        self._apply()
+
+    def report(self, d):
+        """progress_hook 에서 호출 – 측정 속도 반영"""
+        if d.get('status') == 'downloading' and d.get('speed'):
+            self.scheduler._report(self, d['speed'], bool(d.get('fragment_count')))
+
+    def release(self):
+        self.scheduler._release(self)
+
+    def _apply(self):
+        if self.params is None:
+            return
+        self.params['concurrent_fragment_downloads'] = self.fragments
+        # 조각 다운로드는 ratelimit 이 연결마다 따로 적용됨 → 항목 몫을 연결 수로 나눔
+        if self.rate_limit:
+            conns = self.fragments if self.fragmented else 1
+            self.params['ratelimit'] = max(1, int(self.rate_limit / conns))
+        else:
+            self.params.pop('ratelimit', None)
+
+
+class BandwidthScheduler:
+    """모든 동시 다운로드가 공유하는 스케줄러 (스레드 안전)"""
+
+    def __init__(self, max_rate=0, per_host=DEFAULT_PER_HOST, clock=time.monotonic):
+        self.max_rate = max_rate        # 전체 상한 B/s (0 = 무제한)
+        self.per_host = per_host
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._leases = []
+        self._used = {}                 # host → 사용 중 연결 수
+
+    def set_max_rate(self, max_rate):
+        with self._cond:
+            self.max_rate = max_rate or 0
+            self._rebalance()
+
+    def acquire(self, host, want):
+        """
+        host 에 연결 1개 이상 여유가 생길 때까지 대기 후 Lease 반환.
+        처음 조각 수는 want 와 남은 연결 수 중 작은 값
+        """
+        want = max(1, want)
+        with self._cond:
+            while self._used.get(host, 0) >= self.per_host:
+                self._cond.wait()
+            free = self.per_host - self._used.get(host, 0)
+            lease = Lease(self, host, min(want, free), want)
+            self._used[host] = self._used.get(host, 0) + lease.fragments
+            self._leases.append(lease)
+            self._rebalance()
+            return lease
+
+    def _release(self, lease):
+        with self._cond:
+            if lease not in self._leases:
+                return
+            self._leases.remove(lease)
+            self._used[lease.host] -= lease.fragments
+            if not self._used[lease.host]:
+                del self._used[lease.host]
+            self._rebalance()
+            self._cond.notify_all()
+
+    def _report(self, lease, speed, fragmented):
+        with self._cond:
+            if fragmented and not lease.fragmented:
+                lease.fragmented = True
+                lease._apply()
+            lease.speed = speed if not lease.speed else \
+                EWMA_ALPHA * speed + (1 - EWMA_ALPHA) * lease.speed
+            now = self.clock()
+            if now - lease.last_adjust < ADJUST_INTERVAL:
+                return
+            lease.last_adjust = now
+            self._adjust_fragments(lease)
+            self._rebalance()
+
+    def _capped(self, lease):
+        """대역폭 몫을 거의 다 쓰는 중 → 연결을 늘려도 빨라지지 않음"""
+        return lease.rate_limit is not None and lease.speed >= 0.8 * lease.rate_limit
+
+    def _adjust_fragments(self, lease):
+        """측정 속도로 조각 연결 수 ±1 (AIMD 대신 한 단계씩 탐색)"""
+        n = lease.fragments
+        lease.samples[n] = max(lease.samples.get(n, 0), lease.speed)
+        best = max(lease.samples.values())
+        prev = lease.samples.get(n - 1)
+
+        if n > 1 and not self._capped(lease) and lease.speed < SHRINK_RATIO * best:
+            # 연결을 늘렸더니 오히려 느려짐 / 스로틀링 → 줄이고 이 항목은 더 늘리지 않음
+            lease.fragments = n - 1
+            lease.max_fragments = n - 1
+            lease.samples.pop(n, None)
+            self._used[lease.host] -= 1
+            self._cond.notify_all()
+        elif (n < lease.max_fragments and not self._capped(lease)
+              and self._used.get(lease.host, 0) < self.per_host
+              and (prev is None or lease.samples[n] >= GROW_GAIN * prev)):
+            # 직전 단계보다 확실히 빨라졌으면 한 단계 더 탐색
+            lease.fragments = n + 1
+            self._used[lease.host] = self._used.get(lease.host, 0) + 1
+
+    def _rebalance(self):
+        """전체 상한을 항목별 수요(측정 속도) 기준 water-filling 으로 분배"""
+        if not self.max_rate:
+            for lease in self._leases:
+                lease.rate_limit = None
+                lease._apply()
+            return
+        demands = []
+        for lease in self._leases:
+            if not lease.speed or self._capped(lease):
+                demand = float('inf')   # 아직 모름 / 몫이 모자람
+            else:
+                demand = max(MIN_RATE, lease.speed * 1.2)
+            demands.append((demand, lease))
+        demands.sort(key=lambda x: x[0])
+        left = float(self.max_rate)
+        for i, (demand, lease) in enumerate(demands):
+            share = left / (len(demands) - i)
+            lease.rate_limit = min(demand, share)
+            left -= lease.rate_limit
+        # 남는 몫도 고르게 얹어 줌 → 수요가 늘면 다음 재분배 때 더 받는다
+        extra = left / len(demands) if demands else 0
+        for _, lease in demands:
+            lease.rate_limit = max(MIN_RATE, lease.rate_limit + extra)
+            lease._apply()
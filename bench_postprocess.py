@@ -0,0 +1,69 @@
+"""
+후처리 분리 효과 벤치마크 (합성 플레이리스트)
+- 네트워크 단계: sleep (전송 대기 시간 모사)
+- CPU 단계: 별도 프로세스에서 바쁜 루프 (ffmpeg 변환 모사)
+인라인(항목마다 전송 → 변환) 과 PostProcessQueue 로 겹친 경우의 총 소요 시간을 비교한다.
+겹친 경우는 max(네트워크 합, CPU 합) 에 가까워야 한다.
+
+    python bench_postprocess.py --items 8 --net 0.5 --cpu 0.5
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+
+from postprocess import PostProcessQueue
+
+_BURN = 'import time,sys\nend=time.perf_counter()+float(sys.argv[1])\nwhile time.perf_counter()<end: pass'
+
+
+def _network(seconds):
+    time.sleep(seconds)
+
+
+def _cpu(seconds):
+    subprocess.run([sys.executable, '-c', _BURN, str(seconds)], check=True)
+
+
+def run_inline(items, net, cpu):
+    start = time.perf_counter()
+    for _ in range(items):
+        _network(net)
+        _cpu(cpu)
+    return time.perf_counter() - start
+
+
+def run_pipelined(items, net, cpu, workers):
+    queue = PostProcessQueue(workers)
+    start = time.perf_counter()
+    futures = []
+    for _ in range(items):
+        _network(net)
+        futures.append(queue.submit(_cpu, cpu))
+    for f in futures:
+        f.result()
+    elapsed = time.perf_counter() - start
+    queue.shutdown()
+    return elapsed
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='후처리 분리 벤치마크')
+    p.add_argument('--items', type=int, default=8)
+    p.add_argument('--net', type=float, default=0.5, help='항목당 네트워크 시간 (초)')
+    p.add_argument('--cpu', type=float, default=0.5, help='항목당 변환 시간 (초)')
+    p.add_argument('--workers', type=int, default=1, help='후처리 워커 수')
+    args = p.parse_args(argv)
+
+    net_total = args.items * args.net
+    cpu_total = args.items * args.cpu
+    inline = run_inline(args.items, args.net, args.cpu)
+    piped = run_pipelined(args.items, args.net, args.cpu, args.workers)
+    print(f"항목 {args.items}개 | 네트워크 합 {net_total:.2f}s | CPU 합 {cpu_total:.2f}s")
+    print(f"인라인   : {inline:.2f}s  (합 {net_total + cpu_total:.2f}s)")
+    print(f"후처리 큐: {piped:.2f}s  (max {max(net_total, cpu_total / args.workers):.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+다운로더 → 편집기 등록 (app.py /api/ingest)
+- 완료 파일 경로 + yt-dlp 가 이미 아는 길이/스트림 정보를 편집기 서버에 전달
+  → 편집기는 ffprobe 없이 files_db 에 등록하고 파형을 바로 생성 (파일이 페이지 캐시에 있을 때)
+- 전송은 전용 스레드 1개에서 순서대로 – 다운로드 워커는 기다리지 않음
+- 편집기가 꺼져 있으면 조용히 실패 (다운로드 결과에는 영향 없음)
+GUI/yt_dlp 의존성 없음
+"""
+
+import os
+import json
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+EDITOR_URL = 'http://127.0.0.1:5555'
+TIMEOUT = 5
+
+# progress_hook 'finished' 의 info_dict 에서 남길 필드
+FORMAT_FIELDS = ('vcodec', 'acodec', 'width', 'height')
+
+
+def _known(codec):
+    return codec not in (None, 'none')
+
+
+def format_fields(info_dict):
+    """받은 포맷 1개 요약 (info_dict 전체는 크므로 필요한 값만)"""
+    return {k: info_dict.get(k) for k in FORMAT_FIELDS}
+
+
+def media_meta(info, formats=(), audio_only=False):
+    """
+    yt-dlp info + 실제로 받은 포맷들 → 편집기 files_db 필드.
+    코덱을 모르는 경우(generic 추출기 등)는 스트림 키를 빼서 편집기가 ffprobe 하도록 둔다
+    """
+    meta = {}
+    if info.get('duration'):
+        meta['duration'] = float(info['duration'])
+    fmts = list(formats) or [format_fields(f) for f in info.get('requested_formats') or [info]]
+    if audio_only:
+        meta.update(hasVideo=False, hasAudio=True)
+    elif fmts and all(_known(f.get('vcodec')) or _known(f.get('acodec')) for f in fmts):
+        video = [f for f in fmts if _known(f.get('vcodec'))]
+        meta['hasVideo'] = bool(video)
+        meta['hasAudio'] = any(_known(f.get('acodec')) for f in fmts)
+        if video:
+            meta['width'] = video[0].get('width') or 0
+            meta['height'] = video[0].get('height') or 0
+    return meta
+
+
+class EditorIngest:
+    """편집기 서버로 완료 파일 등록 요청"""
+
+    def __init__(self, url=EDITOR_URL):
+        self.url = url.rstrip('/')
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ingest')
+
+    def submit(self, path, meta=None):
+        """등록 요청을 큐에 넣고 Future 반환 (결과: 등록된 항목 dict 또는 None)"""
+        return self._pool.submit(self._post, os.path.abspath(path), meta or {})
+
+    def _post(self, path, meta):
+        body = json.dumps({'path': path, 'meta': meta}).encode('utf-8')
+        req = urllib.request.Request(self.url + '/api/ingest', data=body,
+                                     headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=TIMEOUT) as r:
+                return json.loads(r.read().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,203 @@
+"""
+포맷 선택 인덱스 (info dict 1개당 1회 생성)
+- 영상 포맷을 높이별로 묶고 높이 목록을 정렬해 두어 "목표 해상도에 가장 가까운 포맷"을 이분 탐색으로 찾음
+- 같은 높이 안에서는 명시적인 선호 순서로 정렬:
+    병합 불필요(영상+오디오 한 파일) > 편집기/브라우저 호환 코덱(avc1 > vp9 > av01) >
+    단일 파일 전송(http/https, 분할 다운로드 가능) > fps > 비트레이트 > format_id (완전 결정적)
+- 병합이 필요하면 영상 코덱과 같은 컨테이너의 오디오(avc1 ↔ m4a, vp9 ↔ opus/webm)를 짝지어
+  ffmpeg 스트림 복사만으로 끝나게 함 (재인코딩 없음)
+- 오디오는 목적별 선호: 원본 유지 → m4a > opus, MP3 변환 → 이미 mp3 인 포맷(변환 생략) > 비트레이트
+GUI/yt_dlp 의존성 없음 – 녹화된 info JSON 으로 결과 확인:
+    python format_index.py info.json [--res 720] [--audio native|mp3]
+"""
+
+import sys
+import json
+import argparse
+import threading
+from bisect import bisect_left
+
+# 코덱 접두사 → 선호도 (클수록 우선)
+VIDEO_CODECS = (('avc1', 3), ('h264', 3), ('vp09', 2), ('vp9', 2), ('av01', 1))
+# 영상 코덱 계열 → 스트림 복사로 병합 가능한 (오디오 ext, 결과 컨테이너)
+MERGE_TARGETS = {'mp4': ('m4a', 'mp4'), 'webm': ('webm', 'webm')}
+NATIVE_AUDIO_PREFERENCE = ('m4a', 'webm', 'opus', 'ogg', 'mp3')    # 원본 유지 선호 순
+SINGLE_FILE_PROTOCOLS = ('http', 'https')
+
+_CACHE_SIZE = 32
+
+
+def _has(codec):
+    """코덱이 알려져 있고 스트림이 있음 (None = yt-dlp 가 모름 → 있다고 믿지 않음)"""
+    return codec not in (None, 'none')
+
+
+def has_audio(f):
+    """포맷에 오디오가 확실히 있음 – acodec 을 모르면(None) 병합 대상으로 본다"""
+    return _has(f.get('acodec'))
+
+
+def _num(value):
+    return value if isinstance(value, (int, float)) else 0
+
+
+def video_codec_rank(f):
+    vcodec = (f.get('vcodec') or '').lower()
+    for prefix, rank in VIDEO_CODECS:
+        if vcodec.startswith(prefix):
+            return rank
+    return 0
+
+
+def _family(f):
+    """영상 포맷의 병합 컨테이너 계열 ('mp4' / 'webm')"""
+    vcodec = (f.get('vcodec') or '').lower()
+    if f.get('ext') == 'webm' or vcodec.startswith(('vp9', 'vp09', 'vp8')):
+        return 'webm'
+    return 'mp4'
+
+
+def _video_key(f):
+    """같은 높이 안에서의 정렬 키 (클수록 우선)"""
+    return (
+        has_audio(f),                                       # 병합 불필요 (코덱을 모르면 병합 대상)
+        video_codec_rank(f),
+        f.get('protocol') in SINGLE_FILE_PROTOCOLS,
+        _num(f.get('fps')),
+        _num(f.get('tbr')) or _num(f.get('vbr')),
+        str(f.get('format_id')),
+    )
+
+
+def _audio_key(f, prefer_exts=()):
+    ext = f.get('ext')
+    ext_rank = len(prefer_exts) - prefer_exts.index(ext) if ext in prefer_exts else 0
+    return (
+        ext_rank,
+        _has(f.get('acodec')),                              # 코덱을 아는 쪽 우선
+        f.get('protocol') in SINGLE_FILE_PROTOCOLS,
+        _num(f.get('abr')) or _num(f.get('tbr')),
+        str(f.get('format_id')),
+    )
+
+
+class FormatIndex:
+    """info['formats'] → 높이별 정렬 인덱스 + 오디오 목록"""
+
+    def __init__(self, formats):
+        by_height = {}
+        audio = []
+        for f in formats or ():
+            if f.get('vcodec') != 'none' and f.get('height'):
+                by_height.setdefault(f['height'], []).append(f)
+            elif f.get('acodec') != 'none' and f.get('vcodec') == 'none':
+                audio.append(f)
+        for group in by_height.values():
+            group.sort(key=_video_key, reverse=True)
+        self.by_height = by_height
+        self.heights = sorted(by_height)
+        self.audio = audio
+
+    def nearest_height(self, target):
+        """target 과 가장 가까운 높이 (같은 거리면 낮은 쪽 – 목표보다 크게 받지 않음)"""
+        if not self.heights:
+            return None
+        i = bisect_left(self.heights, target)
+        if i == 0:
+            return self.heights[0]
+        if i == len(self.heights):
+            return self.heights[-1]
+        lo, hi = self.heights[i - 1], self.heights[i]
+        return hi if hi - target < target - lo else lo
+
+    def best_audio(self, prefer_exts=()):
+        if not self.audio:
+            return None
+        return max(self.audio, key=lambda f: _audio_key(f, tuple(prefer_exts)))
+
+    def audio_for(self, video):
+        """영상 포맷과 스트림 복사로 병합되는 오디오 (없으면 아무 최고 오디오)"""
+        audio_ext, _ = MERGE_TARGETS[_family(video)]
+        return self.best_audio((audio_ext,))
+
+    def best_video(self, target):
+        """
+        목표 해상도에 대한 선택 → {'video', 'audio', 'merge', 'container', 'height'} 또는 None.
+        merge=False 면 video 한 포맷으로 끝 (audio=None)
+        """
+        height = self.nearest_height(target)
+        if height is None:
+            return None
+        video = self.by_height[height][0]
+        if has_audio(video):
+            return {'video': video, 'audio': None, 'merge': False,
+                    'container': video.get('ext') or 'mp4', 'height': height}
+        audio = self.audio_for(video)
+        container = MERGE_TARGETS[_family(video)][1]
+        if audio is not None and MERGE_TARGETS[_family(video)][0] != audio.get('ext'):
+            container = 'mp4'   # 짝 맞는 오디오가 없음 → 기존처럼 mp4 로 병합
+        return {'video': video, 'audio': audio, 'merge': audio is not None,
+                'container': container, 'height': height}
+
+    def video_choices(self):
+        """높이별 최선 포맷 1개씩 (높은 해상도부터) – 목록 표시용"""
+        return [self.by_height[h][0] for h in reversed(self.heights)]
+
+    def audio_choices(self, limit=5, prefer_exts=()):
+        """비트레이트가 알려진 오디오 포맷 (좋은 순)"""
+        known = [f for f in self.audio if isinstance(f.get('abr'), (int, float))]
+        known.sort(key=lambda f: (_num(f.get('abr')),) + _audio_key(f, tuple(prefer_exts)),
+                   reverse=True)
+        return known[:limit]
+
+
+_cache = {}             # id(info) → (info, FormatIndex) – info 참조를 같이 잡아 id 재사용 방지
+_cache_lock = threading.Lock()
+
+
+def format_index(info):
+    """info dict 의 FormatIndex (같은 dict 는 재사용)"""
+    with _cache_lock:
+        hit = _cache.get(id(info))
+        if hit and hit[0] is info:
+            return hit[1]
+    index = FormatIndex(info.get('formats'))
+    with _cache_lock:
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+        _cache[id(info)] = (info, index)
+    return index
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='녹화된 info JSON 에 대한 포맷 선택 결과')
+    p.add_argument('info', help='yt-dlp info JSON (workspace/_ytinfo 캐시 등, .gz 가능)')
+    p.add_argument('--res', type=int, default=720)
+    p.add_argument('--audio', choices=('native', 'mp3'))
+    args = p.parse_args(argv)
+
+    if args.info.endswith('.gz'):
+        import gzip
+        with gzip.open(args.info, 'rt', encoding='utf-8') as fp:
+            info = json.load(fp)
+    else:
+        with open(args.info, encoding='utf-8') as fp:
+            info = json.load(fp)
+    info = info.get('info', info)       # info_cache 항목은 {'info': ...} 로 감싸져 있음
+    index = format_index(info)
+
+    def brief(f):
+        return f and {k: f.get(k) for k in ('format_id', 'ext', 'height', 'vcodec', 'acodec',
+                                              'fps', 'abr', 'protocol')}
+    if args.audio:
+        exts = NATIVE_AUDIO_PREFERENCE if args.audio == 'native' else ('mp3',)
+        result = brief(index.best_audio(exts))
+    else:
+        choice = index.best_video(args.res)
+        result = choice and dict(choice, video=brief(choice['video']), audio=brief(choice['audio']))
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == "__main__":
+    main()
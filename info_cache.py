@@ -0,0 +1,150 @@
+"""
+yt-dlp 메타데이터(info dict) 디스크 캐시
+영상/플레이리스트 id 기준 키, TTL 만료 + 용량 상한(LRU) 제거
+GUI/yt_dlp 의존성 없음 → 녹화된 info JSON 으로 오프라인 테스트 가능
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+
+VIDEO_TTL = 3 * 3600        # 영상 포맷 URL 은 수 시간 후 만료됨
+PLAYLIST_TTL = 6 * 3600     # flat 플레이리스트 목록
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def cache_key(url):
+    """
+    URL → 캐시 키.
+    - list= 파라미터 → 'playlist:<id>'
+    - v= 파라미터 / youtu.be/<id> / shorts/<id> → 'video:<id>'
+    - 그 외 → 'url:<sha1>'
+    """
+    parsed = urlparse(url)
+    params = parse_qs(parsed.query)
+    if 'list' in params:
+        return f"playlist:{params['list'][0]}"
+    if 'v' in params:
+        return f"video:{params['v'][0]}"
+    host = parsed.netloc.lower()
+    parts = [p for p in parsed.path.split('/') if p]
+    if host.endswith('youtu.be') and parts:
+        return f"video:{parts[0]}"
+    if len(parts) >= 2 and parts[0] in ('shorts', 'live', 'embed'):
+        return f"video:{parts[1]}"
+    return 'url:' + hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+class InfoCache:
+    """info dict 를 키별 gzip JSON 파일로 저장하는 스레드 안전 캐시"""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, clock=time.time):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(os.path.getsize(p) for p in self._files())
+
+    def _path(self, key):
+        safe = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+        kind = key.split(':', 1)[0]
+        return os.path.join(self.directory, f'{kind}_{safe}.json.gz')
+
+    def _files(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.json.gz'):
+                yield os.path.join(self.directory, name)
+
+    def get(self, key, ttl):
+        """TTL 이내의 캐시 info 반환, 없거나 만료되면 None"""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as fp:
+                    entry = json.load(fp)
+            except (OSError, ValueError):
+                return None
+            if self.clock() - entry.get('saved', 0) > ttl:
+                self._remove(path)
+                return None
+            # LRU: 최근 사용 시각 갱신
+            try:
+                now = self.clock()
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+            return entry.get('info')
+
+    def put(self, key, info):
+        """info 저장 (임시 파일 + rename), 용량 상한을 넘으면 오래된 항목부터 제거"""
+        path = self._path(key)
+        data = gzip.compress(json.dumps(
+            {'key': key, 'saved': self.clock(), 'info': info},
+            ensure_ascii=False, default=str).encode('utf-8'))
+        with self._lock:
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as fp:
+                    fp.write(data)
+                os.replace(tmp, path)
+            except OSError:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                return
+            now = self.clock()
+            os.utime(path, (now, now))
+            self._size += len(data) - old
+            if self._size > self.max_bytes:
+                self._evict(keep=path)
+
+    def invalidate(self, key):
+        """항목 삭제 (예: 캐시된 포맷 URL 로 다운로드 실패 시)"""
+        with self._lock:
+            self._remove(self._path(key))
+
+    def get_or_extract(self, key, ttl, extract):
+        """캐시 hit 이면 바로 반환, 아니면 extract() 결과를 저장 후 반환"""
+        info = self.get(key, ttl)
+        if info is None:
+            info = extract()
+            if info is not None:
+                self.put(key, info)
+        return info
+
+    def _remove(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._size -= size
+        except OSError:
+            pass
+
+    def _evict(self, keep=None):
+        """최근 사용 시각(mtime) 오래된 순으로 제거해 max_bytes 이하로"""
+        entries = []
+        for p in self._files():
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        for _, size, p in entries:
+            if self._size <= self.max_bytes:
+                break
+            if p == keep:
+                continue
+            try:
+                os.remove(p)
+                self._size -= size
+            except OSError:
+                pass
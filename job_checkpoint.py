@@ -0,0 +1,141 @@
+"""
+플레이리스트 작업 체크포인트 / 다운로드 아카이브
+- 아카이브: 저장 폴더별 완료 항목 id 목록 (yt-dlp --download-archive 와 같은 "extractor id" 줄 형식)
+  → 재시작 시 set 조회로 항목당 O(1) 건너뛰기 (메타데이터 추출도 생략)
+- 체크포인트: 작업별 항목 상태(partial/done/error) + 이어받을 임시 파일(.part/.ytdl) 목록
+두 파일 모두 한 줄씩 append → 쓰기 O(1), 비정상 종료로 잘린 마지막 줄은 열 때 잘라냄
+GUI/yt_dlp 의존성 없음
+"""
+
+import os
+import json
+import hashlib
+import threading
+import time
+
+STATE_DIR = '.ytjobs'
+
+
+def archive_id(entry, fallback_key=None):
+    """
+    항목 → 아카이브 id.
+    - flat 플레이리스트 항목 (ie_key + id) → 'youtube <id>' 형식
+    - 그 외 → fallback_key (예: info_cache.cache_key(url)), 'video:<id>' 는 같은 형식으로 맞춤
+    """
+    ie_key = entry.get('ie_key') or entry.get('extractor_key')
+    if ie_key and entry.get('id'):
+        return f"{ie_key.lower()} {entry['id']}"
+    if fallback_key and fallback_key.startswith('video:'):
+        return 'youtube ' + fallback_key[len('video:'):]
+    return fallback_key or f"url {entry.get('url') or entry.get('id')}"
+
+
+def _read_lines(path):
+    try:
+        with open(path, encoding='utf-8') as fp:
+            data = fp.read()
+    except OSError:
+        return []
+    lines = data.split('\n')
+    if not data.endswith('\n'):
+        lines = lines[:-1]   # 기록 도중 끊긴 마지막 줄
+    return [ln for ln in lines if ln]
+
+
+def _repair_tail(path, chunk=64 * 1024):
+    """
+    개행으로 끝나지 않는 마지막 줄(비정상 종료로 잘린 기록)을 잘라냄.
+    그대로 두면 다음 append 가 그 조각 뒤에 이어 붙어 새 기록까지 읽을 수 없게 된다
+    """
+    try:
+        fp = open(path, 'r+b')
+    except OSError:
+        return
+    with fp:
+        end = fp.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        fp.seek(end - 1)
+        if fp.read(1) == b'\n':
+            return
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk)
+            fp.seek(start)
+            i = fp.read(pos - start).rfind(b'\n')
+            if i >= 0:
+                fp.truncate(start + i + 1)
+                return
+            pos = start
+        fp.truncate(0)
+
+
+class JobCheckpoint:
+    """
+    download_path/.ytjobs/ 아래 상태 파일 관리.
+    variant 는 같은 폴더라도 별개 결과물인 작업을 구분 (예: 'video-720', 'audio')
+    """
+
+    def __init__(self, download_path, variant, ids):
+        self.dir = os.path.join(download_path, STATE_DIR)
+        os.makedirs(self.dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.archive_path = os.path.join(self.dir, f'archive-{variant}.txt')
+        _repair_tail(self.archive_path)
+        self.archive = set(_read_lines(self.archive_path))
+
+        job_id = hashlib.sha1('\n'.join([variant] + sorted(ids)).encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(self.dir, f'job-{job_id}.jsonl')
+        _repair_tail(self.path)
+        self.items = {}     # id → {'status', 'files'}
+        for line in _read_lines(self.path):
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(rec, dict) or rec.get('id') is None:
+                continue        # JSON 이지만 체크포인트 기록이 아님
+            item = self.items.setdefault(rec['id'], {'status': None, 'files': []})
+            item['status'] = rec.get('status', item['status'])
+            files = rec.get('files')
+            for f in files if isinstance(files, list) else ():
+                if f not in item['files']:
+                    item['files'].append(f)
+
+    def is_done(self, aid):
+        return aid in self.archive
+
+    def partial_files(self, aid):
+        """이전 실행에서 남은 이어받기용 임시 파일 (아직 존재하는 것만)"""
+        item = self.items.get(aid)
+        if not item:
+            return []
+        return [f for f in item['files'] if os.path.exists(f)]
+
+    def mark(self, aid, status, files=()):
+        """항목 상태 기록 (done 이면 아카이브에도 추가)"""
+        rec = {'id': aid, 'status': status, 't': round(time.time(), 1)}
+        if files:
+            rec['files'] = list(files)
+        with self._lock:
+            item = self.items.setdefault(aid, {'status': None, 'files': []})
+            item['status'] = status
+            item['files'].extend(f for f in files if f not in item['files'])
+            self._append(self.path, json.dumps(rec, ensure_ascii=False))
+            if status == 'done' and aid not in self.archive:
+                self.archive.add(aid)
+                self._append(self.archive_path, aid)
+
+    def finish(self):
+        """작업이 실패 없이 끝나면 체크포인트 삭제 (아카이브는 유지)"""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _append(path, line):
+        with open(path, 'a', encoding='utf-8') as fp:
+            fp.write(line + '\n')
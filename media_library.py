@@ -0,0 +1,215 @@
+"""
+미디어 라이브러리 (SQLite) – 예전 메모리 dict files_db 대체
+- 등록한 미디어가 서버 재시작 후에도 남음 (WORKSPACE/_media.sqlite)
+- 시작할 때 전체를 읽지 않음: 항목은 처음 조회될 때 읽어 작은 LRU 캐시에 둠
+  → 항목 수만 개여도 시작 비용 0, /api/media·파형·내보내기의 반복 조회는 메모리에서
+- 목록은 종류(영상/오디오)·길이 범위·이름 검색·파생 산출물 상태로 거른 페이지 단위 조회
+- 파생 산출물(파형 / 썸네일 / 프록시) 준비 여부를 항목마다 기록
+항목 dict 형식은 기존 files_db 와 같음: id, path, name, duration, hasVideo, hasAudio, width, height
+Flask 의존성 없음
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+ARTIFACTS = ('waveform', 'thumbs', 'proxy')
+CACHE_SIZE = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    id         TEXT PRIMARY KEY,
+    path       TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    name_lc    TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    duration   REAL NOT NULL,
+    has_video  INTEGER NOT NULL,
+    has_audio  INTEGER NOT NULL,
+    width      INTEGER NOT NULL,
+    height     INTEGER NOT NULL,
+    size       INTEGER,
+    mtime_ns   INTEGER,
+    added_ns   INTEGER NOT NULL,
+    waveform   INTEGER NOT NULL DEFAULT 0,
+    thumbs     INTEGER NOT NULL DEFAULT 0,
+    proxy      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS media_recent ON media (added_ns DESC);
+CREATE INDEX IF NOT EXISTS media_kind ON media (kind, added_ns DESC);
+CREATE INDEX IF NOT EXISTS media_duration ON media (duration);
+CREATE INDEX IF NOT EXISTS media_name ON media (name_lc);
+"""
+
+_COLUMNS = 'id, path, name, duration, has_video, has_audio, width, height'
+
+# 정렬 이름 → ORDER BY
+SORTS = {
+    'recent': 'added_ns DESC, id',
+    'name': 'name_lc, id',
+    'duration': 'duration DESC, id',
+}
+
+
+def _entry(row):
+    fid, path, name, duration, has_video, has_audio, width, height = row
+    return dict(id=fid, path=path, name=name, duration=duration,
+                hasVideo=bool(has_video), hasAudio=bool(has_audio),
+                width=width, height=height)
+
+
+def _like(text):
+    """LIKE 패턴 이스케이프 (%, _ 를 글자 그대로)"""
+    return '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+class MediaLibrary:
+    """
+    files_db 자리에 그대로 쓰는 매핑 (fid in lib, lib[fid], lib.get, lib[fid] = entry).
+    스레드 안전 (연결 1개 + 락) – Flask threaded 서버에서 공유
+    """
+
+    def __init__(self, db_path, cache_size=CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')       # 쓰는 동안에도 목록 조회가 막히지 않음
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._cache = OrderedDict()                         # fid → 항목 (LRU)
+        self._cache_size = cache_size
+
+    # ─── 매핑 인터페이스 ─────────────────────────────
+    def get(self, fid, default=None):
+        """
+        항목의 복사본 – 고쳐도 캐시/DB 는 그대로 (바꾸려면 put / set_artifact).
+        캐시는 프로세스 내내 살아 있으므로 참조를 내주면 DB 와 어긋날 수 있음
+        """
+        with self._lock:
+            entry = self._cache.get(fid)
+            if entry is not None:
+                self._cache.move_to_end(fid)
+                return dict(entry)
+            row = self._db.execute(f'SELECT {_COLUMNS} FROM media WHERE id = ?',
+                                   (fid,)).fetchone()
+            if row is None:
+                return default
+            entry = _entry(row)
+            self._remember(entry)
+            return dict(entry)
+
+    def __getitem__(self, fid):
+        entry = self.get(fid)
+        if entry is None:
+            raise KeyError(fid)
+        return entry
+
+    def __contains__(self, fid):
+        return self.get(fid) is not None
+
+    def __setitem__(self, fid, entry):
+        self.put_many([dict(entry, id=fid)])
+
+    def put(self, entry):
+        self.put_many([entry])
+
+    def put_many(self, entries):
+        """
+        항목 등록/갱신 (한 트랜잭션). 같은 id 면 경로·메타만 바꾸고
+        처음 등록 시각과 산출물 상태는 유지
+        """
+        rows = []
+        now = time.time_ns()
+        for e in entries:
+            try:
+                st = os.stat(e['path'])
+                size, mtime_ns = st.st_size, st.st_mtime_ns
+            except OSError:
+                size = mtime_ns = None
+            name = e.get('name') or os.path.basename(e['path'])
+            rows.append((e['id'], e['path'], name, name.lower(),
+                         'video' if e.get('hasVideo') else 'audio',
+                         float(e.get('duration') or 0),
+                         int(bool(e.get('hasVideo'))), int(bool(e.get('hasAudio'))),
+                         int(e.get('width') or 0), int(e.get('height') or 0),
+                         size, mtime_ns, now))
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany(
+                'INSERT INTO media (id, path, name, name_lc, kind, duration, has_video, '
+                'has_audio, width, height, size, mtime_ns, added_ns) '
+                'VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?) '
+                'ON CONFLICT(id) DO UPDATE SET path=excluded.path, name=excluded.name, '
+                'name_lc=excluded.name_lc, kind=excluded.kind, duration=excluded.duration, '
+                'has_video=excluded.has_video, has_audio=excluded.has_audio, '
+                'width=excluded.width, height=excluded.height, size=excluded.size, '
+                'mtime_ns=excluded.mtime_ns', rows)
+            self._db.commit()
+            for r in rows:
+                self._remember(_entry((r[0], r[1], r[2]) + r[5:10]))
+
+    def _remember(self, entry):
+        self._cache[entry['id']] = entry
+        self._cache.move_to_end(entry['id'])
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    # ─── 파생 산출물 상태 ─────────────────────────────
+    def set_artifact(self, fid, kind, ready=True):
+        if kind not in ARTIFACTS:
+            raise ValueError(kind)
+        with self._lock:
+            self._db.execute(f'UPDATE media SET {kind} = ? WHERE id = ?', (int(ready), fid))
+            self._db.commit()
+
+    def artifacts(self, fid):
+        with self._lock:
+            row = self._db.execute(f'SELECT {", ".join(ARTIFACTS)} FROM media WHERE id = ?',
+                                   (fid,)).fetchone()
+        return dict(zip(ARTIFACTS, map(bool, row))) if row else None
+
+    # ─── 목록 ────────────────────────────────────────
+    def query(self, kind=None, search='', min_duration=None, max_duration=None,
+              pending=None, sort='recent', offset=0, limit=100):
+        """
+        거른 결과 페이지 → (전체 개수, [항목 + artifacts/added/size]).
+        kind: 'video' | 'audio', pending: 아직 준비되지 않은 산출물 이름
+        """
+        where, args = [], []
+        if kind in ('video', 'audio'):
+            where.append('kind = ?')
+            args.append(kind)
+        if search:
+            where.append("(name_lc LIKE ? ESCAPE '\\')")
+            args.append(_like(search.lower()))
+        if min_duration is not None:
+            where.append('duration >= ?')
+            args.append(float(min_duration))
+        if max_duration is not None:
+            where.append('duration <= ?')
+            args.append(float(max_duration))
+        if pending in ARTIFACTS:
+            where.append(f'{pending} = 0')
+        clause = ('WHERE ' + ' AND '.join(where)) if where else ''
+        order = SORTS.get(sort, SORTS['recent'])
+        with self._lock:
+            total = self._db.execute(f'SELECT COUNT(*) FROM media {clause}', args).fetchone()[0]
+            rows = self._db.execute(
+                f'SELECT {_COLUMNS}, added_ns, size, {", ".join(ARTIFACTS)} FROM media '
+                f'{clause} ORDER BY {order} LIMIT ? OFFSET ?',
+                args + [limit, offset]).fetchall()
+        result = []
+        for row in rows:
+            entry = _entry(row[:8])
+            entry['added'] = row[8] / 1e9
+            entry['size'] = row[9]
+            entry['artifacts'] = dict(zip(ARTIFACTS, map(bool, row[10:])))
+            result.append(entry)
+        return total, result
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM media').fetchone()[0]
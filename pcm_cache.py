@@ -0,0 +1,165 @@
+"""
+분석용 PCM 캐시 (미디어 파일당 1회 디코드 → 메모리 맵 파일)
+- 오디오를 ANALYSIS_RATE mono int16 (호스트 바이트 순서) 로 한 번만 디코드해 <key>.<rate>.s16 에 저장
+- 파형·무음 감지·음량 등 분석기는 open() 으로 받은 PcmView 의 memoryview 를 그대로 읽음
+  → 구간 읽기(window)는 복사 없이 mmap 의 일부를 가리킴, 페이지 캐시는 프로세스 간에도 공유
+- 원본이 캐시보다 새로우면 다시 디코드
+- 캐시 폴더 전체가 max_bytes 를 넘으면 오래 안 쓴 파일부터 삭제 (open 할 때마다 mtime 갱신 = LRU)
+- 같은 key 의 동시 open 은 디코드 1회를 공유
+Flask 의존성 없음
+"""
+
+import os
+import sys
+import mmap
+import subprocess
+import threading
+
+FFMPEG = 'ffmpeg'
+_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)   # Windows 콘솔 창 숨김
+
+ANALYSIS_RATE = 8000                # 분석용 샘플레이트 (파형/무음 감지에 충분)
+CACHE_BYTES = 2 * 1024 ** 3         # 약 37시간 분량
+_SUFFIX = '.s16'
+_PCM_FORMAT = 's16le' if sys.byteorder == 'little' else 's16be'     # memoryview 'h' 와 같은 순서
+
+
+class PcmView:
+    """
+    캐시 파일 1개의 읽기 전용 맵. samples 는 int16 memoryview (전체),
+    window(start, end) 는 초 단위 구간의 memoryview (복사 없음)
+    """
+
+    def __init__(self, path, rate):
+        self.path = path
+        self.rate = rate
+        size = os.path.getsize(path) // 2 * 2
+        if size:
+            with open(path, 'rb') as fp:
+                self._map = mmap.mmap(fp.fileno(), size, access=mmap.ACCESS_READ)
+            self.samples = memoryview(self._map).cast('h')
+        else:
+            self._map = None
+            self.samples = memoryview(b'').cast('h')
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.rate
+
+    def index(self, sec):
+        """초 → 샘플 위치 (범위 안으로 자름)"""
+        return min(len(self.samples), max(0, int(round(sec * self.rate))))
+
+    def window(self, start, end=None):
+        """start~end 초 구간 (end 생략 시 끝까지)"""
+        stop = len(self.samples) if end is None else self.index(end)
+        return self.samples[self.index(start):stop]
+
+    def close(self):
+        """맵 해제 – window() 로 받은 memoryview 를 먼저 release 해야 함"""
+        self.samples.release()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PcmCache:
+    """스레드 안전 – Flask threaded 서버와 백그라운드 파형 생성이 공유"""
+
+    def __init__(self, cache_dir, ffmpeg=FFMPEG, rate=ANALYSIS_RATE, max_bytes=CACHE_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.ffmpeg = ffmpeg
+        self.rate = rate
+        self.max_bytes = max_bytes
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f'{key}.{self.rate}{_SUFFIX}')
+
+    def _lock(self, key):
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _fresh(self, cache, source):
+        try:
+            return os.path.getmtime(cache) >= os.path.getmtime(source)
+        except OSError:
+            return False
+
+    def open(self, key, source):
+        """key 의 PCM 맵 (없거나 원본보다 오래됐으면 source 를 디코드)"""
+        cache = self.path_for(key)
+        with self._lock(key):
+            if self._fresh(cache, source):
+                os.utime(cache)             # LRU: 최근 사용 표시
+            else:
+                self._decode(source, cache)
+                self._evict(keep=cache)
+            return PcmView(cache, self.rate)
+
+    def _decode(self, source, cache):
+        """
+        ffmpeg → 임시 파일 → rename (메모리에 전체를 올리지 않음).
+        실패(ffmpeg 없음, 파일 잠김, 오디오 스트림 없음 등)는 캐시를 남기지 않고 RuntimeError/OSError
+        → 다음 open 에서 다시 시도
+        """
+        tmp = cache + '.tmp'
+        cmd = [self.ffmpeg, '-y', '-v', 'error', '-i', source, '-vn', '-ac', '1',
+               '-ar', str(self.rate), '-f', _PCM_FORMAT, '-acodec', 'pcm_' + _PCM_FORMAT, tmp]
+        try:
+            r = subprocess.run(cmd, capture_output=True, creationflags=_NO_WINDOW)
+            if r.returncode != 0 or not os.path.exists(tmp):
+                raise RuntimeError(r.stderr.decode('utf-8', 'replace').strip()
+                                   or f'PCM 디코드 실패: {source}')
+            os.replace(tmp, cache)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _evict(self, keep=None):
+        """캐시 합계가 max_bytes 이하가 될 때까지 오래 안 쓴 파일 삭제 → 삭제한 수"""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for e in it:
+                if e.name.endswith(_SUFFIX) and e.is_file():
+                    st = e.stat()
+                    entries.append((st.st_mtime, e.path, st.st_size))
+                    total += st.st_size
+        removed = 0
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)             # Windows 에서 맵이 열려 있으면 실패 → 다음 기회에
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def usage(self):
+        """(파일 수, 합계 바이트)"""
+        count = total = 0
+        with os.scandir(self.cache_dir) as it:
+            for e in it:
+                if e.name.endswith(_SUFFIX) and e.is_file():
+                    count += 1
+                    total += e.stat().st_size
+        return count, total
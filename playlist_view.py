@@ -0,0 +1,203 @@
+"""
+가상화 플레이리스트 체크 목록 (수천~수만 항목용)
+- 보이는 줄 수만큼의 캔버스 아이템만 만들어 두고 스크롤 시 내용만 바꿔 재사용
+  → 항목 수와 관계없이 생성/스크롤 비용이 화면 높이에 비례
+- 선택 상태는 bytearray (항목당 1바이트) → 전체 선택/해제는 슬라이스 대입 한 번,
+  선택 수는 따로 세어 두어 레이블 갱신 O(1)
+- 상태 아이콘 갱신은 배열만 바꾸고 화면에 보이는 줄일 때만 다시 그림
+클릭: 체크 토글, Shift+클릭: 마지막 클릭 항목부터 범위를 같은 값으로
+"""
+
+import tkinter as tk
+import customtkinter as ctk
+
+ROW_HEIGHT = 24
+UNIT = ROW_HEIGHT // 4          # yview_scroll 'units' 1칸 (px)
+BOX = 14                        # 체크 상자 크기
+FONT = ("Consolas", -13)
+DEFAULT_ICON = "⏳"
+
+
+class VirtualCheckList(ctk.CTkFrame):
+    """CTkScrollableFrame + 항목별 CTkCheckBox 대체"""
+
+    def __init__(self, master, height=250, bg="#16213e", text_color="#a0a0b8",
+                 check_color="#5b21b6", border_color="#0f3460", on_change=None, **kw):
+        super().__init__(master, fg_color="transparent", **kw)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.text_color = text_color
+        self.check_color = check_color
+        self.border_color = border_color
+        self.on_change = on_change or (lambda: None)
+
+        self.canvas = tk.Canvas(self, height=height, bg=bg, highlightthickness=0, bd=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.titles = []
+        self.selected = bytearray()
+        self.selected_count = 0
+        self.status = []            # 항목별 (아이콘, 색) – None 이면 기본
+        self._num_width = 3
+        self._offset = 0            # 맨 위에서 스크롤된 px
+        self._pool = []             # 줄마다 (상자, 체크, 텍스트) 캔버스 아이템 id
+        self._anchor = None         # Shift+클릭 범위 시작
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Shift-Button-1>", self._on_shift_click)
+
+    # ─── 데이터 ───
+
+    def set_items(self, titles, selected=True):
+        """목록 교체 (전체 선택 상태로 시작)"""
+        self.titles = list(titles)
+        n = len(self.titles)
+        self.selected = bytearray(b'\x01' if selected else b'\x00') * n
+        self.selected_count = n if selected else 0
+        self.status = [None] * n
+        self._num_width = max(3, len(str(n)))
+        self._offset = 0
+        self._anchor = None
+        self._redraw()
+        self.on_change()
+
+    def __len__(self):
+        return len(self.titles)
+
+    def set_all(self, value):
+        n = len(self.titles)
+        self.selected[:] = (b'\x01' if value else b'\x00') * n
+        self.selected_count = n if value else 0
+        self._redraw()
+        self.on_change()
+
+    def set_selected(self, idx, value):
+        value = 1 if value else 0
+        if self.selected[idx] != value:
+            self.selected[idx] = value
+            self.selected_count += 1 if value else -1
+            self._redraw_row(idx)
+
+    def selected_indices(self):
+        return [i for i, v in enumerate(self.selected) if v]
+
+    def set_status(self, idx, icon, color, title=None):
+        """항목 상태 표시 – 화면 밖 항목은 배열만 갱신"""
+        if not 0 <= idx < len(self.titles):
+            return
+        self.status[idx] = (icon, color)
+        if title:
+            self.titles[idx] = title
+        self._redraw_row(idx)
+
+    # ─── 스크롤 ───
+
+    def _view_height(self):
+        return max(1, self.canvas.winfo_height())
+
+    def _max_offset(self):
+        return max(0, len(self.titles) * ROW_HEIGHT - self._view_height())
+
+    def yview(self, *args):
+        """스크롤바 command – ('moveto', f) / ('scroll', n, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            offset = float(args[1]) * len(self.titles) * ROW_HEIGHT
+        elif args[0] == 'scroll':
+            step = UNIT if args[2] == 'units' else max(ROW_HEIGHT, self._view_height() - ROW_HEIGHT)
+            offset = self._offset + int(args[1]) * step
+        else:
+            return
+        self._scroll_to(offset)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    def _scroll_to(self, offset):
+        offset = int(min(max(0, offset), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._redraw()
+
+    # ─── 그리기 ───
+
+    def _on_resize(self, event=None):
+        need = self._view_height() // ROW_HEIGHT + 2
+        c = self.canvas
+        while len(self._pool) < need:
+            box = c.create_rectangle(0, 0, BOX, BOX, width=2)
+            mark = c.create_text(0, 0, text="✓", fill="#ffffff", font=FONT)
+            text = c.create_text(0, 0, anchor="w", font=FONT)
+            self._pool.append((box, mark, text))
+        self._scroll_to(self._offset)
+        self._redraw()
+
+    def _redraw(self):
+        """보이는 줄만 pool 아이템으로 다시 그림"""
+        first = self._offset // ROW_HEIGHT
+        for k in range(len(self._pool)):
+            self._draw_slot(k, first + k)
+        total = len(self.titles) * ROW_HEIGHT
+        if total <= 0:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self._offset / total,
+                               min(1.0, (self._offset + self._view_height()) / total))
+
+    def _redraw_row(self, idx):
+        k = idx - self._offset // ROW_HEIGHT
+        if 0 <= k < len(self._pool):
+            self._draw_slot(k, idx)
+
+    def _draw_slot(self, k, idx):
+        box, mark, text = self._pool[k]
+        c = self.canvas
+        if idx >= len(self.titles):
+            for item in (box, mark, text):
+                c.itemconfigure(item, state="hidden")
+            return
+        y = idx * ROW_HEIGHT - self._offset + ROW_HEIGHT // 2
+        x = 8
+        checked = self.selected[idx]
+        c.coords(box, x, y - BOX // 2, x + BOX, y + BOX // 2)
+        c.itemconfigure(box, state="normal", outline=self.border_color,
+                        fill=self.check_color if checked else "")
+        c.coords(mark, x + BOX // 2, y)
+        c.itemconfigure(mark, state="normal" if checked else "hidden")
+        icon, color = self.status[idx] or (DEFAULT_ICON, self.text_color)
+        c.coords(text, x + BOX + 10, y)
+        c.itemconfigure(text, state="normal", fill=color,
+                        text=f"{icon}  {idx + 1:>{self._num_width}}.  {self.titles[idx]}")
+
+    # ─── 클릭 ───
+
+    def _index_at(self, y):
+        idx = (self._offset + int(y)) // ROW_HEIGHT
+        return idx if 0 <= idx < len(self.titles) else None
+
+    def _on_click(self, event):
+        idx = self._index_at(event.y)
+        if idx is None:
+            return
+        self.set_selected(idx, not self.selected[idx])
+        self._anchor = idx
+        self.on_change()
+
+    def _on_shift_click(self, event):
+        idx = self._index_at(event.y)
+        if idx is None:
+            return
+        if self._anchor is None:
+            return self._on_click(event)
+        # 범위 전체를 앵커 항목과 같은 값으로
+        lo, hi = sorted((self._anchor, idx))
+        value = self.selected[self._anchor]
+        before = sum(self.selected[lo:hi + 1])
+        self.selected[lo:hi + 1] = bytes([value]) * (hi - lo + 1)
+        self.selected_count += (hi - lo + 1 if value else 0) - before
+        self._redraw()
+        self.on_change()
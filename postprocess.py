@@ -0,0 +1,118 @@
+"""
+다운로드 후처리 (ffmpeg 병합 / 리먹스 / MP3 변환) 큐
+- 네트워크 워커가 받은 파일을 넘기고 바로 다음 항목 전송으로 돌아감
+- ffmpeg 는 각자 별도 OS 프로세스로 실행 → 워커 스레드는 대기만 하므로 GIL 과 무관하게
+  CPU 코어 수만큼 변환이 전송과 겹쳐서 진행된다
+GUI/yt_dlp 의존성 없음
+"""
+
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+FFMPEG = 'ffmpeg'
+_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)   # Windows 콘솔 창 숨김
+
+# 편집기가 그대로 여는 오디오 컨테이너 (app.py MEDIA_TYPES 와 맞춤) → 원본 모드는 변환 없이 유지
+NATIVE_AUDIO_EXTS = ('.m4a', '.mp3', '.opus', '.ogg', '.webm')
+
+# 조각 다운로드 파일명의 포맷 표시 부분 ('제목.720p.f137.mp4' → '제목.720p')
+_FORMAT_SUFFIX = re.compile(r'\.f[\w-]+\.\w+$')
+
+
+def default_workers():
+    """변환 동시 실행 수 – 코어 절반 (나머지는 네트워크/UI 몫)"""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def output_base(path):
+    """단계별 다운로드 파일 경로 → 최종 파일 경로(확장자 제외)"""
+    base = _FORMAT_SUFFIX.sub('', path)
+    return base if base != path else os.path.splitext(path)[0]
+
+
+def _ffmpeg(args, out):
+    """임시 파일로 실행 후 rename → 중간에 죽어도 반쯤 쓰인 결과 파일이 남지 않음"""
+    root, ext = os.path.splitext(out)
+    tmp = f'{root}.temp{ext}'
+    r = subprocess.run([FFMPEG, '-y', '-hide_banner', '-loglevel', 'error'] + args + [tmp],
+                       capture_output=True, creationflags=_NO_WINDOW)
+    if r.returncode != 0:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise RuntimeError(r.stderr.decode('utf-8', 'replace').strip() or 'ffmpeg 실패')
+    os.replace(tmp, out)
+    return out
+
+
+def merge_av(video, audio, out):
+    """영상 + 오디오 스트림 복사 병합 (재인코딩 없음)"""
+    return _ffmpeg(['-i', video, '-i', audio, '-map', '0:v:0', '-map', '1:a:0',
+                    '-c', 'copy'], out)
+
+
+def remux(src, out):
+    """컨테이너만 변경 (재인코딩 없음)"""
+    return _ffmpeg(['-i', src, '-map', '0', '-c', 'copy'], out)
+
+
+def extract_audio(src, out, codec='mp3', quality='192'):
+    """오디오 추출 + 인코딩 (FFmpegExtractAudio 대응)"""
+    encoders = {'mp3': 'libmp3lame', 'm4a': 'aac', 'opus': 'libopus'}
+    return _ffmpeg(['-i', src, '-vn', '-c:a', encoders.get(codec, codec),
+                    '-b:a', f'{quality}k'], out)
+
+
+def run_post(post, files):
+    """
+    후처리 1건 실행 → 최종 파일 경로 반환. 성공하면 입력 파일은 삭제.
+    post: ('merge', ext) / ('remux', ext) / ('audio', codec, quality) / ('native', ext)
+    files: 단계별로 받은 파일 (merge 는 [영상, 오디오], 오디오 실패 시 [영상])
+    """
+    kind = post[0]
+    src = files[0]
+    if kind == 'native':
+        # 원본 오디오 유지 – 편집기가 못 여는 컨테이너만 재인코딩 없이 옮겨 담음
+        if os.path.splitext(src)[1].lower() in NATIVE_AUDIO_EXTS:
+            return src
+        out = f'{output_base(src)}.{post[1]}'
+        remux(src, out)
+    elif kind == 'audio':
+        _, codec, quality = post
+        out = f'{output_base(src)}.{codec}'
+        if src.lower().endswith('.' + codec):
+            return src      # 이미 목표 코덱 → 변환 불필요
+        extract_audio(src, out, codec, quality)
+    elif kind == 'merge' and len(files) > 1:
+        out = f'{output_base(src)}.{post[1]}'
+        merge_av(src, files[1], out)
+    else:
+        out = f'{output_base(src)}.{post[1]}'
+        if out == src:
+            return src
+        remux(src, out)
+    for f in files:
+        if f != out:
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+    return out
+
+
+class PostProcessQueue:
+    """후처리 전용 작업 큐 (네트워크 워커 풀과 분리)"""
+
+    def __init__(self, workers=None):
+        self._pool = ThreadPoolExecutor(max_workers=workers or default_workers(),
+                                        thread_name_prefix='postprocess')
+
+    def submit(self, fn, *args):
+        """fn(*args) 를 후처리 워커에서 실행 (보통 run_post 를 감싼 함수)"""
+        return self._pool.submit(fn, *args)
+
+    def shutdown(self, wait=True, cancel=False):
+        self._pool.shutdown(wait=wait, cancel_futures=cancel)
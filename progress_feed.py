@@ -0,0 +1,84 @@
+"""
+진행 상황 집계기 (워커 스레드 → Tk 메인 루프)
+- 워커는 push_* 로 최신 상태만 덮어씀 (락 안에서 dict 대입 – UI 이벤트 큐에 쌓이지 않음)
+- 메인 루프가 REFRESH_HZ 주기로 drain() → 그 사이 들어온 갱신을 항목별 마지막 값 하나로 합쳐 받음
+- 전체 속도 / 남은 시간은 drain 사이 누적 용량·진행률 변화량을 EWMA 로 평활해서 계산
+GUI/yt_dlp 의존성 없음
+"""
+
+import threading
+import time
+
+REFRESH_HZ = 10
+EWMA_ALPHA = 0.3
+
+
+class ProgressAggregator:
+    """스레드 안전 – push_* 는 아무 스레드, drain 은 메인 스레드 1곳에서만"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._items = {}        # index → 마지막 item 이벤트
+        self._overall = None    # 마지막 작업 요약 (PlaylistJob.summary + total)
+        self._single = None     # 단일 다운로드 마지막 progress_hook dict
+        # 전체 속도 / ETA 추정 상태 (drain 에서만 갱신)
+        self._mark = None       # (시각, 누적 바이트, 진행률)
+        self._speed = 0.0
+        self._rate = 0.0        # 진행률 / 초
+
+    def push_item(self, ev):
+        with self._lock:
+            self._items[ev['index']] = ev
+
+    def push_overall(self, summary):
+        with self._lock:
+            self._overall = summary
+
+    def push_single(self, d):
+        with self._lock:
+            self._single = d
+
+    def reset(self):
+        """새 다운로드 시작 – 남은 갱신과 속도 추정 초기화"""
+        with self._lock:
+            self._items = {}
+            self._overall = None
+            self._single = None
+        self._mark = None
+        self._speed = 0.0
+        self._rate = 0.0
+
+    def drain(self):
+        """
+        (items, overall, single) – 지난 drain 이후 바뀐 것만, 없으면 None.
+        items 는 index 순 이벤트 목록, overall 에는 speed(평활) / eta 를 채워 넣음
+        """
+        with self._lock:
+            items, overall, single = self._items, self._overall, self._single
+            if not items and overall is None and single is None:
+                return None
+            self._items, self._overall, self._single = {}, None, None
+        if overall is not None:
+            overall = dict(overall, **self._estimate(overall))
+        return [items[i] for i in sorted(items)], overall, single
+
+    def _estimate(self, st):
+        """누적 용량 / 진행률 변화량 → 평활 속도와 남은 시간"""
+        now = self.clock()
+        if self._mark is None:
+            self._mark = (now, st['bytes'], st['fraction'])
+            return {'speed': st['speed'], 'eta': None}
+        t0, b0, f0 = self._mark
+        dt = now - t0
+        if dt > 0:
+            speed = max(0.0, (st['bytes'] - b0) / dt)
+            rate = max(0.0, (st['fraction'] - f0) / dt)
+            self._speed = speed if not self._speed else \
+                EWMA_ALPHA * speed + (1 - EWMA_ALPHA) * self._speed
+            self._rate = rate if not self._rate else \
+                EWMA_ALPHA * rate + (1 - EWMA_ALPHA) * self._rate
+            self._mark = (now, st['bytes'], st['fraction'])
+        remaining = 1.0 - st['fraction']
+        eta = remaining / self._rate if self._rate > 0 and remaining > 0 else None
+        return {'speed': self._speed or st['speed'], 'eta': eta}
@@ -0,0 +1,131 @@
+"""
+프로젝트 카탈로그 (SQLite) – /api/project/list 용 요약 인덱스
+- .meproj 마다 (폴더, 파일명, mtime_ns, 크기) + 요약(이름/트랙/클립/파일 수) 한 줄
+- refresh() 는 폴더를 scandir 로 stat 만 하고, mtime/크기가 바뀐 파일만 다시 파싱
+  → 목록 요청 비용이 "바뀐 파일 수"에 비례 (파싱 안 되는 파일도 기록해 두어 매번 다시 읽지 않음)
+- 이름/파일명 검색 + 페이지 단위 조회
+Flask 의존성 없음
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+PROJECT_EXT = '.meproj'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    dir       TEXT NOT NULL,
+    filename  TEXT NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    name      TEXT,
+    name_lc   TEXT,
+    tracks    INTEGER,
+    clips     INTEGER,
+    files     INTEGER,
+    broken    INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dir, filename)
+);
+CREATE INDEX IF NOT EXISTS projects_recent ON projects (dir, mtime_ns DESC);
+"""
+
+
+def summarize(proj, filename):
+    """프로젝트 dict → 카탈로그 요약 필드"""
+    name = proj.get('name', filename)
+    return {
+        'name': name,
+        'tracks': proj.get('tracks', 0),
+        'clips': len(proj.get('clips', [])),
+        'files': len(proj.get('files', {})),
+    }
+
+
+def _like(text):
+    """LIKE 패턴 이스케이프 (%, _ 를 글자 그대로)"""
+    return '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+class ProjectCatalog:
+    """스레드 안전 (연결 1개 + 락) – Flask threaded 서버에서 공유"""
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def refresh(self, pdir):
+        """pdir 의 .meproj 와 카탈로그 동기화 → 다시 파싱한 파일 수"""
+        pdir = os.path.abspath(pdir)
+        on_disk = {}
+        try:
+            with os.scandir(pdir) as it:
+                for e in it:
+                    if e.name.endswith(PROJECT_EXT) and e.is_file():
+                        st = e.stat()
+                        on_disk[e.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+
+        with self._lock:
+            known = {fn: (m, s) for fn, m, s in self._db.execute(
+                'SELECT filename, mtime_ns, size FROM projects WHERE dir = ?', (pdir,))}
+        changed = [fn for fn, sig in on_disk.items() if known.get(fn) != sig]
+        removed = [fn for fn in known if fn not in on_disk]
+
+        rows = []
+        for fn in changed:
+            mtime_ns, size = on_disk[fn]
+            try:
+                with open(os.path.join(pdir, fn), 'r', encoding='utf-8') as fp:
+                    summary = summarize(json.load(fp), fn)
+                broken = 0
+            except (OSError, ValueError, AttributeError, TypeError):
+                summary = {'name': fn, 'tracks': 0, 'clips': 0, 'files': 0}
+                broken = 1
+            rows.append((pdir, fn, mtime_ns, size, summary['name'], str(summary['name']).lower(),
+                         summary['tracks'], summary['clips'], summary['files'], broken))
+
+        if rows or removed:
+            with self._lock:
+                self._db.executemany('INSERT OR REPLACE INTO projects VALUES (?,?,?,?,?,?,?,?,?,?)',
+                                     rows)
+                self._db.executemany('DELETE FROM projects WHERE dir = ? AND filename = ?',
+                                     [(pdir, fn) for fn in removed])
+                self._db.commit()
+        return len(rows)
+
+    def record(self, path, proj):
+        """방금 저장한 프로젝트를 다시 파싱하지 않고 바로 반영"""
+        pdir, fn = os.path.split(os.path.abspath(path))
+        st = os.stat(path)
+        summary = summarize(proj, fn)
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO projects VALUES (?,?,?,?,?,?,?,?,?,0)',
+                             (pdir, fn, st.st_mtime_ns, st.st_size, summary['name'],
+                              str(summary['name']).lower(), summary['tracks'],
+                              summary['clips'], summary['files']))
+            self._db.commit()
+
+    def query(self, pdir, search='', offset=0, limit=50):
+        """최근 수정 순 페이지 → (전체 개수, [요약 dict])"""
+        pdir = os.path.abspath(pdir)
+        where = 'dir = ? AND broken = 0'
+        args = [pdir]
+        if search:
+            where += " AND (name_lc LIKE ? ESCAPE '\\' OR filename LIKE ? ESCAPE '\\')"
+            args += [_like(search.lower()), _like(search)]
+        with self._lock:
+            total = self._db.execute(f'SELECT COUNT(*) FROM projects WHERE {where}',
+                                     args).fetchone()[0]
+            rows = self._db.execute(
+                f'SELECT name, filename, tracks, clips, files, mtime_ns FROM projects '
+                f'WHERE {where} ORDER BY mtime_ns DESC, filename LIMIT ? OFFSET ?',
+                args + [limit, offset]).fetchall()
+        return total, [{
+            'name': name, 'filename': fn, 'tracks': tracks, 'clips': clips, 'files': files,
+            'modified': mtime_ns / 1e9,
+        } for name, fn, tracks, clips, files, mtime_ns in rows]
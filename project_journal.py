@@ -0,0 +1,229 @@
+"""
+프로젝트 자동 저장 저널 (append-only)
+- 편집기가 몇 초마다 바뀐 부분만 연산(op) 목록으로 보냄 → <프로젝트>.meproj.journal 에 한 줄씩 추가
+  → 자동 저장 비용이 타임라인 크기가 아니라 편집 크기에 비례
+- 저널이 COMPACT_BYTES 를 넘거나 편집기를 닫을 때 스냅샷(.meproj)에 합치고 저널 삭제
+- 비정상 종료 후에는 스냅샷 + 저널 재생으로 마지막 자동 저장 시점을 복구 (기록 중 잘린 마지막 줄은 무시)
+
+op 형식:
+  {"op": "reset", "name": ..., "tracks": N}   클립/파일을 비우고 다시 시작 (불러온 직후 첫 변경)
+  {"op": "file", "file": {...}}               미디어 항목 (files_db 와 같은 형식)
+  {"op": "clip", "clip": {"id": ..., ...}}    클립 추가/수정 (id 기준)
+  {"op": "del", "id": ...}                    클립 삭제
+  {"op": "tracks", "n": N}
+Flask 의존성 없음
+"""
+
+import os
+import json
+import tempfile
+import threading
+
+JOURNAL_SUFFIX = '.journal'
+COMPACT_BYTES = 256 * 1024
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock(proj_path):
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(proj_path), threading.Lock())
+
+
+def journal_path(proj_path):
+    return proj_path + JOURNAL_SUFFIX
+
+
+def empty_project(name):
+    return {'version': 1, 'name': name, 'files': {}, 'clips': [], 'tracks': 1}
+
+
+def read_snapshot(proj_path):
+    try:
+        with open(proj_path, 'r', encoding='utf-8') as fp:
+            return json.load(fp)
+    except OSError:
+        return None
+
+
+def write_snapshot(proj_path, proj):
+    """
+    스냅샷 원자적 저장 (임시 파일 → rename, 들여쓰기 없는 JSON).
+    파일 항목은 그대로 둠 – 편집기는 저널에 이미 보낸 파일을 다시 보내지 않으므로
+    지금 안 쓰는 파일도 이후 op 가 참조할 수 있다
+    """
+    data = json.dumps(proj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(proj_path) or '.',
+                               prefix=os.path.basename(proj_path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+        os.replace(tmp, proj_path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return proj
+
+
+OP_KINDS = ('reset', 'file', 'clip', 'del', 'tracks')
+
+
+def _valid_op(op):
+    if not isinstance(op, dict) or op.get('op') not in OP_KINDS:
+        return False
+    if op['op'] == 'file':
+        return isinstance(op.get('file'), dict)
+    if op['op'] == 'clip':
+        return isinstance(op.get('clip'), dict) and op['clip'].get('id') is not None
+    return True
+
+
+def valid_ops(ops):
+    """저널에 쓸 수 있는 op 목록인지 (잘못된 묶음이 저널에 들어가면 재생할 때마다 실패)"""
+    return isinstance(ops, list) and all(_valid_op(op) for op in ops)
+
+
+def apply_ops(proj, ops):
+    """op 목록을 프로젝트 dict 에 적용 (제자리 수정, 형식이 맞지 않는 op 는 건너뜀)"""
+    clips = proj.setdefault('clips', [])
+    files = proj.setdefault('files', {})
+    pos = {c.get('id'): i for i, c in enumerate(clips)
+           if isinstance(c, dict) and c.get('id') is not None}
+    if not isinstance(ops, list):
+        return proj
+    for op in ops:
+        if not _valid_op(op):
+            continue
+        kind = op.get('op')
+        if kind == 'reset':
+            clips.clear()
+            files.clear()
+            pos.clear()
+            proj['name'] = op.get('name', proj.get('name'))
+            proj['tracks'] = op.get('tracks', proj.get('tracks', 1))
+        elif kind == 'file':
+            f = op['file']
+            if f.get('id'):
+                files[f['id']] = f
+        elif kind == 'clip':
+            clip = op['clip']
+            i = pos.get(clip['id'])
+            if i is None:
+                pos[clip['id']] = len(clips)
+                clips.append(clip)
+            else:
+                clips[i] = clip
+        elif kind == 'del':
+            i = pos.pop(op.get('id'), None)
+            if i is not None:
+                clips.pop(i)
+                pos = {c.get('id'): j for j, c in enumerate(clips)
+                       if isinstance(c, dict) and c.get('id') is not None}
+        elif kind == 'tracks':
+            proj['tracks'] = op.get('n', proj.get('tracks', 1))
+    return proj
+
+
+def _journal_batches(proj_path):
+    try:
+        with open(journal_path(proj_path), encoding='utf-8') as fp:
+            data = fp.read()
+    except OSError:
+        return []
+    lines = data.split('\n')
+    if not data.endswith('\n'):
+        lines = lines[:-1]      # 기록 도중 끊긴 마지막 줄
+    batches = []
+    for line in lines:
+        try:
+            batches.append(json.loads(line)['ops'])
+        except (ValueError, KeyError, TypeError):
+            continue
+    return batches
+
+
+def _repair_tail(path):
+    """
+    개행 없이 끝난 마지막 줄(서버가 기록 도중 죽음)을 잘라냄 – 재생에서는 어차피 무시되지만
+    그대로 두면 다음 묶음이 그 뒤에 붙어 함께 버려진다
+    """
+    try:
+        fp = open(path, 'r+b')
+    except OSError:
+        return
+    with fp:
+        end = fp.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        fp.seek(end - 1)
+        if fp.read(1) == b'\n':
+            return
+        fp.seek(0)
+        fp.truncate(fp.read().rfind(b'\n') + 1)
+
+
+def has_journal(proj_path):
+    try:
+        return os.path.getsize(journal_path(proj_path)) > 0
+    except OSError:
+        return False
+
+
+def replay(proj_path, name=None):
+    """스냅샷 + 저널 → (프로젝트 dict, 적용한 op 수)"""
+    proj = read_snapshot(proj_path) or empty_project(name or os.path.basename(proj_path))
+    count = 0
+    for ops in _journal_batches(proj_path):
+        apply_ops(proj, ops)
+        count += len(ops)
+    return proj, count
+
+
+def append(proj_path, ops):
+    """op 묶음 1줄 추가 (fsync 까지) → 저널 크기"""
+    line = json.dumps({'ops': ops}, ensure_ascii=False, separators=(',', ':')) + '\n'
+    with _lock(proj_path):
+        _repair_tail(journal_path(proj_path))
+        with open(journal_path(proj_path), 'a', encoding='utf-8') as fp:
+            fp.write(line)
+            fp.flush()
+            os.fsync(fp.fileno())
+            return fp.tell()
+
+
+def compact(proj_path, name=None):
+    """저널을 스냅샷에 합치고 저널 삭제 → 합친 프로젝트 dict"""
+    with _lock(proj_path):
+        proj, _ = replay(proj_path, name)
+        proj = write_snapshot(proj_path, proj)
+        _remove_journal(proj_path)
+        return proj
+
+
+def replace_snapshot(proj_path, proj):
+    """
+    수동 저장: 전체 스냅샷을 쓰고 저널 삭제 (같은 잠금 안에서) → proj.
+    동시에 도착한 append/compact 가 끼어들어 옛 스냅샷 + 저널로 덮어쓰거나
+    지워야 할 저널을 남기지 않게 함
+    """
+    with _lock(proj_path):
+        write_snapshot(proj_path, proj)
+        _remove_journal(proj_path)
+        return proj
+
+
+def discard(proj_path):
+    """저널 삭제 (복구하지 않기로 함)"""
+    with _lock(proj_path):
+        _remove_journal(proj_path)
+
+
+def _remove_journal(proj_path):
+    try:
+        os.remove(journal_path(proj_path))
+    except OSError:
+        pass
@@ -0,0 +1,174 @@
+"""
+미디어 다시 연결(relink) 인덱스 (SQLite) – 옮겨진 미디어 파일을 지문으로 찾기
+- 지문 = 파일 크기 + 앞/가운데/끝 SAMPLE_BYTES 씩 읽은 blake2b (파일 전체를 읽지 않음)
+- 라이브러리 폴더(settings 'libraryDirs')를 refresh() 로 훑어 두면,
+  프로젝트를 열 때 없는 경로는 폴더 탐색 없이 인덱스 조회만으로 새 경로를 찾음
+- refresh() 는 크기/mtime 이 바뀐 파일만 다시 해시, 사라진 파일은 지우지 않고 gone 표시
+  → 옮기기 전 경로의 지문이 남아 있어야 옮긴 뒤 찾을 수 있음
+- 편집기에 등록된 파일은 note() 로 지문을 바로 남김 (라이브러리 폴더 밖이어도)
+- 지문을 모르는 옛 경로는 같은 파일명이 인덱스에 딱 하나일 때만 연결
+Flask 의존성 없음
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+
+SAMPLE_BYTES = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path      TEXT PRIMARY KEY,
+    name      TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    fp        TEXT NOT NULL,
+    gone      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS files_fp ON files (fp);
+CREATE INDEX IF NOT EXISTS files_name ON files (name);
+"""
+
+
+def fingerprint(path, size=None):
+    """크기 + 앞/가운데/끝 샘플 해시 (작은 파일은 전체)"""
+    if size is None:
+        size = os.path.getsize(path)
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, 'rb') as fp:
+        if size <= SAMPLE_BYTES * 3:
+            h.update(fp.read())
+        else:
+            for pos in (0, (size - SAMPLE_BYTES) // 2, size - SAMPLE_BYTES):
+                fp.seek(pos)
+                h.update(fp.read(SAMPLE_BYTES))
+    return h.hexdigest()
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _under(root):
+    """root 아래 경로 범위 (path >= lo AND path < hi)"""
+    root = os.path.join(os.path.abspath(root), '')
+    return root, root[:-1] + chr(ord(root[-1]) + 1)
+
+
+class RelinkIndex:
+    """스레드 안전 (연결 1개 + 락) – refresh 는 백그라운드 스레드에서 돌려도 됨"""
+
+    def __init__(self, db_path, extensions=()):
+        self.extensions = tuple(extensions)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def _known(self, paths):
+        """경로들의 (size, mtime_ns) – 바뀌지 않은 파일은 다시 해시하지 않기 위해"""
+        known = {}
+        with self._lock:
+            for p in paths:
+                row = self._db.execute('SELECT size, mtime_ns FROM files WHERE path = ? '
+                                       'AND gone = 0', (p,)).fetchone()
+                if row:
+                    known[p] = row
+        return known
+
+    def _hash_changed(self, stats, known):
+        """(path → (size, mtime_ns)) 중 바뀐 것만 지문 계산 → INSERT 행들"""
+        rows = []
+        for path, sig in stats.items():
+            if known.get(path) == sig:
+                continue
+            try:
+                fp = fingerprint(path, sig[0])
+            except OSError:
+                continue
+            rows.append((path, os.path.basename(path), sig[0], sig[1], fp))
+        return rows
+
+    def _store(self, rows, gone=()):
+        if not rows and not gone:
+            return
+        with self._lock:
+            self._db.executemany('INSERT OR REPLACE INTO files VALUES (?,?,?,?,?,0)', rows)
+            self._db.executemany('UPDATE files SET gone = 1 WHERE path = ?',
+                                 [(p,) for p in gone])
+            self._db.commit()
+
+    def note(self, paths):
+        """편집기에 등록된 파일의 지문 기록 → 새로 해시한 파일 수"""
+        stats = {}
+        for p in paths:
+            p = os.path.abspath(p)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            stats[p] = (st.st_size, st.st_mtime_ns)
+        rows = self._hash_changed(stats, self._known(stats))
+        self._store(rows)
+        return len(rows)
+
+    def refresh(self, dirs):
+        """라이브러리 폴더 동기화 → {'scanned', 'hashed', 'gone'}"""
+        scanned = hashed = gone = 0
+        for root in dirs:
+            root = os.path.abspath(root)
+            if not os.path.isdir(root):
+                continue
+            stats = {}
+            for dirpath, _, filenames in os.walk(root):
+                for fn in filenames:
+                    if self.extensions and os.path.splitext(fn)[1].lower() not in self.extensions:
+                        continue
+                    path = os.path.join(dirpath, fn)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    stats[path] = (st.st_size, st.st_mtime_ns)
+            lo, hi = _under(root)
+            with self._lock:
+                known = {p: (s, m) for p, s, m in self._db.execute(
+                    'SELECT path, size, mtime_ns FROM files WHERE path >= ? AND path < ? '
+                    'AND gone = 0', (lo, hi))}
+            rows = self._hash_changed(stats, known)
+            vanished = [p for p in known if p not in stats]
+            self._store(rows, vanished)
+            scanned += len(stats)
+            hashed += len(rows)
+            gone += len(vanished)
+        return {'scanned': scanned, 'hashed': hashed, 'gone': gone}
+
+    def resolve(self, paths):
+        """
+        없는 경로들 → {옛 경로: 새 경로} (찾은 것만).
+        옛 경로의 지문과 같은 파일 중 지금 존재하고 크기가 같은 것, 없으면 유일한 같은 이름 파일
+        """
+        found = {}
+        with self._lock:
+            for old in paths:
+                row = self._db.execute('SELECT size, fp FROM files WHERE path = ?',
+                                       (os.path.abspath(old),)).fetchone()
+                if row:
+                    size, fp = row
+                    for path, in self._db.execute(
+                            'SELECT path FROM files WHERE fp = ? AND gone = 0 AND path != ?',
+                            (fp, os.path.abspath(old))).fetchall():
+                        if _size(path) == size:
+                            found[old] = path
+                            break
+                else:
+                    cands = [p for p, want in self._db.execute(
+                        'SELECT path, size FROM files WHERE name = ? AND gone = 0',
+                        (os.path.basename(old),)) if _size(p) == want]
+                    if len(cands) == 1:
+                        found[old] = cands[0]
+        return found
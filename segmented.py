@@ -0,0 +1,284 @@
+"""
+다중 연결 분할 HTTP 다운로더 (단일 파일 포맷용)
+- Content-Length 를 바이트 구간으로 나눠 여러 연결에서 동시에 받음 (Range 요청)
+- 미리 크기를 잡아 둔 .part 파일에 구간 위치 그대로 기록 (연결마다 자기 파일 핸들로 seek+write)
+- 구간별 진행을 .segments.json 에 주기적으로 저장 → 중단 후 구간 단위로 이어받기
+- Range 미지원 / 크기 미상 서버는 연결 1개 순차 다운로드로 대체
+progress_hook 은 yt-dlp 와 같은 형식의 dict 를 받는다 (status / downloaded_bytes / total_bytes / speed ...)
+GUI/yt_dlp 의존성 없음 – 단독 실행: python segmented.py URL 저장경로 [-c 연결수]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK = 256 * 1024              # 한 번에 읽어 쓰는 크기
+MIN_SEGMENT = 2 * 1024 * 1024   # 이보다 작게는 나누지 않음
+SEGMENTS_PER_CONN = 4           # 연결당 구간 수 (빨리 끝난 연결이 남은 구간을 가져감)
+SAVE_INTERVAL = 1.0             # 구간 상태 저장 주기 (초)
+REPORT_INTERVAL = 0.25          # progress_hook 호출 주기 (초)
+RETRIES = 3
+TIMEOUT = 30
+STATE_SUFFIX = '.segments.json'
+
+
+class SegmentedDownload:
+    """URL 1개 → filename. run() 은 호출한 스레드에서 끝날 때까지 블록"""
+
+    def __init__(self, url, filename, connections=4, headers=None,
+                 progress_hook=None, rate_limit=None, min_segment=MIN_SEGMENT):
+        self.url = url
+        self.filename = filename
+        self.tmpfilename = filename + '.part'
+        self.state_path = filename + STATE_SUFFIX
+        self.connections = max(1, connections)
+        self.headers = dict(headers or {})
+        self.progress_hook = progress_hook or (lambda d: None)
+        self.rate_limit = rate_limit or (lambda: None)     # 호출 시점의 전체 B/s 상한 (None = 무제한)
+        self.min_segment = min_segment
+
+        self.size = None
+        self.segments = []          # [시작, 끝(포함), 받은 바이트]
+        self._lock = threading.Lock()
+        self._abort = None          # 워커/콜백에서 난 예외 → 전체 중단
+        self._start = 0.0
+        self._resumed_bytes = 0
+        self._last_report = 0.0
+        self._last_save = 0.0
+        self._speed = 0.0
+        self._speed_mark = (0.0, 0)
+
+    # ─── 실행 ───
+
+    def run(self):
+        if os.path.exists(self.filename) and not os.path.exists(self.tmpfilename):
+            # 이미 받은 파일
+            size = os.path.getsize(self.filename)
+            self._hook('finished', downloaded_bytes=size, total_bytes=size)
+            return self.filename
+
+        self.size, ranged = self._probe()
+        if not self.size or not ranged:
+            self._download_single()
+        else:
+            self._prepare_segments()
+            self._download_segments()
+
+        os.replace(self.tmpfilename, self.filename)
+        self._remove_state()
+        self._hook('finished', downloaded_bytes=self.size or self._downloaded(),
+                   total_bytes=self.size or self._downloaded())
+        return self.filename
+
+    def _probe(self):
+        """크기와 Range 지원 여부 (bytes=0-0 요청 → 206 + Content-Range)"""
+        req = urllib.request.Request(self.url, headers=dict(self.headers, Range='bytes=0-0'))
+        with urllib.request.urlopen(req, timeout=TIMEOUT) as r:
+            if r.status == 206:
+                total = (r.headers.get('Content-Range') or '').rpartition('/')[2]
+                return (int(total) if total.isdigit() else None), True
+            length = r.headers.get('Content-Length')
+            return (int(length) if length and length.isdigit() else None), False
+
+    def _prepare_segments(self):
+        """이전 상태가 같은 크기면 이어받고, 아니면 새로 나눠 .part 를 미리 할당"""
+        state = self._load_state()
+        if state and state.get('size') == self.size and os.path.exists(self.tmpfilename):
+            self.segments = [list(s) for s in state['segments']]
+            self._resumed_bytes = self._downloaded()
+            return
+
+        count = max(1, min(self.connections * SEGMENTS_PER_CONN, self.size // self.min_segment))
+        step = -(-self.size // count)
+        self.segments = [[s, min(s + step, self.size) - 1, 0] for s in range(0, self.size, step)]
+        with open(self.tmpfilename, 'wb') as fp:
+            fp.truncate(self.size)
+        self._save_state(force=True)
+
+    def _download_segments(self):
+        pending = [i for i, (s, e, done) in enumerate(self.segments) if s + done <= e]
+        queue = list(reversed(pending))
+        self._start = time.monotonic()
+        self._speed_mark = (self._start, self._downloaded())
+        if self._resumed_bytes:
+            # 이어받기: 첫 구간 데이터를 기다리지 않고 이미 받은 만큼을 바로 알림 (속도는 아직 모름)
+            self._hook('downloading', downloaded_bytes=self._resumed_bytes, total_bytes=self.size,
+                       speed=None, eta=None, elapsed=0.0, resumed_bytes=self._resumed_bytes)
+
+        def worker():
+            with open(self.tmpfilename, 'r+b') as fp:
+                while self._abort is None:
+                    with self._lock:
+                        if not queue:
+                            return
+                        i = queue.pop()
+                    self._fetch_segment(fp, i)
+
+        workers = min(self.connections, len(pending)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(worker) for _ in range(workers)]
+            for f in futures:
+                try:
+                    f.result()
+                except BaseException as e:
+                    self._abort = self._abort or e
+        self._save_state(force=True)
+        if self._abort is not None:
+            raise self._abort
+        if any(s + done <= e for s, e, done in self.segments):
+            raise IOError('분할 다운로드 미완료 구간 있음')
+
+    def _fetch_segment(self, fp, i):
+        """구간 i 를 받은 위치부터 이어서 기록 (실패 시 RETRIES 회 재시도)"""
+        for attempt in range(RETRIES + 1):
+            start, end, done = self.segments[i]
+            if start + done > end:
+                return
+            try:
+                req = urllib.request.Request(
+                    self.url, headers=dict(self.headers, Range=f'bytes={start + done}-{end}'))
+                with urllib.request.urlopen(req, timeout=TIMEOUT) as r:
+                    if r.status != 206:
+                        raise IOError(f'Range 응답 아님: HTTP {r.status}')
+                    pos = start + done
+                    while pos <= end and self._abort is None:
+                        data = r.read(min(CHUNK, end - pos + 1))
+                        if not data:
+                            break
+                        t0 = time.monotonic()
+                        fp.seek(pos)
+                        fp.write(data)
+                        pos += len(data)
+                        with self._lock:
+                            self.segments[i][2] = pos - start
+                        self._progress()
+                        self._throttle(len(data), t0)
+                if self.segments[i][0] + self.segments[i][2] > end or self._abort is not None:
+                    return
+            except Exception:
+                if attempt == RETRIES or self._abort is not None:
+                    raise
+                time.sleep(0.5 * (attempt + 1))
+
+    def _download_single(self):
+        """Range 미지원 서버 – 연결 1개로 처음부터 순차 기록"""
+        self.segments = [[0, (self.size or 0) - 1, 0]]
+        self._start = time.monotonic()
+        req = urllib.request.Request(self.url, headers=self.headers)
+        with urllib.request.urlopen(req, timeout=TIMEOUT) as r, open(self.tmpfilename, 'wb') as fp:
+            while True:
+                data = r.read(CHUNK)
+                if not data:
+                    break
+                t0 = time.monotonic()
+                fp.write(data)
+                with self._lock:
+                    self.segments[0][2] += len(data)
+                self._progress()
+                self._throttle(len(data), t0)
+                if self._abort is not None:
+                    raise self._abort
+
+    # ─── 진행 / 속도 제한 ───
+
+    def _downloaded(self):
+        return sum(s[2] for s in self.segments)
+
+    def _progress(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_report < REPORT_INTERVAL:
+                return
+            self._last_report = now
+            got = self._downloaded()
+            t0, b0 = self._speed_mark
+            if now > t0:
+                inst = (got - b0) / (now - t0)
+                self._speed = inst if not self._speed else 0.3 * inst + 0.7 * self._speed
+            self._speed_mark = (now, got)
+        self._save_state()
+        eta = (self.size - got) / self._speed if self.size and self._speed else None
+        try:
+            self._hook('downloading', downloaded_bytes=got, total_bytes=self.size,
+                       speed=self._speed, eta=eta, elapsed=now - self._start)
+        except BaseException as e:
+            # 콜백에서 중단 요청 (작업 취소 등)
+            self._abort = e
+            raise
+
+    def _throttle(self, nbytes, t0):
+        """연결별 몫(전체 상한 / 연결 수)에 맞춰 대기"""
+        limit = self.rate_limit()
+        if not limit:
+            return
+        per_conn = limit / min(self.connections, max(1, len(self.segments)))
+        wait = nbytes / per_conn - (time.monotonic() - t0)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _hook(self, status, **kw):
+        self.progress_hook(dict(kw, status=status, filename=self.filename,
+                                tmpfilename=self.tmpfilename))
+
+    # ─── 구간 상태 파일 ───
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_save < SAVE_INTERVAL:
+                return
+            self._last_save = now
+            data = json.dumps({'url': self.url, 'size': self.size,
+                               'segments': [list(s) for s in self.segments]})
+        d = os.path.dirname(self.state_path) or '.'
+        fd, tmp = tempfile.mkstemp(dir=d, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                fp.write(data)
+            os.replace(tmp, self.state_path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _remove_state(self):
+        try:
+            os.remove(self.state_path)
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='다중 연결 분할 HTTP 다운로드')
+    p.add_argument('url')
+    p.add_argument('output')
+    p.add_argument('-c', '--connections', type=int, default=4)
+    args = p.parse_args(argv)
+
+    def hook(d):
+        if d['status'] == 'downloading':
+            total = d.get('total_bytes') or 0
+            pct = d['downloaded_bytes'] * 100 / total if total else 0
+            sys.stderr.write(f"\r{pct:5.1f}%  {(d.get('speed') or 0) / 1024 / 1024:6.2f} MB/s")
+        else:
+            sys.stderr.write('\n')
+
+    SegmentedDownload(args.url, args.output, args.connections, progress_hook=hook).run()
+
+
+if __name__ == "__main__":
+    main()
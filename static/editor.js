@@ -37,23 +37,29 @@
     canvasH: 0,
     colorIdx: 0,
   };
-  const waveforms = {}; // fileId → Float32Array peaks
+  const waveforms = {}; // fileId → { fid, rate, count, levels: Map(bucket → {rate, cols}), pending: Set }
   let clipIdSeq = 0;
-  let _dirty = true;
 
   // ════════════════════════════════════════════════════════════
   // UNDO / REDO HISTORY
   // ════════════════════════════════════════════════════════════
+  // 전체 스냅샷 대신 "바뀐 클립만" 기록하는 패치 로그.
+  // 각 항목은 { changes: [{ ref, before, after, index }], metaBefore, metaAfter } 이며
+  // before/after 는 동결된 필드 레코드(null = 없음)라 변경되지 않은 클립은 복사하지 않는다.
+  // 되돌리기/다시실행은 기록된 클립 참조에 레코드를 적용하므로 O(변경 수).
   const history = {
-    stack: [], // 스냅샷 배열
-    idx: -1, // 현재 위치
-    MAX: 80, // 최대 히스토리
+    entries: [], // 패치 항목 배열
+    idx: 0, // 적용된 항목 수 (entries[idx - 1] 이 마지막 적용 항목)
+    pending: null, // saveUndo() 이후 아직 확정되지 않은 편집
+    bytes: 0, // 추정 메모리 사용량
+    BUDGET: 4 * 1024 * 1024, // 히스토리 메모리 상한 (바이트)
     _skip: false, // undo/redo 복원 중 재기록 방지
   };
+  const REC_BYTES = 160; // 클립 레코드 1개 추정 크기
+  const ENTRY_BYTES = 96; // 항목 오버헤드 추정 크기
 
-  function _snapshotClips() {
-    return S.clips.map((c) => ({
-      id: c.id,
+  function _clipRec(c) {
+    return Object.freeze({
       fileId: c.fileId,
       track: c.track,
       offset: c.offset,
@@ -62,73 +68,141 @@
       volume: c.volume,
       speed: c.speed,
       color: c.color,
-    }));
+    });
   }
 
-  function _restoreClips(snap) {
-    S.clips = snap.clips.map((d) => {
-      const c = Object.create(Clip.prototype);
-      Object.assign(c, d);
-      return c;
-    });
-    S.tracks = snap.tracks;
-    S.selClipId = snap.selClipId;
-    clipIdSeq = snap.clipIdSeq;
-    for (const [id] of playback.audios) {
-      if (!S.clips.some((c) => c.id === id)) playback.removeClip(id);
-    }
-    updateProperties();
-    requestRender();
+  function _sameRec(a, b) {
+    if (a === b) return true;
+    if (!a || !b) return false;
+    for (const k in a) if (a[k] !== b[k]) return false;
+    return true;
+  }
+
+  function _meta() {
+    return { tracks: S.tracks, selClipId: S.selClipId, clipIdSeq };
   }
 
-  /** 변경 전 호출 – 현재 상태를 스택에 저장 */
-  function saveUndo() {
+  /**
+   * 변경 전 호출 – 이번 편집에서 바뀔 클립(들)의 현재 상태를 기록.
+   * touched: Clip | Clip[] (생략 시 전체 클립). 새로 생성되는 클립은 자동으로 감지된다.
+   */
+  function saveUndo(touched) {
     if (history._skip) return;
-    history.stack.length = history.idx + 1;
-    history.stack.push({
-      clips: _snapshotClips(),
-      tracks: S.tracks,
-      selClipId: S.selClipId,
-      clipIdSeq,
-    });
-    if (history.stack.length > history.MAX) history.stack.shift();
-    history.idx = history.stack.length - 1;
+    _commitUndo();
+    const refs = touched === undefined ? S.clips.slice() : [].concat(touched);
+    history.pending = {
+      metaBefore: _meta(),
+      seq: clipIdSeq,
+      before: refs.map((ref) => ({ ref, rec: _clipRec(ref), index: S.clips.indexOf(ref) })),
+    };
+    _updateUndoButtons();
+  }
+
+  /** 진행 중인 편집을 패치로 확정 (변경이 없으면 버림) */
+  function _commitUndo() {
+    const p = history.pending;
+    if (!p) return;
+    history.pending = null;
+
+    const changes = [];
+    for (const b of p.before) {
+      const alive = S.clips.indexOf(b.ref) >= 0;
+      const after = alive ? _clipRec(b.ref) : null;
+      const before = b.index >= 0 ? b.rec : null;
+      if (!_sameRec(before, after)) changes.push({ ref: b.ref, before, after, index: b.index });
+    }
+    // 새로 추가된 클립: id 가 편집 시작 시점의 clipIdSeq 보다 큼 (항상 끝에 push 됨)
+    for (let i = S.clips.length - 1; i >= 0 && S.clips[i].id > p.seq; i--) {
+      const c = S.clips[i];
+      if (p.before.some((b) => b.ref === c)) continue;
+      changes.push({ ref: c, before: null, after: _clipRec(c), index: i });
+    }
+    const metaAfter = _meta();
+    const mb = p.metaBefore;
+    if (!changes.length && mb.tracks === metaAfter.tracks && mb.selClipId === metaAfter.selClipId) return;
+
+    // redo 꼬리 제거
+    for (let i = history.idx; i < history.entries.length; i++) history.bytes -= history.entries[i].bytes;
+    history.entries.length = history.idx;
+
+    const bytes = ENTRY_BYTES + changes.length * 2 * REC_BYTES;
+    history.entries.push({ changes, metaBefore: mb, metaAfter, bytes });
+    history.bytes += bytes;
+    history.idx++;
+    // 메모리 상한 초과 시 가장 오래된 항목부터 제거
+    while (history.bytes > history.BUDGET && history.entries.length > 1) {
+      history.bytes -= history.entries.shift().bytes;
+      history.idx--;
+    }
+  }
+
+  function _resetHistory() {
+    history.entries = [];
+    history.idx = 0;
+    history.pending = null;
+    history.bytes = 0;
+    _updateUndoButtons();
+  }
+
+  function _detachClip(ref) {
+    const i = S.clips.indexOf(ref);
+    if (i >= 0) S.clips.splice(i, 1);
+    playback.removeClip(ref.id);
+  }
+
+  function _attachClip(ref, rec, index) {
+    Object.assign(ref, rec);
+    if (S.clips.indexOf(ref) < 0) S.clips.splice(Math.min(index, S.clips.length), 0, ref);
+  }
+
+  function _applyMeta(m) {
+    S.tracks = m.tracks;
+    S.selClipId = m.selClipId;
+    clipIdSeq = Math.max(clipIdSeq, m.clipIdSeq);
+  }
+
+  function _afterRestore() {
+    updateProperties();
+    requestRender();
     _updateUndoButtons();
   }
 
   function undo() {
+    _commitUndo();
     if (history.idx <= 0) return;
-    if (history.idx === history.stack.length - 1) {
-      history.stack.push({
-        clips: _snapshotClips(),
-        tracks: S.tracks,
-        selClipId: S.selClipId,
-        clipIdSeq,
-      });
-    }
-    history.idx--;
+    const e = history.entries[--history.idx];
     history._skip = true;
-    _restoreClips(history.stack[history.idx]);
+    for (let i = e.changes.length - 1; i >= 0; i--) {
+      const ch = e.changes[i];
+      if (!ch.before) _detachClip(ch.ref);
+      else _attachClip(ch.ref, ch.before, ch.index);
+    }
+    _applyMeta(e.metaBefore);
     history._skip = false;
-    _updateUndoButtons();
+    _afterRestore();
     $tlStatus.textContent = "되돌리기";
   }
 
   function redo() {
-    if (history.idx >= history.stack.length - 1) return;
-    history.idx++;
+    _commitUndo();
+    if (history.idx >= history.entries.length) return;
+    const e = history.entries[history.idx++];
     history._skip = true;
-    _restoreClips(history.stack[history.idx]);
+    for (const ch of e.changes) {
+      if (!ch.after) _detachClip(ch.ref);
+      else _attachClip(ch.ref, ch.after, ch.index);
+    }
+    _applyMeta(e.metaAfter);
     history._skip = false;
-    _updateUndoButtons();
+    _afterRestore();
     $tlStatus.textContent = "다시 실행";
   }
 
   function _updateUndoButtons() {
     const btnUndo = document.getElementById("btn-undo");
     const btnRedo = document.getElementById("btn-redo");
-    if (btnUndo) btnUndo.disabled = history.idx <= 0;
-    if (btnRedo) btnRedo.disabled = history.idx >= history.stack.length - 1;
+    if (btnUndo) btnUndo.disabled = history.idx <= 0 && !history.pending;
+    if (btnRedo) btnRedo.disabled = history.idx >= history.entries.length || !!history.pending;
   }
 
   // ════════════════════════════════════════════════════════════
@@ -215,7 +289,7 @@
     stop() {
       this.pause();
       S.playhead = 0;
-      requestRender();
+      requestOverlay();
     },
     seek(t) {
       const was = S.playing;
@@ -224,7 +298,7 @@
       $timecode.textContent = fmtTime(S.playhead);
       updateVideoPreview();
       if (was) this.play();
-      requestRender();
+      requestOverlay();
     },
     removeClip(id) {
       const el = this.audios.get(id);
@@ -242,7 +316,7 @@
       if (S.playhead >= total && total > 0) {
         S.playhead = total;
         this.pause();
-        requestRender();
+        requestOverlay();
         return;
       }
       // Sync audio elements
@@ -277,7 +351,7 @@
       }
       updateVideoPreview();
       $timecode.textContent = fmtTime(S.playhead);
-      requestRender();
+      requestOverlay();
       requestAnimationFrame(() => this._tick());
     },
   };
@@ -327,6 +401,9 @@
     $coverInput = document.getElementById("cover-input");
     $coverRemoveBtn = document.getElementById("btn-cover-remove");
 
+    // Waveform worker
+    _initWaveWorker();
+
     // Cover image events
     $coverInput.addEventListener("change", onCoverSelect);
     $coverRemoveBtn.addEventListener("click", onCoverRemove);
@@ -399,10 +476,13 @@
     // Canvas size
     resizeCanvas();
     window.addEventListener("resize", resizeCanvas);
-    // Render loop
-    _renderLoop();
-    // 초기 undo 스냅샷
-    saveUndo();
+    // 첫 렌더 (이후에는 변경 시에만 프레임 요청)
+    requestRender();
+    _updateUndoButtons();
+    // 다운로더가 보낸 파일 확인
+    pollIngested();
+    setInterval(pollIngested, INGEST_POLL_MS);
+    initAutosave();
     console.log("[MediaEditor] init complete, canvasW=", S.canvasW, "canvasH=", S.canvasH);
   }
 
@@ -427,18 +507,112 @@
     }
   }
 
-  async function fetchWaveform(fid) {
-    if (waveforms[fid]) return;
+  // 다운로더(ytDownloader / yt_engine --editor)가 /api/ingest 로 등록한 파일.
+  // 업로드 없이 서버의 경로를 그대로 쓰고, 파형은 서버가 이미 만들고 있다.
+  const INGEST_POLL_MS = 3000;
+  let ingestSeq = 0;
+
+  async function pollIngested() {
+    if (document.hidden) return;
     try {
-      const r = await fetch(`/api/waveform/${fid}`);
-      const d = await r.json();
-      waveforms[fid] = d.peaks || [];
-      requestRender();
-    } catch {
-      /* ignore */
+      const r = await fetch(`/api/ingest/recent?after=${ingestSeq}`);
+      const { seq, files } = await r.json();
+      ingestSeq = seq;
+      let added = 0;
+      for (const f of files) {
+        if (S.files[f.id]) continue;
+        S.files[f.id] = f;
+        addFileToProject(f);
+        if (f.hasAudio) fetchWaveform(f.id);
+        added++;
+      }
+      if (added) $tlStatus.textContent = `다운로더에서 ${added}개 파일 추가됨`;
+    } catch (e) {
+      /* 서버 재시작 중 등 – 다음 주기에 다시 시도 */
     }
   }
 
+  // ════════════════════════════════════════════════════════════
+  // WAVEFORM WORKER
+  // ════════════════════════════════════════════════════════════
+  // 다운로드·디코딩·줌 단계별 다운샘플링은 워커에서 처리하고,
+  // 메인 스레드는 (파일, 줌 bucket) 별 min/max 컬럼(Int8Array)만 받아 캐시한다.
+  let waveWorker = null;
+  const WAVE_RETRY_MAX = 4; // 파형 받기 재시도 횟수
+  const WAVE_RETRY_MS = 1000; // 첫 재시도 간격 (이후 2배씩)
+
+  function _initWaveWorker() {
+    waveWorker = new Worker("/static/waveform-worker.js");
+    waveWorker.onmessage = (e) => {
+      const m = e.data;
+      const wf = waveforms[m.fid];
+      if (!wf) return; // 그 사이 파일이 제거됨
+      if (m.type === "loaded") {
+        wf.rate = m.rate;
+        wf.count = m.count;
+        requestRender();
+      } else if (m.type === "level") {
+        wf.pending.delete(m.bucket);
+        wf.levels.set(m.bucket, { rate: m.rate, cols: m.cols });
+        requestRender();
+      } else if (m.type === "error") {
+        // 받기 실패 → 간격을 늘려 다시 시도, 다 실패하면 항목을 지워 다음 렌더에서 처음부터 다시
+        wf.retries = (wf.retries || 0) + 1;
+        if (wf.retries > WAVE_RETRY_MAX) {
+          console.warn(`[MediaEditor] waveform ${m.fid} 실패:`, m.message);
+          delete waveforms[m.fid];
+          return;
+        }
+        setTimeout(() => {
+          if (waveforms[m.fid] === wf) waveWorker.postMessage({ type: "load", fid: m.fid, url: `/api/waveform/${m.fid}/bin` });
+        }, WAVE_RETRY_MS * 2 ** (wf.retries - 1));
+      }
+    };
+  }
+
+  function fetchWaveform(fid) {
+    if (waveforms[fid]) return;
+    waveforms[fid] = { fid, rate: 0, count: 0, levels: new Map(), pending: new Set() };
+    waveWorker.postMessage({ type: "load", fid, url: `/api/waveform/${fid}/bin` });
+  }
+
+  /** 부트스트랩 응답에 포함된 min/max 컬럼을 워커에 바로 넘김 (추가 요청 없음) */
+  function seedWaveform(fid, rate, cols) {
+    if (waveforms[fid]) return;
+    waveforms[fid] = { fid, rate: 0, count: 0, levels: new Map(), pending: new Set() };
+    waveWorker.postMessage({ type: "source", fid, rate, cols }, [cols.buffer]);
+  }
+
+  function dropWaveform(fid) {
+    delete waveforms[fid];
+    waveWorker.postMessage({ type: "drop", fid });
+  }
+
+  /**
+   * 유효 줌(px/s)에 맞는 min/max 컬럼 단계 반환.
+   * 아직 없으면 워커에 요청하고, 그동안은 가장 가까운 단계로 대체.
+   */
+  function _waveLevel(wf, ppsEff) {
+    if (!wf.rate) return null;
+    const bucket = Math.min(wf.rate, 2 ** Math.floor(Math.log2(Math.max(ppsEff, 1 / 64))));
+    const lv = wf.levels.get(bucket);
+    if (lv) return lv;
+    if (!wf.pending.has(bucket)) {
+      wf.pending.add(bucket);
+      waveWorker.postMessage({ type: "level", fid: wf.fid, bucket });
+    }
+    let best = null,
+      bestD = Infinity;
+    for (const [b, l] of wf.levels) {
+      const d = Math.abs(Math.log2(b / bucket));
+      if (d < bestD) {
+        bestD = d;
+        best = l;
+      }
+    }
+    return best;
+  }
+
   function addFileToProject(file) {
     const item = document.createElement("div");
     item.className = "file-item";
@@ -465,7 +639,7 @@
     toRemove.forEach((id) => removeClip(id));
     // 파일 목록에서 제거
     delete S.files[fid];
-    delete waveforms[fid];
+    dropWaveform(fid);
     const el = $fileList.querySelector(`[data-file-id="${fid}"]`);
     if (el) el.remove();
     document.getElementById("file-count").textContent = `${Object.keys(S.files).length}개 파일`;
@@ -494,6 +668,7 @@
   // CLIPS & TRACKS
   // ════════════════════════════════════════════════════════════
   function addClipToTimeline(fileId, track = -1, offset = -1) {
+    saveUndo([]);
     if (track < 0) {
       // 빈 트랙 찾기, 없으면 마지막 트랙 뒤에 추가
       let found = -1;
@@ -513,7 +688,6 @@
       const onTr = S.clips.filter((c) => c.track === clip.track);
       clip.offset = onTr.reduce((m, c) => Math.max(m, c.offset + c.clipDuration), 0);
     }
-    saveUndo();
     S.clips.push(clip);
     S.selClipId = clip.id;
     requestRender();
@@ -522,7 +696,8 @@
   }
 
   function removeClip(id) {
-    saveUndo();
+    const target = S.clips.find((c) => c.id === id);
+    if (target) saveUndo(target);
     S.clips = S.clips.filter((c) => c.id !== id);
     playback.removeClip(id);
     if (S.selClipId === id) {
@@ -535,7 +710,7 @@
   function splitAtPlayhead(clip) {
     const t = S.playhead;
     if (t <= clip.offset || t >= clip.offset + clip.clipDuration) return;
-    saveUndo();
+    saveUndo(clip);
     const splitPt = clip.trimStart + (t - clip.offset) * clip.speed;
     const nc = clip.clone();
     nc.trimStart = splitPt;
@@ -547,7 +722,7 @@
   }
 
   function duplicateClip(clip) {
-    saveUndo();
+    saveUndo([]);
     const nc = clip.clone();
     nc.offset = clip.offset + clip.clipDuration;
     S.clips.push(nc);
@@ -555,7 +730,7 @@
   }
 
   function resetTrim(clip) {
-    saveUndo();
+    saveUndo(clip);
     clip.trimStart = 0;
     clip.trimEnd = S.files[clip.fileId].duration;
     requestRender();
@@ -563,7 +738,7 @@
   }
 
   function resetSpeed(clip) {
-    saveUndo();
+    saveUndo(clip);
     clip.speed = 1.0;
     requestRender();
     updateProperties();
@@ -647,16 +822,38 @@
   // ════════════════════════════════════════════════════════════
   // RENDERING
   // ════════════════════════════════════════════════════════════
+  // 정적 레이어(배경·트랙·클립·파형·룰러·헤더)는 오프스크린 캔버스에 캐시하고,
+  // 매 프레임에는 캐시를 한 번 복사한 뒤 재생헤드와 드래그 중인 클립만 다시 그린다.
+  const layers = {
+    static: null, // 오프스크린 캔버스
+    sctx: null,
+    staticDirty: true,
+  };
+  const waveBitmaps = new Map(); // "fileId|rate|trimS|trimE|w|h" → 파형 비트맵 캔버스
+  const WAVE_BITMAP_MAX_W = 4096; // 이보다 넓은 클립은 보이는 구간만 직접 그림
+  const WAVE_BITMAP_MAX = 256; // 캐시 항목 수 상한 (오래된 것부터 제거)
+  let _rafId = 0;
+
+  /** 정적 레이어까지 다시 그려야 하는 변경 (클립·트랙·줌·스크롤 등) */
   function requestRender() {
-    _dirty = true;
+    layers.staticDirty = true;
+    _scheduleFrame();
+  }
+
+  /** 재생헤드 / 드래그 오버레이만 바뀐 경우 – 정적 레이어 재사용 */
+  function requestOverlay() {
+    _scheduleFrame();
+  }
+
+  function _scheduleFrame() {
+    if (_rafId) return;
+    _rafId = requestAnimationFrame(_renderLoop);
   }
 
   function _renderLoop() {
-    if (_dirty) {
-      _dirty = false;
-      render();
-    }
-    requestAnimationFrame(_renderLoop);
+    // 변경이 있을 때만 프레임 요청 → 유휴 상태에서는 루프가 돌지 않음
+    _rafId = 0;
+    render();
   }
 
   function resizeCanvas() {
@@ -670,98 +867,140 @@
     $c.style.width = rect.width + "px";
     $c.style.height = rect.height + "px";
     ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    if (!layers.static) {
+      layers.static = document.createElement("canvas");
+      layers.sctx = layers.static.getContext("2d");
+    }
+    layers.static.width = $c.width;
+    layers.static.height = $c.height;
+    layers.sctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    waveBitmaps.clear();
     requestRender();
   }
 
+  /** 현재 오버레이로 그려지는(정적 레이어에서 빠지는) 클립 */
+  function _overlayClip() {
+    return drag.clip && drag.mode !== "playhead" ? drag.clip : null;
+  }
+
   function render() {
     const W = S.canvasW,
       H = S.canvasH;
-    if (W <= 0 || H <= 0) return;
+    if (W <= 0 || H <= 0 || !layers.static) return;
+
+    const moving = _overlayClip();
+    const full = layers.staticDirty;
+    if (full) {
+      layers.staticDirty = false;
+      renderStatic(layers.sctx, W, H, moving);
+    }
+
+    // --- Static layer blit ---
+    ctx.save();
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.drawImage(layers.static, 0, 0);
+    ctx.restore();
+
+    // --- Drag overlay ---
+    if (moving) {
+      ctx.save();
+      ctx.beginPath();
+      ctx.rect(CFG.HEADER_W, CFG.RULER_H, W - CFG.HEADER_W, H - CFG.RULER_H);
+      ctx.clip();
+      drawClip(ctx, moving, false);
+      ctx.restore();
+    }
 
-    ctx.clearRect(0, 0, W, H);
+    // --- Playhead ---
+    drawPlayhead(ctx, H);
+
+    // --- Scrollbar (재생헤드만 움직일 때는 변화 없음) ---
+    if (full || moving) {
+      updateScrollbar();
+      updateVScrollbar();
+    }
+
+    // --- Timecode ---
+    if (!S.playing) $timecode.textContent = fmtTime(S.playhead);
+  }
+
+  function renderStatic(g, W, H, skipClip) {
+    g.clearRect(0, 0, W, H);
 
     // --- Background ---
-    ctx.fillStyle = "#1e1e1e";
-    ctx.fillRect(0, 0, W, H);
+    g.fillStyle = "#1e1e1e";
+    g.fillRect(0, 0, W, H);
 
     // --- Track backgrounds ---
-    ctx.save();
-    ctx.beginPath();
-    ctx.rect(CFG.HEADER_W, CFG.RULER_H, W - CFG.HEADER_W, H - CFG.RULER_H);
-    ctx.clip();
+    g.save();
+    g.beginPath();
+    g.rect(CFG.HEADER_W, CFG.RULER_H, W - CFG.HEADER_W, H - CFG.RULER_H);
+    g.clip();
     for (let i = 0; i < S.tracks; i++) {
       const y = trackY(i);
       if (trackDrag.active && i === trackDrag.srcTrack) {
-        ctx.fillStyle = "rgba(45, 140, 255, 0.1)";
+        g.fillStyle = "rgba(45, 140, 255, 0.1)";
       } else if (trackDrag.active && i === trackDrag.curTrack && trackDrag.srcTrack !== trackDrag.curTrack) {
-        ctx.fillStyle = "rgba(45, 140, 255, 0.15)";
+        g.fillStyle = "rgba(45, 140, 255, 0.15)";
       } else {
-        ctx.fillStyle = i % 2 === 0 ? "#252525" : "#2a2a2a";
+        g.fillStyle = i % 2 === 0 ? "#252525" : "#2a2a2a";
       }
-      ctx.fillRect(CFG.HEADER_W, y, W - CFG.HEADER_W, CFG.TRACK_H);
+      g.fillRect(CFG.HEADER_W, y, W - CFG.HEADER_W, CFG.TRACK_H);
     }
 
     // --- Clips ---
-    for (const clip of S.clips) drawClip(clip);
-    ctx.restore();
+    for (const clip of S.clips) {
+      if (clip !== skipClip) drawClip(g, clip, true);
+    }
+    g.restore();
 
     // --- Ruler ---
-    drawRuler(W);
+    drawRuler(g, W);
 
     // --- Track Headers ---
-    drawTrackHeaders(H);
-
-    // --- Playhead ---
-    drawPlayhead(H);
-
-    // --- Scrollbar ---
-    updateScrollbar();
-    updateVScrollbar();
-
-    // --- Timecode ---
-    if (!S.playing) $timecode.textContent = fmtTime(S.playhead);
+    drawTrackHeaders(g, H);
   }
 
-  function drawRuler(W) {
-    ctx.fillStyle = "#2c2c2c";
-    ctx.fillRect(0, 0, W, CFG.RULER_H);
-    ctx.strokeStyle = "#444";
-    ctx.lineWidth = 1;
-    ctx.beginPath();
-    ctx.moveTo(0, CFG.RULER_H - 0.5);
-    ctx.lineTo(W, CFG.RULER_H - 0.5);
-    ctx.stroke();
+  function drawRuler(g, W) {
+    g.fillStyle = "#2c2c2c";
+    g.fillRect(0, 0, W, CFG.RULER_H);
+    g.strokeStyle = "#444";
+    g.lineWidth = 1;
+    g.beginPath();
+    g.moveTo(0, CFG.RULER_H - 0.5);
+    g.lineTo(W, CFG.RULER_H - 0.5);
+    g.stroke();
 
     // Time marks
     const stepSec = calcRulerStep();
     const startT = Math.floor(x2time(CFG.HEADER_W) / stepSec) * stepSec;
     const endT = x2time(W) + stepSec;
 
-    ctx.fillStyle = "#999";
-    ctx.font = "10px Consolas, monospace";
-    ctx.textBaseline = "top";
+    g.fillStyle = "#999";
+    g.font = "10px Consolas, monospace";
+    g.textBaseline = "top";
 
     for (let t = startT; t <= endT; t += stepSec) {
       if (t < 0) continue;
       const x = time2x(t);
       if (x < CFG.HEADER_W || x > W) continue;
       // Major tick
-      ctx.strokeStyle = "#555";
-      ctx.beginPath();
-      ctx.moveTo(x + 0.5, CFG.RULER_H - 12);
-      ctx.lineTo(x + 0.5, CFG.RULER_H);
-      ctx.stroke();
-      ctx.fillText(fmtTimeShort(t), x + 3, 4);
+      g.strokeStyle = "#555";
+      g.beginPath();
+      g.moveTo(x + 0.5, CFG.RULER_H - 12);
+      g.lineTo(x + 0.5, CFG.RULER_H);
+      g.stroke();
+      g.fillText(fmtTimeShort(t), x + 3, 4);
       // Minor ticks
       const minor = stepSec / 4;
       for (let j = 1; j < 4; j++) {
         const mx = time2x(t + j * minor);
         if (mx < CFG.HEADER_W || mx > W) continue;
-        ctx.strokeStyle = "#3a3a3a";
-        ctx.beginPath();
-        ctx.moveTo(mx + 0.5, CFG.RULER_H - 5);
-        ctx.lineTo(mx + 0.5, CFG.RULER_H);
-        ctx.stroke();
+        g.strokeStyle = "#3a3a3a";
+        g.beginPath();
+        g.moveTo(mx + 0.5, CFG.RULER_H - 5);
+        g.lineTo(mx + 0.5, CFG.RULER_H);
+        g.stroke();
       }
     }
   }
@@ -775,70 +1014,70 @@
     return steps[steps.length - 1];
   }
 
-  function drawTrackHeaders(H) {
-    ctx.fillStyle = "#2c2c2c";
-    ctx.fillRect(0, 0, CFG.HEADER_W, H);
-    ctx.strokeStyle = "#444";
-    ctx.lineWidth = 1;
-    ctx.beginPath();
-    ctx.moveTo(CFG.HEADER_W - 0.5, 0);
-    ctx.lineTo(CFG.HEADER_W - 0.5, H);
-    ctx.stroke();
+  function drawTrackHeaders(g, H) {
+    g.fillStyle = "#2c2c2c";
+    g.fillRect(0, 0, CFG.HEADER_W, H);
+    g.strokeStyle = "#444";
+    g.lineWidth = 1;
+    g.beginPath();
+    g.moveTo(CFG.HEADER_W - 0.5, 0);
+    g.lineTo(CFG.HEADER_W - 0.5, H);
+    g.stroke();
 
-    ctx.font = "11px Segoe UI, sans-serif";
-    ctx.textBaseline = "middle";
-    ctx.textAlign = "center";
+    g.font = "11px Segoe UI, sans-serif";
+    g.textBaseline = "middle";
+    g.textAlign = "center";
     for (let i = 0; i < S.tracks; i++) {
       const y = trackY(i);
       if (y + CFG.TRACK_H < CFG.RULER_H || y > H) continue;
 
       // 드래그 중인 소스 트랙 하이라이트
       if (trackDrag.active && i === trackDrag.srcTrack) {
-        ctx.fillStyle = "rgba(45, 140, 255, 0.15)";
-        ctx.fillRect(0, y, CFG.HEADER_W, CFG.TRACK_H);
+        g.fillStyle = "rgba(45, 140, 255, 0.15)";
+        g.fillRect(0, y, CFG.HEADER_W, CFG.TRACK_H);
       }
       // 드래그 대상 위치 표시
       if (trackDrag.active && i === trackDrag.curTrack && trackDrag.srcTrack !== trackDrag.curTrack) {
-        ctx.fillStyle = "rgba(45, 140, 255, 0.25)";
-        ctx.fillRect(0, y, CFG.HEADER_W, CFG.TRACK_H);
+        g.fillStyle = "rgba(45, 140, 255, 0.25)";
+        g.fillRect(0, y, CFG.HEADER_W, CFG.TRACK_H);
         // 삽입 라인도 표시 (전체 너비)
-        ctx.strokeStyle = "#2d8cff";
-        ctx.lineWidth = 2;
-        ctx.beginPath();
+        g.strokeStyle = "#2d8cff";
+        g.lineWidth = 2;
+        g.beginPath();
         const lineY = trackDrag.srcTrack < trackDrag.curTrack ? y + CFG.TRACK_H : y;
-        ctx.moveTo(0, lineY);
-        ctx.lineTo(S.canvasW, lineY);
-        ctx.stroke();
-        ctx.lineWidth = 1;
+        g.moveTo(0, lineY);
+        g.lineTo(S.canvasW, lineY);
+        g.stroke();
+        g.lineWidth = 1;
       }
 
-      ctx.fillStyle = trackDrag.active && i === trackDrag.srcTrack ? "#2d8cff" : "#888";
-      ctx.fillText(`T${i + 1}`, CFG.HEADER_W / 2, y + CFG.TRACK_H / 2);
+      g.fillStyle = trackDrag.active && i === trackDrag.srcTrack ? "#2d8cff" : "#888";
+      g.fillText(`T${i + 1}`, CFG.HEADER_W / 2, y + CFG.TRACK_H / 2);
       // Separator
-      ctx.strokeStyle = "#3a3a3a";
-      ctx.beginPath();
-      ctx.moveTo(0, y + CFG.TRACK_H + 0.5);
-      ctx.lineTo(CFG.HEADER_W, y + CFG.TRACK_H + 0.5);
-      ctx.stroke();
+      g.strokeStyle = "#3a3a3a";
+      g.beginPath();
+      g.moveTo(0, y + CFG.TRACK_H + 0.5);
+      g.lineTo(CFG.HEADER_W, y + CFG.TRACK_H + 0.5);
+      g.stroke();
     }
-    ctx.textAlign = "left";
+    g.textAlign = "left";
 
     // 드래그 중 커서 힌트
     if (trackDrag.active) {
-      ctx.fillStyle = "rgba(45, 140, 255, 0.7)";
-      ctx.font = "bold 10px Segoe UI, sans-serif";
-      ctx.textAlign = "center";
+      g.fillStyle = "rgba(45, 140, 255, 0.7)";
+      g.font = "bold 10px Segoe UI, sans-serif";
+      g.textAlign = "center";
       const dstY = trackY(trackDrag.curTrack);
-      ctx.fillText(`← T${trackDrag.srcTrack + 1}`, CFG.HEADER_W / 2, dstY + CFG.TRACK_H + 12);
-      ctx.textAlign = "left";
+      g.fillText(`← T${trackDrag.srcTrack + 1}`, CFG.HEADER_W / 2, dstY + CFG.TRACK_H + 12);
+      g.textAlign = "left";
     }
 
     // Corner
-    ctx.fillStyle = "#2c2c2c";
-    ctx.fillRect(0, 0, CFG.HEADER_W, CFG.RULER_H);
+    g.fillStyle = "#2c2c2c";
+    g.fillRect(0, 0, CFG.HEADER_W, CFG.RULER_H);
   }
 
-  function drawClip(clip) {
+  function drawClip(g, clip, cacheWave) {
     const file = S.files[clip.fileId];
     if (!file) return;
     const x = time2x(clip.offset);
@@ -847,112 +1086,149 @@
     const h = CFG.TRACK_H;
 
     if (x + w < CFG.HEADER_W || x > S.canvasW) return; // off-screen
+    if (y + h < CFG.RULER_H || y > S.canvasH) return;
     if (w < 1) return;
 
     const sel = clip.id === S.selClipId;
     const r = 4;
 
     // Clip body
-    ctx.fillStyle = clip.color + (sel ? "dd" : "99");
-    roundRect(ctx, x, y + 1, w, h - 2, r);
-    ctx.fill();
+    g.fillStyle = clip.color + (sel ? "dd" : "99");
+    roundRect(g, x, y + 1, w, h - 2, r);
+    g.fill();
 
     // Waveform
-    const peaks = waveforms[clip.fileId];
-    if (peaks && peaks.length > 0) {
-      drawWaveform(peaks, x, y + 16, w, h - 20, clip, file);
+    const wf = waveforms[clip.fileId];
+    if (!wf && clip.file?.hasAudio) fetchWaveform(clip.fileId); // 이전 받기가 끝내 실패한 경우
+    const lv = wf ? _waveLevel(wf, S.pps / clip.speed) : null;
+    if (lv) {
+      const bmp = cacheWave ? _waveBitmap(lv, w, h - 20, clip) : null;
+      if (bmp) g.drawImage(bmp, x, y + 16, w, h - 20);
+      else drawWaveform(g, lv, x, y + 16, w, h - 20, clip, CFG.HEADER_W, S.canvasW);
     }
 
     // Label
-    ctx.save();
-    ctx.beginPath();
-    ctx.rect(x + 4, y, w - 8, h);
-    ctx.clip();
-    ctx.fillStyle = "#fff";
-    ctx.font = "10px Segoe UI, sans-serif";
-    ctx.textBaseline = "top";
-    ctx.fillText(file.name, x + 6, y + 4);
+    g.save();
+    g.beginPath();
+    g.rect(x + 4, y, w - 8, h);
+    g.clip();
+    g.fillStyle = "#fff";
+    g.font = "10px Segoe UI, sans-serif";
+    g.textBaseline = "top";
+    g.fillText(file.name, x + 6, y + 4);
     if (clip.volume !== 100) {
-      ctx.fillStyle = clip.volume === 0 ? "#ff6666" : "#aaa";
-      ctx.font = "9px Consolas, monospace";
-      ctx.fillText(`🔊${clip.volume}%`, x + 6, y + 15);
+      g.fillStyle = clip.volume === 0 ? "#ff6666" : "#aaa";
+      g.font = "9px Consolas, monospace";
+      g.fillText(`🔊${clip.volume}%`, x + 6, y + 15);
     }
     if (Math.abs(clip.speed - 1.0) > 0.005) {
-      ctx.fillStyle = "#88ccff";
-      ctx.font = "9px Consolas, monospace";
+      g.fillStyle = "#88ccff";
+      g.font = "9px Consolas, monospace";
       const speedY = clip.volume !== 100 ? y + 24 : y + 15;
-      ctx.fillText(`⏩${clip.speed.toFixed(2)}x`, x + 6, speedY);
+      g.fillText(`⏩${clip.speed.toFixed(2)}x`, x + 6, speedY);
     }
-    ctx.restore();
+    g.restore();
 
     // Selection border
     if (sel) {
-      ctx.strokeStyle = "#fff";
-      ctx.lineWidth = 2;
-      roundRect(ctx, x, y + 1, w, h - 2, r);
-      ctx.stroke();
+      g.strokeStyle = "#fff";
+      g.lineWidth = 2;
+      roundRect(g, x, y + 1, w, h - 2, r);
+      g.stroke();
     }
 
     // Trim handles
     if (sel || w > 40) {
-      ctx.fillStyle = sel ? "#ffffffaa" : "#ffffff44";
+      g.fillStyle = sel ? "#ffffffaa" : "#ffffff44";
       // Left handle
-      roundRect(ctx, x, y + 1, CFG.HANDLE_W, h - 2, [r, 0, 0, r]);
-      ctx.fill();
+      roundRect(g, x, y + 1, CFG.HANDLE_W, h - 2, [r, 0, 0, r]);
+      g.fill();
       // Right handle
-      roundRect(ctx, x + w - CFG.HANDLE_W, y + 1, CFG.HANDLE_W, h - 2, [0, r, r, 0]);
-      ctx.fill();
+      roundRect(g, x + w - CFG.HANDLE_W, y + 1, CFG.HANDLE_W, h - 2, [0, r, r, 0]);
+      g.fill();
     }
 
     // Video icon
     if (file.hasVideo) {
-      ctx.fillStyle = "#fff8";
-      ctx.font = "10px sans-serif";
-      ctx.textBaseline = "bottom";
-      ctx.fillText("🎬", x + 6, y + h - 4);
+      g.fillStyle = "#fff8";
+      g.font = "10px sans-serif";
+      g.textBaseline = "bottom";
+      g.fillText("🎬", x + 6, y + h - 4);
+    }
+  }
+
+  /**
+   * 클립 파형 비트맵 (줌 레벨 = 클립 픽셀 폭 기준 캐시).
+   * 너무 넓은 클립은 null → 호출 측에서 보이는 구간만 직접 그림.
+   */
+  function _waveBitmap(lv, w, h, clip) {
+    if (w < 4 || w > WAVE_BITMAP_MAX_W) return null;
+    const pw = Math.round(w);
+    const key = `${clip.fileId}|${lv.rate}|${clip.trimStart}|${clip.trimEnd}|${pw}|${h}`;
+    let bmp = waveBitmaps.get(key);
+    if (bmp) {
+      // LRU: 최근 사용 항목을 뒤로
+      waveBitmaps.delete(key);
+      waveBitmaps.set(key, bmp);
+      return bmp;
     }
-  }
-
-  function drawWaveform(peaks, x, y, w, h, clip, file) {
-    if (!peaks.length || w < 4) return;
-    const dur = file.duration;
-    const startFrac = clip.trimStart / dur;
-    const endFrac = clip.trimEnd / dur;
-    const si = Math.floor(startFrac * peaks.length);
-    const ei = Math.ceil(endFrac * peaks.length);
-    const vis = peaks.slice(si, Math.min(ei, peaks.length));
-    if (!vis.length) return;
+    const dpr = window.devicePixelRatio || 1;
+    bmp = document.createElement("canvas");
+    bmp.width = Math.max(1, Math.ceil(pw * dpr));
+    bmp.height = Math.max(1, Math.ceil(h * dpr));
+    const bg = bmp.getContext("2d");
+    bg.setTransform(dpr, 0, 0, dpr, 0, 0);
+    drawWaveform(bg, lv, 0, 0, pw, h, clip, 0, pw);
+    waveBitmaps.set(key, bmp);
+    if (waveBitmaps.size > WAVE_BITMAP_MAX) {
+      waveBitmaps.delete(waveBitmaps.keys().next().value);
+    }
+    return bmp;
+  }
+
+  /** 파형 min/max 컬럼 그리기 – [visL, visR] 픽셀 구간에 들어오는 컬럼만 그림 */
+  function drawWaveform(g, lv, x, y, w, h, clip, visL, visR) {
+    if (w < 4) return;
+    const cols = lv.cols;
+    const si = Math.floor(clip.trimStart * lv.rate);
+    const ei = Math.min(Math.ceil(clip.trimEnd * lv.rate), cols.length / 2);
+    const n = ei - si;
+    if (n <= 0) return;
 
     const midY = y + h / 2;
-    const barW = w / vis.length;
+    const scale = (h * 0.45) / 127;
+    const barW = w / n;
+    const i0 = Math.max(0, Math.floor((visL - x) / barW));
+    const i1 = Math.min(n, Math.ceil((visR - x) / barW));
 
-    ctx.fillStyle = "rgba(255,255,255,0.55)";
-    for (let i = 0; i < vis.length; i++) {
-      const bx = x + i * barW;
-      const amp = vis[i] * h * 0.45;
-      ctx.fillRect(bx, midY - amp, Math.max(1, barW - 0.5), amp * 2);
+    g.fillStyle = "rgba(255,255,255,0.55)";
+    for (let i = i0; i < i1; i++) {
+      const k = 2 * (si + i);
+      const top = midY - cols[k + 1] * scale;
+      const bottom = midY - cols[k] * scale;
+      g.fillRect(x + i * barW, top, Math.max(1, barW - 0.5), Math.max(1, bottom - top));
     }
   }
 
-  function drawPlayhead(H) {
+  function drawPlayhead(g, H) {
     const x = time2x(S.playhead);
     if (x < CFG.HEADER_W || x > S.canvasW) return;
 
-    ctx.strokeStyle = "#ff4444";
-    ctx.lineWidth = 1.5;
-    ctx.beginPath();
-    ctx.moveTo(x, 0);
-    ctx.lineTo(x, H);
-    ctx.stroke();
+    g.strokeStyle = "#ff4444";
+    g.lineWidth = 1.5;
+    g.beginPath();
+    g.moveTo(x, 0);
+    g.lineTo(x, H);
+    g.stroke();
 
     // Triangle head
-    ctx.fillStyle = "#ff4444";
-    ctx.beginPath();
-    ctx.moveTo(x - 6, 0);
-    ctx.lineTo(x + 6, 0);
-    ctx.lineTo(x, 8);
-    ctx.closePath();
-    ctx.fill();
+    g.fillStyle = "#ff4444";
+    g.beginPath();
+    g.moveTo(x - 6, 0);
+    g.lineTo(x + 6, 0);
+    g.lineTo(x, 8);
+    g.closePath();
+    g.fill();
   }
 
   function roundRect(c, x, y, w, h, radii) {
@@ -1005,7 +1281,7 @@
         playback.pause();
         playback.play();
       }
-      requestRender();
+      requestOverlay();
       $timecode.textContent = fmtTime(S.playhead);
       return;
     }
@@ -1032,7 +1308,7 @@
     if (hit) {
       S.selClipId = hit.clip.id;
       updateProperties();
-      saveUndo(); // 드래그 시작 전 상태 저장
+      saveUndo(hit.clip); // 드래그 시작 전 상태 저장
 
       if (hit.mode === "body") {
         drag = {
@@ -1139,10 +1415,11 @@
         playback.play();
       }
       updateVideoPreview();
-      requestRender();
+      requestOverlay();
       return;
     }
 
+    // 클립 드래그 중에는 정적 레이어를 재사용하고 드래그 클립만 오버레이로 그림
     if (drag.mode === "move") {
       const dx = mx - drag.startX;
       const dy = my - drag.startY;
@@ -1150,8 +1427,12 @@
       drag.clip.offset = Math.max(0, snapTime(newOffset, drag.clip));
       const newTrack = Math.max(0, drag.origTrack + Math.round(dy / (CFG.TRACK_H + CFG.TRACK_GAP)));
       drag.clip.track = newTrack;
-      S.tracks = Math.max(S.tracks, newTrack + 1);
-      requestRender();
+      if (newTrack + 1 > S.tracks) {
+        S.tracks = newTrack + 1;
+        requestRender();
+      } else {
+        requestOverlay();
+      }
       return;
     }
 
@@ -1162,7 +1443,7 @@
       const maxTS = drag.clip.trimEnd - 0.05;
       drag.clip.trimStart = Math.min(newTS, maxTS);
       drag.clip.offset = drag.origOffset + (drag.clip.trimStart - drag.origTrimS);
-      requestRender();
+      requestOverlay();
       return;
     }
 
@@ -1172,7 +1453,7 @@
       const newTE = drag.origTrimE + dt;
       const maxTE = S.files[drag.clip.fileId].duration;
       drag.clip.trimEnd = Math.max(drag.clip.trimStart + 0.05, Math.min(newTE, maxTE));
-      requestRender();
+      requestOverlay();
       return;
     }
 
@@ -1181,7 +1462,7 @@
       const newVisualW = Math.max(CFG.MIN_CLIP_PX, drag.origVisualW + dx);
       const newVisualDur = newVisualW / S.pps;
       drag.clip.speed = Math.max(0.1, Math.min(10, drag.sourceDur / newVisualDur));
-      requestRender();
+      requestOverlay();
       return;
     }
 
@@ -1191,7 +1472,7 @@
       const newVisualDur = newVisualW / S.pps;
       drag.clip.speed = Math.max(0.1, Math.min(10, drag.sourceDur / newVisualDur));
       drag.clip.offset = drag.rightEdge - newVisualDur;
-      requestRender();
+      requestOverlay();
       return;
     }
   }
@@ -1210,16 +1491,21 @@
       return;
     }
 
-    if (drag.mode === "move" || drag.mode === "trim_l" || drag.mode === "trim_r" || drag.mode === "stretch_l" || drag.mode === "stretch_r") {
+    const wasClipDrag = drag.mode === "move" || drag.mode === "trim_l" || drag.mode === "trim_r" || drag.mode === "stretch_l" || drag.mode === "stretch_r";
+    if (wasClipDrag) {
       updateProperties();
     }
     drag = { mode: null };
     $c.style.cursor = "";
+    // 오버레이로 그리던 클립을 정적 레이어에 다시 합침
+    if (wasClipDrag) requestRender();
   }
 
   function reorderTrack(srcTrack, dstTrack) {
     if (srcTrack === dstTrack) return;
-    saveUndo();
+    const lo = Math.min(srcTrack, dstTrack),
+      hi = Math.max(srcTrack, dstTrack);
+    saveUndo(S.clips.filter((c) => c.track >= lo && c.track <= hi));
     // 트랙을 srcTrack에서 dstTrack 위치로 이동 (insert 방식)
     // 모든 클립의 track 번호를 재배치
     const dir = srcTrack < dstTrack ? 1 : -1;
@@ -1241,7 +1527,7 @@
 
   function splitAtPlayheadTime(clip, t) {
     if (t <= clip.offset || t >= clip.offset + clip.clipDuration) return;
-    saveUndo();
+    saveUndo(clip);
     const splitPt = clip.trimStart + (t - clip.offset) * clip.speed;
     const nc = clip.clone();
     nc.trimStart = splitPt;
@@ -1252,6 +1538,84 @@
     requestRender();
   }
 
+  // ════════════════════════════════════════════════════════════
+  // SILENCE REMOVAL
+  // ════════════════════════════════════════════════════════════
+  // 서버(/api/silence)가 PCM 캐시에서 찾은 무음 구간을 빼고 남은 구간만 이어 붙임.
+  // 분할 + 삭제 + 같은 트랙 뒤 클립 당기기를 saveUndo 1번으로 묶어 되돌리기도 1번.
+  let silenceThreshold = -40; // 마지막으로 쓴 무음 기준 (dB)
+
+  async function removeSilence(clip) {
+    const f = S.files[clip.fileId];
+    if (!f || !f.hasAudio) {
+      $tlStatus.textContent = "오디오가 없는 클립입니다";
+      return;
+    }
+    const ans = prompt("무음 기준 (dB) – 이보다 조용한 0.5초 이상 구간을 잘라냅니다", String(silenceThreshold));
+    if (ans === null) return;
+    const thr = parseFloat(ans);
+    if (!isFinite(thr)) return;
+    silenceThreshold = thr;
+
+    const { trimStart, trimEnd } = clip;
+    $tlStatus.textContent = "무음 구간 분석 중...";
+    let d;
+    try {
+      const r = await fetch(`/api/silence/${clip.fileId}?start=${trimStart}&end=${trimEnd}&threshold=${thr}`);
+      d = await r.json();
+      if (!r.ok) throw new Error(d.error || r.status);
+    } catch (e) {
+      $tlStatus.textContent = `무음 분석 오류: ${e.message}`;
+      return;
+    }
+    // 분석하는 동안 클립이 지워졌거나 트림이 바뀌었으면 적용하지 않음
+    if (!S.clips.includes(clip) || clip.trimStart !== trimStart || clip.trimEnd !== trimEnd) {
+      $tlStatus.textContent = "클립이 바뀌어 무음 자르기를 취소했습니다";
+      return;
+    }
+
+    // 남길 구간 (원본 초)
+    const keep = [];
+    let pos = trimStart;
+    let cuts = 0;
+    for (const [a, b] of d.ranges) {
+      const s = Math.max(a, trimStart);
+      const e = Math.min(b, trimEnd);
+      if (e <= s) continue;
+      if (s > pos) keep.push([pos, s]);
+      pos = Math.max(pos, e);
+      cuts++;
+    }
+    if (pos < trimEnd) keep.push([pos, trimEnd]);
+    if (!cuts) {
+      $tlStatus.textContent = "무음 구간이 없습니다";
+      return;
+    }
+    if (!keep.length) {
+      $tlStatus.textContent = "클립 전체가 무음입니다";
+      return;
+    }
+
+    const oldEnd = clip.offset + clip.clipDuration;
+    const later = S.clips.filter((c) => c !== clip && c.track === clip.track && c.offset >= oldEnd - 1e-6);
+    saveUndo([clip, ...later]);
+    let offset = clip.offset;
+    keep.forEach(([a, b], i) => {
+      const c = i === 0 ? clip : clip.clone();
+      c.trimStart = a;
+      c.trimEnd = b;
+      c.offset = offset;
+      offset += c.clipDuration;
+      if (i > 0) S.clips.push(c);
+    });
+    const removed = oldEnd - offset;
+    for (const c of later) c.offset -= removed;
+    playback.removeClip(clip.id);
+    requestRender();
+    updateProperties();
+    $tlStatus.textContent = `무음 ${cuts}곳 제거 (−${removed.toFixed(1)}초, 클립 ${keep.length}개)`;
+  }
+
   // ════════════════════════════════════════════════════════════
   // SCROLL / ZOOM
   // ════════════════════════════════════════════════════════════
@@ -1315,7 +1679,7 @@
       updateProperties();
       requestRender();
       const clickTime = x2time(mx);
-      showContextMenu(e.clientX, e.clientY, [{ label: "✂️  여기서 분할", action: () => splitAtPlayheadTime(hit.clip, clickTime) }, { label: "✂️  재생헤드에서 분할", action: () => splitAtPlayhead(hit.clip) }, { label: "📋  복제", action: () => duplicateClip(hit.clip) }, { sep: true }, { label: "🔄  트림 초기화", action: () => resetTrim(hit.clip) }, { label: "⏱  배속 초기화", action: () => resetSpeed(hit.clip) }, { sep: true }, { label: "❌  삭제", action: () => removeClip(hit.clip.id) }]);
+      showContextMenu(e.clientX, e.clientY, [{ label: "✂️  여기서 분할", action: () => splitAtPlayheadTime(hit.clip, clickTime) }, { label: "✂️  재생헤드에서 분할", action: () => splitAtPlayhead(hit.clip) }, { label: "🔇  무음 자르기", action: () => removeSilence(hit.clip) }, { label: "📋  복제", action: () => duplicateClip(hit.clip) }, { sep: true }, { label: "🔄  트림 초기화", action: () => resetTrim(hit.clip) }, { label: "⏱  배속 초기화", action: () => resetSpeed(hit.clip) }, { sep: true }, { label: "❌  삭제", action: () => removeClip(hit.clip.id) }]);
     } else {
       showContextMenu(e.clientX, e.clientY, [
         { label: "➕  트랙 추가", action: addTrack },
@@ -1390,7 +1754,7 @@
   function applyProps() {
     const clip = S.clips.find((c) => c.id === S.selClipId);
     if (!clip) return;
-    saveUndo();
+    saveUndo(clip);
     const file = S.files[clip.fileId];
     clip.offset = Math.max(0, parseFloat($pOffset.value) || 0);
     clip.trimStart = Math.max(0, Math.min(parseFloat($pTrimS.value) || 0, file.duration));
@@ -1698,15 +2062,18 @@
     const overlay = document.getElementById("settings-overlay");
     const $projDir = document.getElementById("set-project-dir");
     const $expDir = document.getElementById("set-export-dir");
+    const $libDirs = document.getElementById("set-library-dirs");
     // 현재 설정 불러오기
     try {
       const r = await fetch("/api/settings");
       const s = await r.json();
       $projDir.value = s.projectDir || "";
       $expDir.value = s.exportDir || "";
+      $libDirs.value = (s.libraryDirs || []).join("; ");
     } catch (e) {
       $projDir.value = "";
       $expDir.value = "";
+      $libDirs.value = "";
     }
     overlay.style.display = "flex";
 
@@ -1727,6 +2094,11 @@
 
     projBrowse.onclick = onProjBrowse;
     expBrowse.onclick = onExpBrowse;
+    document.getElementById("set-library-browse").onclick = () => {
+      browseFolder("", "미디어 라이브러리 폴더 추가").then((p) => {
+        if (p) $libDirs.value = $libDirs.value.trim() ? `${$libDirs.value.trim()}; ${p}` : p;
+      });
+    };
 
     // 저장
     document.getElementById("set-save").onclick = async () => {
@@ -1734,7 +2106,11 @@
         const r = await fetch("/api/settings", {
           method: "POST",
           headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ projectDir: $projDir.value, exportDir: $expDir.value }),
+          body: JSON.stringify({
+            projectDir: $projDir.value,
+            exportDir: $expDir.value,
+            libraryDirs: $libDirs.value.split(";").map((p) => p.trim()).filter(Boolean),
+          }),
         });
         const d = await r.json();
         if (d.status === "ok") {
@@ -1781,16 +2157,7 @@
     if (!name) return;
     S._projectName = name;
 
-    const clips = S.clips.map((c) => ({
-      fileId: c.fileId,
-      track: c.track,
-      offset: c.offset,
-      trimStart: c.trimStart,
-      trimEnd: c.trimEnd,
-      volume: c.volume,
-      speed: c.speed,
-      color: c.color,
-    }));
+    const clips = S.clips.map(_clipRecord);
 
     try {
       $tlStatus.textContent = "저장 중…";
@@ -1802,6 +2169,8 @@
       const d = await r.json();
       if (d.status === "ok") {
         $tlStatus.textContent = `프로젝트 저장 완료: ${name}.meproj`;
+        // 서버 스냅샷이 현재 상태 그대로 → 이후 자동 저장은 여기서부터의 변경만
+        autosaveBaseline(false);
         // 브라우저 다운로드도 제공
         const blob = new Blob([JSON.stringify({ version: 1, name, files: S.files, clips, tracks: S.tracks }, null, 2)], { type: "application/json" });
         const url = URL.createObjectURL(blob);
@@ -1820,38 +2189,75 @@
     }
   }
 
+  /** 저장/자동 저장 공통 클립 레코드 (id 는 자동 저장 저널의 클립 식별자) */
+  function _clipRecord(c) {
+    return {
+      id: c.id,
+      fileId: c.fileId,
+      track: c.track,
+      offset: c.offset,
+      trimStart: c.trimStart,
+      trimEnd: c.trimEnd,
+      volume: c.volume,
+      speed: c.speed,
+      color: c.color,
+    };
+  }
+
   async function loadProjectFile(file) {
     try {
       $tlStatus.textContent = "프로젝트 불러오는 중…";
       const fd = new FormData();
       fd.append("project", file);
-      const r = await fetch("/api/project/load", { method: "POST", body: fd });
-      const d = await r.json();
-      if (d.error) {
-        $tlStatus.textContent = `불러오기 오류: ${d.error}`;
+      const r = await fetch("/api/project/bootstrap", { method: "POST", body: fd });
+      if (!r.ok) {
+        const d = await r.json();
+        $tlStatus.textContent = `불러오기 오류: ${d.error || r.status}`;
         return;
       }
-      applyProjectData(d);
+      const { data, waves } = parseBootstrap(await r.arrayBuffer());
+      applyProjectData(data, waves);
     } catch (e) {
       $tlStatus.textContent = `불러오기 오류: ${e.message}`;
     }
   }
 
-  function applyProjectData(d) {
+  /**
+   * 부트스트랩 응답 파싱: MAGIC "MEB1" | uint32 헤더 길이 | JSON 헤더 | 파형 컬럼들
+   * → { data: 프로젝트 JSON, waves: Map(fid → { rate, cols: Int8Array }) }
+   */
+  function parseBootstrap(buf) {
+    const magic = String.fromCharCode(...new Uint8Array(buf, 0, 4));
+    if (magic !== "MEB1") throw new Error("잘못된 부트스트랩 응답");
+    const hlen = new DataView(buf).getUint32(4, true);
+    const data = JSON.parse(new TextDecoder().decode(new Uint8Array(buf, 8, hlen)));
+    const base = 8 + hlen;
+    const waves = new Map();
+    for (const w of data.waveforms || []) {
+      waves.set(w.fid, { rate: w.rate, cols: new Int8Array(buf.slice(base + w.offset, base + w.offset + w.length)) });
+    }
+    return { data, waves };
+  }
+
+  function applyProjectData(d, waves = null) {
     // 기존 상태 초기화
     playback.stop();
     S.clips = [];
     S.selClipId = -1;
     S.playhead = 0;
+    _resetHistory();
     $fileList.innerHTML = "";
     Object.keys(S.files).forEach((k) => delete S.files[k]);
-    Object.keys(waveforms).forEach((k) => delete waveforms[k]);
+    Object.keys(waveforms).forEach((k) => dropWaveform(k));
+    waveBitmaps.clear();
 
     // 파일 복원
     for (const [fid, finfo] of Object.entries(d.files || {})) {
       S.files[fid] = finfo;
       addFileToProject(finfo);
-      if (finfo.hasAudio) fetchWaveform(fid);
+      const wv = waves && waves.get(fid);
+      if (wv) seedWaveform(fid, wv.rate, wv.cols);
+      else if (finfo.hasAudio) fetchWaveform(fid); // 서버에서 백그라운드 생성 중
     }
 
     // 트랙 수 복원
@@ -1870,11 +2276,19 @@
     }
 
     S._projectName = d.name || "project";
+    // 불러온 클립은 새 id → 첫 변경 때 저널을 reset 으로 다시 시작
+    autosaveBaseline(true);
 
-    // 누락 파일 경고
+    // 누락 파일 경고 (옮겨진 파일은 서버가 지문으로 다시 연결해 둠)
+    const relinked = d.relinkedFiles || [];
+    if (relinked.length > 0) {
+      console.log("다시 연결된 파일:", relinked);
+    }
     if (d.missingFiles && d.missingFiles.length > 0) {
       $tlStatus.textContent = `프로젝트 로드 완료 (누락: ${d.missingFiles.join(", ")})`;
       alert(`다음 파일을 찾을 수 없습니다:\n${d.missingFiles.join("\n")}`);
+    } else if (relinked.length > 0) {
+      $tlStatus.textContent = `프로젝트 로드 완료: ${d.name} (옮겨진 파일 ${relinked.length}개 다시 연결)`;
     } else {
       $tlStatus.textContent = `프로젝트 로드 완료: ${d.name}`;
     }
@@ -1883,6 +2297,133 @@
     requestRender();
   }
 
+  // ════════════════════════════════════════════════════════════
+  // AUTOSAVE (append-only journal)
+  // ════════════════════════════════════════════════════════════
+  // 이름이 있는 프로젝트(저장했거나 불러온 것)는 AUTOSAVE_MS 마다 바뀐 클립만 op 로 보냄.
+  // 서버는 <이름>.meproj.journal 에 한 줄씩 추가하고, 커지면/페이지를 닫으면 스냅샷에 합친다.
+  const AUTOSAVE_MS = 4000;
+  const autosave = {
+    base: new Map(), // clip id → 마지막으로 보낸 레코드 JSON
+    files: new Set(), // 저널에 이미 보낸 파일 id
+    tracks: 0,
+    needsReset: false,
+    busy: false,
+  };
+
+  function autosaveBaseline(needsReset) {
+    autosave.base = new Map(S.clips.map((c) => [c.id, JSON.stringify(_clipRecord(c))]));
+    autosave.files = new Set(S.clips.map((c) => c.fileId));
+    autosave.tracks = S.tracks;
+    autosave.needsReset = needsReset;
+  }
+
+  /** 마지막 자동 저장 이후 변경 → { ops, commit } (변경 없으면 null) */
+  function _autosaveDiff() {
+    const base = new Map();
+    const files = new Set(autosave.files);
+    let ops = [];
+    let changed = false;
+    for (const c of S.clips) {
+      const key = JSON.stringify(_clipRecord(c));
+      base.set(c.id, key);
+      if (autosave.base.get(c.id) === key) continue;
+      changed = true;
+      if (!files.has(c.fileId) && S.files[c.fileId]) {
+        ops.push({ op: "file", file: S.files[c.fileId] });
+        files.add(c.fileId);
+      }
+      ops.push({ op: "clip", clip: JSON.parse(key) });
+    }
+    for (const id of autosave.base.keys()) {
+      if (!base.has(id)) {
+        ops.push({ op: "del", id });
+        changed = true;
+      }
+    }
+    if (S.tracks !== autosave.tracks) {
+      ops.push({ op: "tracks", n: S.tracks });
+      changed = true;
+    }
+    if (!changed) return null;
+    if (autosave.needsReset) {
+      // 서버 스냅샷과 클립 id 가 다름 → 현재 상태 전체로 저널 재시작
+      ops = [{ op: "reset", name: S._projectName, tracks: S.tracks }];
+      files.clear();
+      for (const c of S.clips) {
+        if (!files.has(c.fileId) && S.files[c.fileId]) {
+          ops.push({ op: "file", file: S.files[c.fileId] });
+          files.add(c.fileId);
+        }
+        ops.push({ op: "clip", clip: JSON.parse(base.get(c.id)) });
+      }
+    }
+    const commit = () => {
+      autosave.base = base;
+      autosave.files = files;
+      autosave.tracks = S.tracks;
+      autosave.needsReset = false;
+    };
+    return { ops, commit };
+  }
+
+  async function autosaveTick() {
+    if (!S._projectName || autosave.busy || drag.mode) return;
+    const diff = _autosaveDiff();
+    if (!diff) return;
+    autosave.busy = true;
+    try {
+      const r = await fetch("/api/project/journal", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ name: S._projectName, ops: diff.ops }),
+      });
+      if (r.ok) diff.commit();
+    } catch (e) {
+      /* 서버 없음 – 다음 주기에 같은 변경을 다시 보냄 */
+    } finally {
+      autosave.busy = false;
+    }
+  }
+
+  /** 페이지를 닫을 때: 남은 변경 전송 + 스냅샷으로 합치기 (저널이 남지 않으면 다음에 복구 안내 없음) */
+  function autosaveFlush() {
+    if (!S._projectName) return;
+    const diff = _autosaveDiff();
+    const body = JSON.stringify({ name: S._projectName, ops: diff ? diff.ops : [], compact: true });
+    navigator.sendBeacon("/api/project/journal", new Blob([body], { type: "application/json" }));
+  }
+
+  /** 합쳐지지 않은 저널 = 비정상 종료 → 복구 여부 확인 */
+  async function checkRecovery() {
+    try {
+      const list = await (await fetch("/api/project/recover")).json();
+      for (const p of list) {
+        if (confirm(`자동 저장된 변경 사항이 있습니다: ${p.name}\n복구할까요?`)) {
+          const r = await fetch(`/api/project/bootstrap/${encodeURIComponent(p.filename)}`);
+          if (!r.ok) continue;
+          const { data, waves } = parseBootstrap(await r.arrayBuffer());
+          applyProjectData(data, waves);
+          $tlStatus.textContent = `자동 저장에서 복구: ${p.name}`;
+          return;
+        }
+        await fetch("/api/project/journal/discard", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ filename: p.filename }),
+        });
+      }
+    } catch (e) {
+      /* 복구 확인 실패는 무시 */
+    }
+  }
+
+  function initAutosave() {
+    setInterval(autosaveTick, AUTOSAVE_MS);
+    window.addEventListener("pagehide", autosaveFlush);
+    checkRecovery();
+  }
+
   // ════════════════════════════════════════════════════════════
   // RESIZE HANDLE (Timeline vertical)
   // ════════════════════════════════════════════════════════════
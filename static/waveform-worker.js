@@ -0,0 +1,96 @@
+/* ============================================================
+   Media Editor – waveform-worker.js
+   Waveform download, decoding and per-zoom downsampling
+   (메인 스레드 밖에서 처리 → 결과는 transferable 로 전달)
+   ============================================================ */
+"use strict";
+
+const MAX_PARALLEL = 4; // 동시 다운로드 수
+const sources = new Map(); // fileId → { rate, cols: Int8Array }  (서버 원본 min/max 컬럼)
+const queue = []; // 다운로드 대기 { fid, url }
+let active = 0;
+
+self.onmessage = (e) => {
+  const m = e.data;
+  switch (m.type) {
+    case "load":
+      if (sources.has(m.fid) || queue.some((q) => q.fid === m.fid)) return;
+      queue.push({ fid: m.fid, url: m.url });
+      _pump();
+      break;
+    case "source":
+      // 메인 스레드가 이미 받아 둔 컬럼 (프로젝트 부트스트랩)
+      sources.set(m.fid, { rate: m.rate, cols: m.cols });
+      self.postMessage({ type: "loaded", fid: m.fid, rate: m.rate, count: m.cols.length / 2 });
+      break;
+    case "level":
+      _postLevel(m.fid, m.bucket);
+      break;
+    case "drop":
+      sources.delete(m.fid);
+      break;
+  }
+};
+
+function _pump() {
+  while (active < MAX_PARALLEL && queue.length) {
+    const job = queue.shift();
+    active++;
+    _load(job).finally(() => {
+      active--;
+      _pump();
+    });
+  }
+}
+
+async function _load({ fid, url }) {
+  try {
+    const r = await fetch(url);
+    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+    const rate = Number(r.headers.get("X-Peak-Rate")) || 50;
+    const cols = new Int8Array(await r.arrayBuffer());
+    sources.set(fid, { rate, cols });
+    self.postMessage({ type: "loaded", fid, rate, count: cols.length / 2 });
+  } catch (err) {
+    self.postMessage({ type: "error", fid, message: String(err) });
+  }
+}
+
+/**
+ * bucket(초당 컬럼 수, 2의 거듭제곱) 단계로 다운샘플링한 min/max 컬럼 전송.
+ * bucket 이 원본 rate 이상이면 원본 그대로 (복사본) 전달.
+ */
+function _postLevel(fid, bucket) {
+  const src = sources.get(fid);
+  if (!src) return;
+  let cols, rate;
+  if (bucket >= src.rate) {
+    cols = src.cols.slice();
+    rate = src.rate;
+  } else {
+    cols = _downsample(src.cols, src.rate / bucket);
+    rate = bucket;
+  }
+  self.postMessage({ type: "level", fid, bucket, rate, cols }, [cols.buffer]);
+}
+
+function _downsample(srcCols, factor) {
+  const n = srcCols.length / 2;
+  const m = Math.ceil(n / factor);
+  const out = new Int8Array(m * 2);
+  for (let j = 0; j < m; j++) {
+    const a = Math.floor(j * factor);
+    const b = Math.min(n, Math.max(a + 1, Math.floor((j + 1) * factor)));
+    let lo = 127,
+      hi = -127;
+    for (let i = a; i < b; i++) {
+      const l = srcCols[2 * i],
+        h = srcCols[2 * i + 1];
+      if (l < lo) lo = l;
+      if (h > hi) hi = h;
+    }
+    out[2 * j] = lo;
+    out[2 * j + 1] = hi;
+  }
+  return out;
+}
@@ -0,0 +1,14 @@
+"""테스트 공통: 저장소 루트 모듈 import + 녹화된 픽스처 로더"""
+
+import os
+import sys
+import json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+sys.path.insert(0, ROOT)
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as fp:
+        return json.load(fp)
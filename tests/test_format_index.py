@@ -0,0 +1,73 @@
+"""format_index – 녹화된 포맷 목록(tests/fixtures/formats_youtube.json)에 대한 결정적 선택 확인"""
+
+import random
+
+from conftest import load_fixture
+from format_index import FormatIndex, NATIVE_AUDIO_PREFERENCE
+
+
+def _index(shuffle_seed=None):
+    formats = load_fixture('formats_youtube.json')['formats']
+    if shuffle_seed is not None:
+        random.Random(shuffle_seed).shuffle(formats)
+    return FormatIndex(formats)
+
+
+def test_nearest_height_ties_pick_lower():
+    index = _index()
+    assert index.heights == [144, 240, 360, 480, 720, 1080, 1440]
+    assert index.nearest_height(600) == 480         # 480/720 과 같은 거리 → 낮은 쪽
+    assert index.nearest_height(900) == 720         # 720/1080 같은 거리
+    assert index.nearest_height(1000) == 1080
+    assert index.nearest_height(100) == 144
+    assert index.nearest_height(4320) == 1440
+
+
+def test_preference_order_within_height():
+    index = _index()
+    # 병합 불필요(영상+오디오) 가 코덱/전송 방식보다 우선
+    assert index.by_height[360][0]['format_id'] == '18'
+    # avc1 > vp9 > av01, 같은 코덱이면 단일 파일(https) > HLS
+    assert [f['format_id'] for f in index.by_height[720]] == ['136', '232', '247', '398']
+    # 같은 코덱·전송이면 fps 가 높은 쪽
+    assert index.by_height[1080][0]['format_id'] == '299'
+
+
+def test_merge_pairs_same_container_audio():
+    index = _index()
+    avc = index.best_video(720)
+    assert avc['video']['format_id'] == '136'
+    assert avc['merge'] and avc['audio']['format_id'] == '140' and avc['container'] == 'mp4'
+
+    vp9 = index.best_video(1440)
+    assert vp9['video']['format_id'] == '271'
+    assert vp9['merge'] and vp9['audio']['format_id'] == '251' and vp9['container'] == 'webm'
+
+    muxed = index.best_video(360)
+    assert not muxed['merge'] and muxed['audio'] is None
+
+
+def test_unknown_acodec_is_not_treated_as_muxed():
+    index = _index()
+    # 91 은 acodec 을 모름(None) – 오디오가 있다고 보고 병합을 건너뛰면 무음 영상이 될 수 있으므로
+    # 영상 전용처럼 다뤄 코덱/전송 방식으로만 순위를 매김
+    assert [f['format_id'] for f in index.by_height[240]] == ['133', '91', '242']
+    choice = index.best_video(240)
+    assert choice['merge'] and choice['audio'] is not None
+
+
+def test_audio_preference():
+    index = _index()
+    assert index.best_audio(NATIVE_AUDIO_PREFERENCE)['format_id'] == '140'
+    assert index.best_audio(('webm',))['format_id'] == '251'
+    assert [f['format_id'] for f in index.audio_choices(2)] == ['251', '140']
+
+
+def test_selection_is_independent_of_input_order():
+    expected = _index()
+    for seed in range(5):
+        index = _index(seed)
+        for target in (144, 360, 600, 720, 1080, 2160):
+            a, b = expected.best_video(target), index.best_video(target)
+            assert a['video']['format_id'] == b['video']['format_id']
+            assert (a['audio'] or {}).get('format_id') == (b['audio'] or {}).get('format_id')
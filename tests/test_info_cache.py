@@ -0,0 +1,53 @@
+"""info_cache – 녹화된 info dict(tests/fixtures/info_video.json)로 TTL 만료 / LRU 용량 제거 확인"""
+
+import os
+
+from conftest import load_fixture
+from info_cache import InfoCache, cache_key, VIDEO_TTL
+
+
+class _Clock:
+    """주입용 시계 – 테스트가 직접 시간을 넘김"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expiry(tmp_path):
+    info = load_fixture('info_video.json')
+    clock = _Clock()
+    cache = InfoCache(str(tmp_path), clock=clock)
+    key = cache_key(info['webpage_url'])
+    assert key == 'video:fixture02'
+
+    cache.put(key, info)
+    clock.now += VIDEO_TTL - 1
+    assert cache.get(key, VIDEO_TTL) == info
+
+    clock.now += 2
+    assert cache.get(key, VIDEO_TTL) is None
+    assert not os.listdir(tmp_path)                 # 만료된 항목은 파일도 지움
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path):
+    info = load_fixture('info_video.json')
+    clock = _Clock()
+    probe = InfoCache(str(tmp_path / 'probe'), clock=clock)
+    probe.put('video:a', info)
+    one = probe._size                               # 항목 1개의 압축 크기
+
+    cache = InfoCache(str(tmp_path / 'lru'), max_bytes=one * 2 + one // 2, clock=clock)
+    for vid in ('a', 'b'):
+        cache.put(f'video:{vid}', dict(info, id=vid))
+        clock.now += 10
+    assert cache.get('video:a', VIDEO_TTL)['id'] == 'a'    # a 를 최근 사용으로
+    clock.now += 10
+    cache.put('video:c', dict(info, id='c'))               # 상한 초과 → 가장 오래 안 쓴 b 제거
+
+    assert cache.get('video:b', VIDEO_TTL) is None
+    assert cache.get('video:a', VIDEO_TTL)['id'] == 'a'
+    assert cache.get('video:c', VIDEO_TTL)['id'] == 'c'
+    assert cache._size <= cache.max_bytes
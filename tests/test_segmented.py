@@ -0,0 +1,100 @@
+"""segmented.py – Range 를 지원하는 로컬 HTTP 서버로 분할 다운로드 / 이어받기 확인"""
+
+import os
+import json
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import segmented
+
+SIZE = 64 * 1024
+SEGMENT = 8 * 1024
+BODY = random.Random(40).randbytes(SIZE)
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """BODY 를 돌려주는 서버 – 'bytes=a-b' 요청은 206, 받은 Range 헤더를 server.ranges 에 기록"""
+
+    def do_GET(self):
+        rng = self.headers.get('Range')
+        with self.server.lock:
+            self.server.ranges.append(rng)
+        if rng and rng.startswith('bytes='):
+            a, _, b = rng[6:].partition('-')
+            start, end = int(a), min(int(b) if b else SIZE - 1, SIZE - 1)
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{SIZE}')
+        else:
+            start, end = 0, SIZE - 1
+            self.send_response(200)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(BODY[start:end + 1])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _RangeHandler)
+    httpd.ranges = []
+    httpd.lock = threading.Lock()
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    t.join()
+
+
+def _url(httpd):
+    return f'http://127.0.0.1:{httpd.server_address[1]}/file.bin'
+
+
+def _segment_ranges(httpd):
+    """크기 확인용 bytes=0-0 을 뺀 구간 요청들"""
+    return sorted(r for r in httpd.ranges if r != 'bytes=0-0')
+
+
+def test_parallel_segments_join_into_identical_file(server, tmp_path):
+    out = str(tmp_path / 'file.bin')
+    dl = segmented.SegmentedDownload(_url(server), out, connections=4, min_segment=SEGMENT)
+    assert dl.run() == out
+
+    with open(out, 'rb') as fp:
+        assert fp.read() == BODY
+    assert len(_segment_ranges(server)) == SIZE // SEGMENT
+    assert not os.path.exists(out + '.part')
+    assert not os.path.exists(out + segmented.STATE_SUFFIX)
+
+
+def test_resume_fetches_only_missing_ranges(server, tmp_path):
+    out = str(tmp_path / 'file.bin')
+    # 앞 4 구간은 다 받았고, 5번째는 1000 바이트만, 나머지는 아직 – 중단된 상태를 그대로 재현
+    segments = []
+    for i, start in enumerate(range(0, SIZE, SEGMENT)):
+        done = SEGMENT if i < 4 else 1000 if i == 4 else 0
+        segments.append([start, start + SEGMENT - 1, done])
+    with open(out + '.part', 'wb') as fp:
+        fp.truncate(SIZE)
+        for start, _, done in segments:
+            fp.seek(start)
+            fp.write(BODY[start:start + done])
+    with open(out + segmented.STATE_SUFFIX, 'w', encoding='utf-8') as fp:
+        json.dump({'url': _url(server), 'size': SIZE, 'segments': segments}, fp)
+
+    reports = []
+    segmented.SegmentedDownload(_url(server), out, connections=4, min_segment=SEGMENT,
+                                progress_hook=reports.append).run()
+
+    with open(out, 'rb') as fp:
+        assert fp.read() == BODY
+    resumed = sum(done for _, _, done in segments)
+    assert reports[0]['status'] == 'downloading'            # 재시작 직후 이미 받은 만큼 알림
+    assert reports[0]['downloaded_bytes'] == reports[0]['resumed_bytes'] == resumed
+    assert _segment_ranges(server) == sorted(
+        f'bytes={start + done}-{end}' for start, end, done in segments if start + done <= end)
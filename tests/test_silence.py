@@ -0,0 +1,35 @@
+"""silence – numpy 엔진과 순수 Python 대체 경로가 같은 구간을 내는지 확인"""
+
+import array
+import random
+
+import pytest
+
+import silence
+
+np = pytest.importorskip('numpy')
+
+RATE = 8000
+
+
+def _samples(seconds, quiet):
+    """잡음 위에 quiet [(시작 초, 끝 초)] 구간만 0 인 int16 memoryview"""
+    rnd = random.Random(50)
+    buf = array.array('h', (rnd.randint(-3000, 3000) for _ in range(seconds * RATE)))
+    for a, b in quiet:
+        buf[a * RATE:b * RATE] = array.array('h', bytes(2 * (b - a) * RATE))
+    return memoryview(buf)
+
+
+def test_numpy_engine_is_default():
+    assert silence.ENGINE == 'numpy'
+
+
+def test_engines_agree(monkeypatch):
+    samples = _samples(20, [(0, 2), (5, 6), (9, 10), (18, 20)])
+    fast = silence.detect(samples, RATE)
+    monkeypatch.setattr(silence, 'np', None)
+    slow = silence.detect(samples, RATE)
+    assert fast == slow
+    # 맨 앞/맨 끝 무음은 바깥쪽 가장자리에 pad 없음, 나머지는 양쪽에 pad
+    assert fast == [(0.0, 1.9), (5.1, 5.9), (9.1, 9.9), (18.1, 20.0)]
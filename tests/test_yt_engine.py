@@ -0,0 +1,109 @@
+"""yt_engine CLI – 로컬 http.server 의 미디어 파일로 JSON-lines 이벤트와 종료 코드 확인 (generic 추출기)"""
+
+import io
+import os
+import json
+import random
+import functools
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import pytest
+
+pytest.importorskip('yt_dlp')
+
+import yt_engine
+
+BODY = random.Random(34).randbytes(200 * 1024)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path):
+    """clip.mp4 하나를 내주는 서버 → 기본 URL"""
+    root = tmp_path / 'site'
+    root.mkdir()
+    (root / 'clip.mp4').write_bytes(BODY)
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0),
+                                functools.partial(_QuietHandler, directory=str(root)))
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+    t.join()
+
+
+def _run(argv, stdin=''):
+    """main() → (종료 코드, 이벤트 목록)"""
+    out = io.StringIO()
+    code = yt_engine.main(argv, io.StringIO(stdin), out)
+    return code, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def _args(out_dir, *urls):
+    return list(urls) + ['-o', str(out_dir), '--no-cache', '--parallel', '2']
+
+
+def test_success_from_stdin(site, tmp_path):
+    out = tmp_path / 'out'
+    code, events = _run(_args(out), stdin=f'# 주석\n\n{site}/clip.mp4\n')
+
+    assert code == yt_engine.EXIT_OK
+    assert events[0] == {'event': 'start', 'total': 1}
+    assert any(e['event'] == 'item' and e['status'] == 'done' for e in events)
+    assert events[-1]['event'] == 'done'
+    assert (events[-1]['exit'], events[-1]['finished'], events[-1]['failed']) == (0, 1, 0)
+    files = [f for f in os.listdir(out) if not f.startswith('.')]
+    assert len(files) == 1 and (out / files[0]).read_bytes() == BODY
+
+
+def test_bad_args(tmp_path):
+    code, events = _run(_args(tmp_path))                 # URL 없음 (stdin 도 비어 있음)
+    assert code == yt_engine.EXIT_USAGE
+    assert events == [{'event': 'error', 'message': '입력 URL 없음'}]
+
+    code, events = _run(_args(tmp_path, 'http://127.0.0.1/x.mp4') + ['--section', 'abc'])
+    assert code == yt_engine.EXIT_USAGE
+    assert [e['event'] for e in events] == ['error']
+
+    code, events = _run(['-i', str(tmp_path / 'missing.txt')])
+    assert code == yt_engine.EXIT_USAGE
+    assert events[0]['message'].startswith('입력 파일 오류')
+
+    with pytest.raises(SystemExit) as exc:               # argparse 가 거부하는 옵션 값
+        _run(['--type', 'bogus', 'http://127.0.0.1/x.mp4'])
+    assert exc.value.code == yt_engine.EXIT_USAGE
+
+
+def test_download_failure(site, tmp_path):
+    code, events = _run(_args(tmp_path / 'out', f'{site}/missing.mp4'))
+
+    assert code == yt_engine.EXIT_FAILED
+    errors = [e for e in events if e['event'] == 'item' and e['status'] == 'error']
+    assert len(errors) == 1 and '404' in errors[0]['error']
+    assert events[-1]['event'] == 'done' and events[-1]['exit'] == yt_engine.EXIT_FAILED
+
+
+def test_partial_failure(site, tmp_path):
+    code, events = _run(_args(tmp_path / 'out', f'{site}/clip.mp4', f'{site}/missing.mp4'))
+
+    assert code == yt_engine.EXIT_PARTIAL
+    done = events[-1]
+    assert (done['event'], done['total'], done['failed'], done['exit']) == ('done', 2, 1, 1)
+
+
+def test_interrupt(monkeypatch, tmp_path):
+    class _Job:
+        def run(self):
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(yt_engine.DownloadEngine, 'playlist_job', lambda self, *a, **kw: _Job())
+    code, events = _run(_args(tmp_path, 'http://127.0.0.1/x.mp4'))
+
+    assert code == yt_engine.EXIT_INTERRUPTED
+    assert events[-1] == {'event': 'done', 'interrupted': True, 'exit': yt_engine.EXIT_INTERRUPTED}
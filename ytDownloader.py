@@ -1,4 +1,3 @@
-import yt_dlp
 import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
@@ -6,7 +5,13 @@ import customtkinter as ctk
 from pathlib import Path
 import threading
 import subprocess
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from info_cache import InfoCache
+from playlist_view import VirtualCheckList
+from progress_feed import ProgressAggregator, REFRESH_HZ
+from editor_ingest import EditorIngest
+from format_index import format_index, has_audio as format_has_audio
+from yt_engine import (DownloadEngine, INFO_CACHE_DIR, detect_url_type,
+                       entry_url, build_selected_opts, parse_time_ranges)
 
 # customtkinter 테마 설정
 ctk.set_appearance_mode("dark")
@@ -42,11 +47,15 @@ class YouTubeDownloaderGUI:
         self.download_path = os.path.join(os.path.expanduser("~"), "Downloads", "YouTube")
         self.is_playlist = False
         self.playlist_entries = []
+        self.engine = DownloadEngine(InfoCache(INFO_CACHE_DIR))
+        # 워커 스레드 진행 상황은 여기 모아 두고 메인 루프가 주기적으로 반영
+        self.progress = ProgressAggregator()
         
         # FFmpeg 경로 확인
         self.check_ffmpeg()
         
         self.create_widgets()
+        self._drain_progress()
     
     def check_ffmpeg(self):
         """FFmpeg 설치 확인"""
@@ -129,7 +138,12 @@ class YouTubeDownloaderGUI:
                            value="audio", command=self._on_type_change,
                            fg_color=self.ACCENT, hover_color=self.ACCENT_HOVER,
                            border_color=self.TEXT_SECONDARY, text_color=self.TEXT_PRIMARY
-                           ).grid(row=0, column=2)
+                           ).grid(row=0, column=2, padx=(0, 16))
+        ctk.CTkRadioButton(type_row, text="오디오 (원본)", variable=self.download_type,
+                           value="audio_native", command=self._on_type_change,
+                           fg_color=self.ACCENT, hover_color=self.ACCENT_HOVER,
+                           border_color=self.TEXT_SECONDARY, text_color=self.TEXT_PRIMARY
+                           ).grid(row=0, column=3)
 
 
 
@@ -164,6 +178,58 @@ class YouTubeDownloaderGUI:
         ctk.CTkLabel(thread_row, text="(1~12)", font=ctk.CTkFont(size=11),
                      text_color=self.TEXT_SECONDARY).grid(row=0, column=4)
 
+        # 동시 다운로드 수 (플레이리스트 항목 단위)
+        parallel_row = ctk.CTkFrame(left_col, fg_color="transparent")
+        parallel_row.grid(row=2, column=0, sticky="w", pady=(8, 0))
+
+        ctk.CTkLabel(parallel_row, text="동시", font=ctk.CTkFont(size=12),
+                     text_color=self.TEXT_SECONDARY).grid(row=0, column=0, padx=(0, 12))
+
+        ctk.CTkButton(parallel_row, text="−", width=30, height=30,
+                      corner_radius=6, fg_color=self.ENTRY_BG,
+                      hover_color="#1a4a7a", text_color=self.TEXT_PRIMARY,
+                      font=ctk.CTkFont(size=14, weight="bold"),
+                      command=lambda: self._adjust_parallel(-1)).grid(row=0, column=1, padx=(0, 2))
+
+        self.parallel_entry = ctk.CTkEntry(parallel_row, width=45, height=30, corner_radius=8,
+                                           fg_color=self.ENTRY_BG, border_width=0,
+                                           text_color=self.TEXT_PRIMARY, justify="center")
+        self.parallel_entry.insert(0, "3")
+        self.parallel_entry.grid(row=0, column=2, padx=0)
+
+        ctk.CTkButton(parallel_row, text="+", width=30, height=30,
+                      corner_radius=6, fg_color=self.ENTRY_BG,
+                      hover_color="#1a4a7a", text_color=self.TEXT_PRIMARY,
+                      font=ctk.CTkFont(size=14, weight="bold"),
+                      command=lambda: self._adjust_parallel(1)).grid(row=0, column=3, padx=(2, 6))
+
+        ctk.CTkLabel(parallel_row, text="(1~8, 플레이리스트)", font=ctk.CTkFont(size=11),
+                     text_color=self.TEXT_SECONDARY).grid(row=0, column=4)
+
+        # 전체 속도 상한 (모든 동시 다운로드 합)
+        rate_row = ctk.CTkFrame(left_col, fg_color="transparent")
+        rate_row.grid(row=3, column=0, sticky="w", pady=(8, 0))
+
+        ctk.CTkLabel(rate_row, text="속도", font=ctk.CTkFont(size=12),
+                     text_color=self.TEXT_SECONDARY).grid(row=0, column=0, padx=(0, 12))
+
+        self.rate_entry = ctk.CTkEntry(rate_row, width=60, height=30, corner_radius=8,
+                                       fg_color=self.ENTRY_BG, border_width=0,
+                                       text_color=self.TEXT_PRIMARY, justify="center")
+        self.rate_entry.insert(0, "0")
+        self.rate_entry.grid(row=0, column=1, padx=(0, 6))
+
+        ctk.CTkLabel(rate_row, text="MB/s (0 = 무제한)", font=ctk.CTkFont(size=11),
+                     text_color=self.TEXT_SECONDARY).grid(row=0, column=2)
+
+        # 완료 파일을 편집기(app.py, localhost:5555)에 바로 등록 + 파형 미리 생성
+        self.ingest_var = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(left_col, text="완료 후 편집기로 보내기", variable=self.ingest_var,
+                        font=ctk.CTkFont(size=12), text_color=self.TEXT_SECONDARY,
+                        fg_color=self.ACCENT, hover_color=self.ACCENT_HOVER,
+                        border_color=self.TEXT_SECONDARY, checkmark_color="#ffffff",
+                        corner_radius=4).grid(row=4, column=0, sticky="w", pady=(8, 0))
+
         # ── 오른쪽: 저장 경로 ──
         # ── 오른쪽: 저장 경로 ──
         right_col = ctk.CTkFrame(settings_inner, fg_color="transparent")
@@ -190,6 +256,17 @@ class YouTubeDownloaderGUI:
         self.path_entry.insert(0, self.download_path)
         self.path_entry.grid(row=1, column=0, sticky="ew")
 
+        # 구간 다운로드 (비우면 전체)
+        ctk.CTkLabel(right_col, text="구간 (예: 1:02:00-1:04:00, 비우면 전체)",
+                     font=ctk.CTkFont(size=12), text_color=self.TEXT_SECONDARY, anchor="w"
+                     ).grid(row=2, column=0, sticky="w", pady=(8, 4))
+
+        self.range_entry = ctk.CTkEntry(right_col, height=34, corner_radius=8,
+                                        fg_color=self.ENTRY_BG, border_width=0,
+                                        text_color=self.TEXT_PRIMARY,
+                                        placeholder_text="시작-끝, 시작-끝 ...")
+        self.range_entry.grid(row=3, column=0, sticky="ew")
+
         # ── 품질/해상도 선택 섹션 ──
         ctk.CTkLabel(main_frame, text="품질 / 해상도 선택",
                      font=ctk.CTkFont(size=12, weight="bold"),
@@ -241,26 +318,26 @@ class YouTubeDownloaderGUI:
                                             text_color=self.TEXT_SECONDARY)
         self.pl_select_label.grid(row=0, column=2, padx=(6, 0))
 
-        # 체크박스 스크롤 영역
-        self.playlist_scroll_frame = ctk.CTkScrollableFrame(
-            self.playlist_section_frame, fg_color="transparent",
-            height=250)
-        self.playlist_scroll_frame.grid(row=1, column=0, columnspan=2, sticky="ew",
-                                        padx=6, pady=(0, 10))
-        self.playlist_scroll_frame.columnconfigure(0, weight=1)
+        # 체크 목록 (보이는 줄만 그리는 가상화 목록 – 항목 수천 개도 즉시 표시)
+        self.playlist_list = VirtualCheckList(
+            self.playlist_section_frame, height=250, bg=self.BG_CARD,
+            text_color=self.TEXT_SECONDARY, check_color=self.ACCENT,
+            border_color=self.ENTRY_BG, on_change=self._on_playlist_select)
+        self.playlist_list.grid(row=1, column=0, columnspan=2, sticky="ew",
+                                padx=6, pady=(0, 10))
 
         # 플레이리스트 스크롤 시 부모 스크롤 전파 방지
         def _is_mouse_over_playlist():
             """마우스가 플레이리스트 스크롤 영역 위에 있는지 확인"""
             try:
-                if not self.playlist_scroll_frame.winfo_ismapped():
+                if not self.playlist_list.winfo_ismapped():
                     return False
-                if not self.playlist_scroll_frame.winfo_viewable():
+                if not self.playlist_list.winfo_viewable():
                     return False
-                w = self.playlist_scroll_frame.winfo_rootx()
-                h = self.playlist_scroll_frame.winfo_rooty()
-                w2 = w + self.playlist_scroll_frame.winfo_width()
-                h2 = h + self.playlist_scroll_frame.winfo_height()
+                w = self.playlist_list.winfo_rootx()
+                h = self.playlist_list.winfo_rooty()
+                w2 = w + self.playlist_list.winfo_width()
+                h2 = h + self.playlist_list.winfo_height()
                 mx = self.root.winfo_pointerx()
                 my = self.root.winfo_pointery()
                 return w <= mx <= w2 and h <= my <= h2
@@ -269,17 +346,13 @@ class YouTubeDownloaderGUI:
 
         def _smart_mousewheel(e):
             if _is_mouse_over_playlist():
-                self.playlist_scroll_frame._parent_canvas.yview_scroll(int(-e.delta / 10), "units")
+                self.playlist_list.yview_scroll(int(-e.delta / 10), "units")
             else:
                 self.main_frame._parent_canvas.yview_scroll(int(-e.delta / 10), "units")
             return "break"
 
         self.root.bind_all("<MouseWheel>", _smart_mousewheel)
 
-        # 체크박스 변수 목록
-        self.playlist_check_vars = []
-        self.playlist_check_widgets = []
-
         # 기본 숨김
         self._hide_playlist_section()
 
@@ -321,15 +394,11 @@ class YouTubeDownloaderGUI:
     
     def _select_all_playlist(self):
         """플레이리스트 전체 선택"""
-        for var in self.playlist_check_vars:
-            var.set(True)
-        self._update_playlist_select_label()
+        self.playlist_list.set_all(True)
 
     def _deselect_all_playlist(self):
         """플레이리스트 선택 해제"""
-        for var in self.playlist_check_vars:
-            var.set(False)
-        self._update_playlist_select_label()
+        self.playlist_list.set_all(False)
 
     def _on_playlist_select(self, event=None):
         """플레이리스트 선택 변경 시 레이블 업데이트"""
@@ -337,13 +406,13 @@ class YouTubeDownloaderGUI:
 
     def _update_playlist_select_label(self):
         """선택 수 레이블 갱신"""
-        selected = sum(1 for v in self.playlist_check_vars if v.get())
-        total = len(self.playlist_check_vars)
+        selected = self.playlist_list.selected_count
+        total = len(self.playlist_list)
         self.pl_select_label.configure(text=f"{selected}/{total} 선택됨")
 
     def _get_selected_playlist_indices(self):
         """체크된 항목의 인덱스 리스트 반환"""
-        return [i for i, v in enumerate(self.playlist_check_vars) if v.get()]
+        return self.playlist_list.selected_indices()
 
     def _on_type_change(self):
         """다운로드 타입 변경 시 처리"""
@@ -359,6 +428,16 @@ class YouTubeDownloaderGUI:
         self.thread_entry.delete(0, tk.END)
         self.thread_entry.insert(0, str(new_val))
 
+    def _adjust_parallel(self, delta):
+        """동시 다운로드 수 증가/감소"""
+        try:
+            current = int(self.parallel_entry.get())
+        except ValueError:
+            current = 3
+        new_val = max(1, min(8, current + delta))
+        self.parallel_entry.delete(0, tk.END)
+        self.parallel_entry.insert(0, str(new_val))
+
     def _show_playlist_section(self):
         """플레이리스트 목록 섹션 표시"""
         self.playlist_section_label.grid(row=8, column=0, sticky="w", pady=(8, 2), padx=2)
@@ -382,37 +461,13 @@ class YouTubeDownloaderGUI:
         else:
             self.thread_label.config(text=f"{count}개 (매우 빠름)")
     
-    @staticmethod
-    def detect_url_type(url):
-        """
-        URL 타입 감지.
-        Returns: (clean_url, is_playlist)
-        - list= 파라미터 있음 (라디오 포함) → 플레이리스트
-        - 그 외 → 단일 영상
-        """
-        parsed = urlparse(url)
-        params = parse_qs(parsed.query)
-
-        has_list = 'list' in params
-
-        if has_list:
-            # list 파라미터가 있으면 플레이리스트로 처리 (RD 라디오 포함)
-            return url, True
-
-        # 단일 영상
-        clean_params = {}
-        if 'v' in params:
-            clean_params['v'] = params['v'][0]
-        clean_query = urlencode(clean_params)
-        return urlunparse(parsed._replace(query=clean_query)), False
-
     def fetch_video_info(self):
         url = self.url_entry.get().strip()
         if not url:
             messagebox.showwarning("경고", "YouTube URL을 입력해주세요.")
             return
 
-        clean_url, is_playlist = self.detect_url_type(url)
+        clean_url, is_playlist = detect_url_type(url)
         self.is_playlist = is_playlist
         self.playlist_entries = []
 
@@ -431,53 +486,19 @@ class YouTubeDownloaderGUI:
     def _fetch_video_info_thread(self, url, is_playlist):
         try:
             if is_playlist:
-                ydl_opts = {
-                    'quiet': True,
-                    'no_warnings': True,
-                    'noplaylist': False,
-                    'extract_flat': 'in_playlist',   # 빠른 목록만 추출
-                    'no_check_certificates': True,
-                    'geo_bypass': True,
-                }
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=False)
-
-                entries = list(info.get('entries', []))
-                # 다운로드 불가 항목 필터링 (Private, Deleted 등)
-                _skip = {'[private video]', '[deleted video]', '[unavailable video]'}
-                entries = [e for e in entries if e and
-                           e.get('title', '').strip().lower() not in _skip and
-                           e.get('id') is not None]
+                info, entries = self.engine.extract_playlist(url)
                 self.playlist_entries = entries
                 self.video_info = info  # 플레이리스트 메타로 저장
 
                 # 플레이리스트 첫 번째 영상의 포맷 정보를 가져오기 위해 단일 영상 정보 추출
                 if entries:
-                    first_url = entries[0].get('url') or entries[0].get('id')
-                    if first_url and not first_url.startswith('http'):
-                        first_url = f"https://www.youtube.com/watch?v={first_url}"
-                    single_opts = {
-                        'quiet': True, 'no_warnings': True,
-                        'noplaylist': True,
-                        'no_check_certificates': True, 'geo_bypass': True,
-                    }
-                    with yt_dlp.YoutubeDL(single_opts) as ydl2:
-                        first_info = ydl2.extract_info(first_url, download=False)
-                    self.video_info_single = first_info
+                    self.video_info_single = self.engine.extract_single_info(entry_url(entries[0]))
                 else:
                     self.video_info_single = None
 
                 self.root.after(0, self.display_playlist_info)
             else:
-                ydl_opts = {
-                    'quiet': True,
-                    'no_warnings': True,
-                    'noplaylist': True,
-                    'no_check_certificates': True,
-                    'geo_bypass': True,
-                }
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    self.video_info = ydl.extract_info(url, download=False)
+                self.video_info = self.engine.extract_single_info(url)
                 self.video_info_single = self.video_info
                 self.root.after(0, self.display_video_info)
         except Exception as e:
@@ -527,34 +548,9 @@ class YouTubeDownloaderGUI:
 
         # 플레이리스트 목록 표시
         self._show_playlist_section()
-        # 기존 체크박스 제거
-        for w in self.playlist_check_widgets:
-            w.destroy()
-        self.playlist_check_vars.clear()
-        self.playlist_check_widgets.clear()
-
-        for i, entry in enumerate(self.playlist_entries):
-            title = entry.get('title', entry.get('id', '알 수 없음'))
-            var = ctk.BooleanVar(value=True)
-            cb = ctk.CTkCheckBox(
-                self.playlist_scroll_frame,
-                text=f"⏳  {i+1:>3}.  {title}",
-                variable=var,
-                font=ctk.CTkFont(family="Consolas", size=11),
-                text_color=self.TEXT_SECONDARY,
-                fg_color=self.ACCENT,
-                hover_color=self.ACCENT_HOVER,
-                border_color=self.ENTRY_BG,
-                checkmark_color="#ffffff",
-                corner_radius=4,
-                command=self._on_playlist_select
-            )
-            cb.grid(row=i, column=0, sticky="w", padx=6, pady=1)
-            self.playlist_check_vars.append(var)
-            self.playlist_check_widgets.append(cb)
-
-        # 기본: 전체 선택 (이미 True로 초기화)
-        self._update_playlist_select_label()
+        # 기본: 전체 선택
+        self.playlist_list.set_items(
+            entry.get('title', entry.get('id', '알 수 없음')) for entry in self.playlist_entries)
 
         self._finish_fetch()
 
@@ -570,48 +566,37 @@ class YouTubeDownloaderGUI:
         self.download_btn.configure(state="normal")
     
     def extract_formats(self, source=None):
+        """표시용 포맷 목록 – 높이별 최선 포맷 1개씩 (병합 불필요 > 호환 코덱 > fps 순)"""
         self.video_formats = []
         self.audio_formats = []
         info = source or self.video_info
         if not info or 'formats' not in info:
             return
-        for f in info['formats']:
-            if f.get('vcodec') != 'none' and f.get('height'):
-                format_info = {
-                    'format_id': f['format_id'],
-                    'ext': f['ext'],
-                    'resolution': f.get('height'),
-                    'fps': f.get('fps', 'N/A'),
-                    'filesize': f.get('filesize'),
-                    'has_audio': f.get('acodec') != 'none',
-                    'vcodec': f.get('vcodec', ''),
-                    'acodec': f.get('acodec', 'none')
-                }
-                self.video_formats.append(format_info)
-            
-            elif f.get('acodec') != 'none' and f.get('vcodec') == 'none':
-                format_info = {
-                    'format_id': f['format_id'],
-                    'ext': f['ext'],
-                    'abr': f.get('abr', 'N/A'),
-                    'acodec': f.get('acodec', ''),
-                    'filesize': f.get('filesize')
-                }
-                self.audio_formats.append(format_info)
-        
-        seen = {}
-        for f in self.video_formats:
-            res = f['resolution']
-            if res not in seen or (f['has_audio'] and not seen[res]['has_audio']):
-                seen[res] = f
-        
-        self.video_formats = sorted(seen.values(), key=lambda x: x['resolution'], reverse=True)
-        
-        self.audio_formats = sorted(
-            [f for f in self.audio_formats if isinstance(f.get('abr'), (int, float))],
-            key=lambda x: x.get('abr', 0),
-            reverse=True
-        )[:5]
+        index = format_index(info)
+        for f in index.video_choices():
+            has_audio = format_has_audio(f)
+            # 병합이 필요하면 스트림 복사로 합쳐지는 오디오를 미리 짝지어 둠
+            audio = None if has_audio else index.audio_for(f)
+            self.video_formats.append({
+                'format_id': f['format_id'],
+                'ext': f['ext'],
+                'resolution': f.get('height'),
+                'fps': f.get('fps', 'N/A'),
+                'filesize': f.get('filesize'),
+                'has_audio': has_audio,
+                'vcodec': f.get('vcodec', ''),
+                'acodec': f.get('acodec') or 'none',
+                'audio_id': audio['format_id'] if audio else None,
+            })
+
+        for f in index.audio_choices(5):
+            self.audio_formats.append({
+                'format_id': f['format_id'],
+                'ext': f['ext'],
+                'abr': f.get('abr', 'N/A'),
+                'acodec': f.get('acodec') or '',
+                'filesize': f.get('filesize')
+            })
     
     def update_format_list(self):
         self.format_listbox.delete(0, tk.END)
@@ -636,6 +621,7 @@ class YouTubeDownloaderGUI:
                     self.format_listbox.insert(tk.END, text)
                     self.displayed_video_formats.append(fmt)
         else:
+            native = self.download_type.get() == "audio_native"
             if self.audio_formats:
                 for fmt in self.audio_formats:
                     abr = fmt.get('abr', 'N/A')
@@ -643,10 +629,12 @@ class YouTubeDownloaderGUI:
                     acodec = fmt.get('acodec', '?')
                     codec_short = acodec.split('.')[0] if '.' in acodec else acodec
                     abr_str = f"{abr}kbps" if isinstance(abr, (int, float)) else str(abr)
-                    text = f"MP3 | {abr_str:>10} | {codec_short:>5} | {size_str}"
+                    label = fmt['ext'].upper() if native else "MP3"
+                    text = f"{label:4} | {abr_str:>10} | {codec_short:>5} | {size_str}"
                     self.format_listbox.insert(tk.END, text)
             else:
-                self.format_listbox.insert(tk.END, "최고 품질 오디오 (MP3 변환)")
+                self.format_listbox.insert(tk.END, "최고 품질 오디오 (원본 유지)" if native
+                                           else "최고 품질 오디오 (MP3 변환)")
 
         # 리스트박스 높이를 항목 수에 맞춰 동적 조절 (min 1, max 10)
         count = self.format_listbox.size()
@@ -681,7 +669,13 @@ class YouTubeDownloaderGUI:
             return
         
         download_type = self.download_type.get()
-        
+
+        try:
+            ranges = parse_time_ranges(self.range_entry.get())
+        except ValueError as e:
+            messagebox.showwarning("경고", str(e))
+            return
+
         if download_type == "video":
             selection = self.format_listbox.curselection()
             if not selection:
@@ -700,12 +694,24 @@ class YouTubeDownloaderGUI:
             else:
                 selected_format = None
         
+        self.progress.reset()
         self.status_label.configure(text="⏳ 다운로드 준비 중...")
         self.detail_label.configure(text="")
         self.file_label.configure(text="")
         self.progress_bar.set(0)
         self.download_btn.configure(state="disabled")
 
+        # 전체 속도 상한 → 스케줄러 (진행 중인 다운로드에도 바로 반영)
+        try:
+            rate_mb = max(0.0, float(self.rate_entry.get()))
+        except ValueError:
+            rate_mb = 0.0
+        self.engine.scheduler.set_max_rate(int(rate_mb * 1024 * 1024))
+        if self.ingest_var.get():
+            self.engine.ingest = self.engine.ingest or EditorIngest()
+        else:
+            self.engine.ingest = None
+
         if self.is_playlist and self.playlist_entries:
             # 선택된 항목만 다운로드
             selected_indices = self._get_selected_playlist_indices()
@@ -716,11 +722,11 @@ class YouTubeDownloaderGUI:
             selected_entries = [self.playlist_entries[i] for i in selected_indices]
             thread = threading.Thread(target=self._download_playlist_thread,
                                      args=(selected_format, download_path, download_type,
-                                           selected_entries, list(selected_indices)))
+                                           selected_entries, list(selected_indices), ranges))
         else:
             thread = threading.Thread(target=self._download_thread,
                                      args=(self.url_entry.get(), selected_format,
-                                          download_path, download_type))
+                                          download_path, download_type, ranges))
         thread.start()
     
     # def progress_hook(self, d):
@@ -748,44 +754,37 @@ class YouTubeDownloaderGUI:
     #         self.root.after(0, self.update_progress, 100, "완료", "0초")
 
     def progress_hook(self, d):
-        """다운로드 진행 상황을 GUI에 최적화하여 반영하는 콜백"""
-
-        if d['status'] == 'downloading':
-            downloaded = d.get('downloaded_bytes', 0)
-
-            # total_bytes 또는 total_bytes_estimate
-            total = d.get('total_bytes') or d.get('total_bytes_estimate')
-            if not total or total == 0:
-                percent = 0
-            else:
-                percent = (downloaded / total) * 100
-
-            # 🔥 10% 단위 제한
-            rounded = int(percent // 5) * 5
-            if rounded > 100:
-                rounded = 100
-
-            # 🔥 이전과 동일한 진행률이면 업데이트하지 않음 → 성능 최적화
-            if getattr(self, "last_progress", -1) == rounded:
-                return
-
-            self.last_progress = rounded  # 캐싱
-
-            speed_str = self.format_speed(d.get('speed'))
-            eta_str = self.format_time(d.get('eta'))
-
-            # 파일명 추출
-            filename = os.path.basename(d.get('filename', ''))
-
-            # 🔥 최소한의 UI 업데이트
-            self.root.after(0, self.update_progress, rounded, speed_str, eta_str, filename)
-
-        elif d['status'] == 'finished':
-            self.last_progress = 100
-            filename = os.path.basename(d.get('filename', ''))
-            self.root.after(0, self.update_progress, 100, "완료", "0초", filename)
+        """다운로드 진행 콜백 (워커 스레드) – 최신 값만 집계기에 남김, 화면 반영은 _drain_progress"""
+        if d['status'] in ('downloading', 'finished'):
+            self.progress.push_single(d)
+
+    def _drain_progress(self, schedule=True):
+        """집계된 진행 상황을 한 번에 반영 (메인 스레드, REFRESH_HZ 주기)"""
+        batch = self.progress.drain()
+        if batch:
+            items, overall, single = batch
+            for ev in items:
+                self._update_playlist_item_status(ev['index'], ev['status'], ev['title'],
+                                                  ev.get('percent'))
+            if overall is not None:
+                self._update_playlist_overall(overall)
+            if single is not None:
+                self._apply_single_progress(single)
+        if schedule:
+            self.root.after(1000 // REFRESH_HZ, self._drain_progress)
+
+    def _apply_single_progress(self, d):
+        filename = os.path.basename(d.get('filename', ''))
+        if d['status'] == 'finished':
+            self.update_progress(100, "완료", "0초", filename)
+            return
+        downloaded = d.get('downloaded_bytes', 0) or 0
+        # total_bytes 또는 total_bytes_estimate
+        total = d.get('total_bytes') or d.get('total_bytes_estimate')
+        percent = min(100, downloaded / total * 100) if total else 0
+        self.update_progress(percent, self.format_speed(d.get('speed')),
+                             self.format_time(d.get('eta')), filename)
 
-    
     def format_speed(self, speed):
         if speed is None or speed == 0:
             return "계산 중..."
@@ -818,208 +817,98 @@ class YouTubeDownloaderGUI:
         if filename:
             self.file_label.configure(text=f"📁 {filename}")
     
-    def _download_thread(self, url, selected_format, download_path, download_type):
+    def _download_thread(self, url, selected_format, download_path, download_type, ranges=None):
         try:
             Path(download_path).mkdir(parents=True, exist_ok=True)
             
             # 멀티스레드 개수 가져오기
             thread_count = self.thread_count.get()
             
-            if download_type == 'video':
-                format_id = selected_format['format_id']
-                resolution = selected_format['resolution']
-                
-                # 오디오가 포함된 포맷이면 그대로 다운로드
-                if selected_format['has_audio']:
-                    ydl_opts = {
-                        'format': format_id,
-                        'outtmpl': os.path.join(download_path, f'%(title)s.{resolution}p.%(ext)s'),
-                        'concurrent_fragment_downloads': thread_count,  # 멀티스레드 설정
-                        'progress_hooks': [self.progress_hook],
-                    }
-                else:
-                    # 오디오가 없으면 별도 다운로드 후 병합
-                    ydl_opts = {
-                        'format': f'{format_id}+bestaudio[ext=m4a]/{format_id}+bestaudio/{format_id}',
-                        'outtmpl': os.path.join(download_path, f'%(title)s.{resolution}p.%(ext)s'),
-                        'merge_output_format': 'mp4',
-                        'keepvideo': False,
-                        'concurrent_fragment_downloads': thread_count,  # 멀티스레드 설정
-                        'postprocessors': [{
-                            'key': 'FFmpegVideoRemuxer',
-                            'preferedformat': 'mp4',
-                        }],
-                        'progress_hooks': [self.progress_hook],
-                    }
-            else:
-                # 오디오 다운로드
-                if selected_format:
-                    format_id = selected_format['format_id']
-                    abr = selected_format.get('abr', '')
-                    
-                    if abr and isinstance(abr, (int, float)):
-                        filename_template = f'%(title)s.{int(abr)}kbps.%(ext)s'
-                    else:
-                        filename_template = '%(title)s.%(ext)s'
-                    
-                    ydl_opts = {
-                        'format': format_id,
-                        'outtmpl': os.path.join(download_path, filename_template),
-                        'concurrent_fragment_downloads': thread_count,  # 멀티스레드 설정
-                        'postprocessors': [{
-                            'key': 'FFmpegExtractAudio',
-                            'preferredcodec': 'mp3',
-                            'preferredquality': '192',
-                        }],
-                        'progress_hooks': [self.progress_hook],
-                    }
-                else:
-                    ydl_opts = {
-                        'format': 'bestaudio/best',
-                        'outtmpl': os.path.join(download_path, '%(title)s.%(ext)s'),
-                        'concurrent_fragment_downloads': thread_count,  # 멀티스레드 설정
-                        'postprocessors': [{
-                            'key': 'FFmpegExtractAudio',
-                            'preferredcodec': 'mp3',
-                            'preferredquality': '192',
-                        }],
-                        'progress_hooks': [self.progress_hook],
-                    }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-            
-            # 임시 파일 정리
-            self.cleanup_temp_files(download_path)
-            
+            ydl_opts = build_selected_opts(selected_format, download_path, download_type,
+                                           thread_count, self.progress_hook, ranges)
+
+            # 스케줄러가 조각 연결 수(thread_count 상한)와 속도 몫을 조절
+            # 가져온 영상 정보로 바로 받음 (재추출 없음, 단일 파일 포맷은 분할 다운로드)
+            target = self.video_info if self.video_info and not self.is_playlist else url
+            try:
+                result = self.engine.download(ydl_opts, target, url)
+            except Exception:
+                if target is url:
+                    raise
+                # 캐시된 포맷 URL 만료 등 → 캐시 버리고 URL 로 다시 시도
+                self.engine.invalidate(url)
+                result = self.engine.download(ydl_opts, url)
+            # 편집기 등록 (체크한 경우만, 실패해도 다운로드 결과에는 영향 없음)
+            self.engine.send_to_editor(result['files'], self.video_info or {},
+                                       result['formats'], download_type != 'video', ranges)
+
             self.root.after(0, self.download_complete, download_path)
         except Exception as e:
+            # 남은 .part 는 지우지 않음 → 다시 받으면 yt-dlp 가 이어받는다
             self.root.after(0, lambda: self.show_error(f"다운로드 오류: {str(e)}"))
     
     def _download_playlist_thread(self, selected_format, download_path, download_type,
-                                    entries=None, indices=None):
-        """플레이리스트 선택 항목을 순차 다운로드"""
+                                    entries=None, indices=None, ranges=None):
+        """플레이리스트 선택 항목을 엔진 작업 풀로 동시 N개씩 다운로드"""
         try:
-            Path(download_path).mkdir(parents=True, exist_ok=True)
             if entries is None:
                 entries = self.playlist_entries
                 indices = list(range(len(entries)))
-            total = len(entries)
 
             try:
                 thread_count = int(self.thread_entry.get())
                 thread_count = max(1, min(12, thread_count))
             except ValueError:
                 thread_count = 4
-
-            for dl_idx, (entry, listbox_idx) in enumerate(zip(entries, indices)):
-                video_id = entry.get('url') or entry.get('id')
-                if video_id and not video_id.startswith('http'):
-                    video_url = f"https://www.youtube.com/watch?v={video_id}"
-                else:
-                    video_url = video_id
-
-                title = entry.get('title', video_id or f'영상 {dl_idx+1}')
-
-                # UI 업데이트: 현재 다운로드 중 표시
-                self.root.after(0, self._update_playlist_item_status, listbox_idx, "downloading", title)
-                self.root.after(0, self.status_label.configure,
-                                {"text": f"⬇ [{dl_idx+1}/{total}] {title}"})
-                self.root.after(0, self.file_label.configure,
-                                {"text": f"📁 {title}"})
-                self.root.after(0, self.progress_bar.set, 0)
-                self.last_progress = -1
-
-                # 개별 영상 정보 가져오기
-                try:
-                    info_opts = {
-                        'quiet': True, 'no_warnings': True,
-                        'noplaylist': True,
-                        'no_check_certificates': True, 'geo_bypass': True,
-                    }
-                    with yt_dlp.YoutubeDL(info_opts) as ydl:
-                        single_info = ydl.extract_info(video_url, download=False)
-                except Exception:
-                    self.root.after(0, self._update_playlist_item_status, listbox_idx, "error", title)
-                    continue
-
-                # 다운로드 옵션 구성
-                ydl_opts = self._build_download_opts(
-                    single_info, selected_format, download_path,
-                    download_type, thread_count
-                )
-
-                try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([video_url])
-                    self.root.after(0, self._update_playlist_item_status, listbox_idx, "done", title)
-                except Exception:
-                    self.root.after(0, self._update_playlist_item_status, listbox_idx, "error", title)
-
-            self.cleanup_temp_files(download_path)
-            self.root.after(0, self._playlist_download_complete, download_path, total)
+            try:
+                parallel = int(self.parallel_entry.get())
+                parallel = max(1, min(8, parallel))
+            except ValueError:
+                parallel = 3
+
+            self.root.after(0, self.progress_bar.set, 0)
+            self.root.after(0, self.file_label.configure, {"text": ""})
+
+            job = self.engine.playlist_job(
+                entries, indices=indices,
+                selected_format=selected_format,
+                download_path=download_path,
+                download_type=download_type,
+                thread_count=thread_count,
+                parallel=parallel,
+                on_event=self._on_job_event,
+                ranges=ranges,
+            )
+            summary = job.run()
+            self.root.after(0, self._playlist_download_complete, download_path,
+                            job.total, summary)
         except Exception as e:
             self.root.after(0, lambda: self.show_error(f"플레이리스트 다운로드 오류: {str(e)}"))
 
-    def _build_download_opts(self, single_info, selected_format, download_path,
-                             download_type, thread_count):
-        """단일 영상 다운로드 옵션 구성 (플레이리스트 개별 항목용)"""
-        if download_type == 'video':
-            # 선택 해상도와 가장 가까운 포맷 찾기
-            target_res = selected_format['resolution'] if selected_format else 720
-            best_fmt = None
-            for f in single_info.get('formats', []):
-                if f.get('vcodec') == 'none' or not f.get('height'):
-                    continue
-                if best_fmt is None or abs(f['height'] - target_res) < abs(best_fmt['height'] - target_res):
-                    best_fmt = f
-
-            if best_fmt:
-                fmt_id = best_fmt['format_id']
-                res = best_fmt.get('height', target_res)
-                has_audio = best_fmt.get('acodec', 'none') != 'none'
-            else:
-                fmt_id = 'best'
-                res = target_res
-                has_audio = True
-
-            if has_audio:
-                return {
-                    'format': fmt_id,
-                    'outtmpl': os.path.join(download_path, f'%(title)s.{res}p.%(ext)s'),
-                    'concurrent_fragment_downloads': thread_count,
-                    'progress_hooks': [self.progress_hook],
-                    'noplaylist': True,
-                }
-            else:
-                return {
-                    'format': f'{fmt_id}+bestaudio[ext=m4a]/{fmt_id}+bestaudio/{fmt_id}',
-                    'outtmpl': os.path.join(download_path, f'%(title)s.{res}p.%(ext)s'),
-                    'merge_output_format': 'mp4',
-                    'keepvideo': False,
-                    'concurrent_fragment_downloads': thread_count,
-                    'postprocessors': [{'key': 'FFmpegVideoRemuxer', 'preferedformat': 'mp4'}],
-                    'progress_hooks': [self.progress_hook],
-                    'noplaylist': True,
-                }
-        else:
-            return {
-                'format': 'bestaudio/best',
-                'outtmpl': os.path.join(download_path, '%(title)s.%(ext)s'),
-                'concurrent_fragment_downloads': thread_count,
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-                'progress_hooks': [self.progress_hook],
-                'noplaylist': True,
-            }
-
-    def _update_playlist_item_status(self, idx, status, title):
+    def _on_job_event(self, ev):
+        """엔진 이벤트(워커 스레드) → 집계기 (항목별 마지막 상태만 남음)"""
+        if ev['event'] == 'item':
+            self.progress.push_item(ev)
+        elif ev['event'] == 'progress':
+            self.progress.push_overall(ev)
+
+    def _update_playlist_overall(self, st):
+        """전체 진행률과 처리량 표시 (메인 스레드)"""
+        self.progress_bar.set(st['fraction'])
+        self.status_label.configure(
+            text=f"⬇ [{st['finished']}/{st['total']}] 다운로드 중... "
+                 f"(동시 {st['active']}개"
+                 + (f", 변환 {st['processing']}개)" if st['processing'] else ")"))
+        self.detail_label.configure(
+            text=f"속도: {self.format_speed(st['speed'])} | "
+                 f"평균: {self.format_speed(st['avg_speed'])} | "
+                 f"받은 용량: {self.format_filesize(st['bytes']).strip()} | "
+                 f"남은 시간: {self.format_time(st.get('eta'))}")
+
+    def _update_playlist_item_status(self, idx, status, title, percent=None):
         """플레이리스트 체크박스의 특정 항목 상태 업데이트"""
         if status == "downloading":
-            icon = "⬇"
+            icon = "⬇" if percent is None else f"⬇ {percent:>3}%"
             color = self.ACCENT
         elif status == "done":
             icon = "✅"
@@ -1027,33 +916,37 @@ class YouTubeDownloaderGUI:
         elif status == "error":
             icon = "❌"
             color = "#ef4444"
+        elif status == "processing":
+            icon = "⚙"
+            color = self.ACCENT
+        elif status == "skipped":
+            icon = "⏭"
+            color = "#22c55e"
         else:
             icon = "⏳"
             color = self.TEXT_SECONDARY
 
-        if idx < len(self.playlist_check_widgets):
-            cb = self.playlist_check_widgets[idx]
-            cb.configure(text=f"{icon}  {idx+1:>3}.  {title}", text_color=color)
+        self.playlist_list.set_status(idx, icon, color, title)
 
-    def _playlist_download_complete(self, path, total):
+    def _playlist_download_complete(self, path, total, summary=None):
         """플레이리스트 전체 다운로드 완료"""
+        self._drain_progress(schedule=False)     # 남은 항목 상태부터 반영
         self.progress_bar.set(1.0)
         self.status_label.configure(text=f"✅ 플레이리스트 {total}개 다운로드 완료!")
-        self.detail_label.configure(text="모든 파일이 성공적으로 저장되었습니다.")
+        if summary:
+            failed = f" | 실패 {summary['failed']}개" if summary['failed'] else ""
+            self.detail_label.configure(
+                text=f"{self.format_filesize(summary['bytes']).strip()} / "
+                     f"{self.format_time(summary['elapsed'])} | "
+                     f"평균 {self.format_speed(summary['avg_speed'])}{failed}")
+        else:
+            self.detail_label.configure(text="모든 파일이 성공적으로 저장되었습니다.")
         self.file_label.configure(text="")
         self.download_btn.configure(state="normal")
         messagebox.showinfo("완료", f"플레이리스트 {total}개 다운로드 완료!\n저장 위치: {path}")
 
-    def cleanup_temp_files(self, directory):
-        """임시 파일(.temp, .part 등) 삭제"""
-        try:
-            for file in Path(directory).glob('*'):
-                if file.suffix in ['.temp', '.part', '.ytdl']:
-                    file.unlink()
-        except:
-            pass
-    
     def download_complete(self, path):
+        self._drain_progress(schedule=False)
         self.progress_bar.set(1.0)
         self.status_label.configure(text="✅ 다운로드 완료!")
         self.detail_label.configure(text="파일이 성공적으로 저장되었습니다.")
@@ -1065,6 +958,7 @@ class YouTubeDownloaderGUI:
         messagebox.showinfo("완료", f"다운로드가 완료되었습니다!\n저장 위치: {path}")
     
     def show_error(self, message):
+        self._drain_progress(schedule=False)
         self.progress_bar.set(0)
         self.status_label.configure(text="❌ 오류 발생")
         self.detail_label.configure(text="")
@@ -0,0 +1,901 @@
+"""
+yt-dlp 다운로드 엔진 (GUI 없음)
+- URL 판별 / 메타데이터 추출(디스크 캐시) / 다운로드 옵션 구성 / 플레이리스트 작업 풀
+- 진행 상황은 on_event(dict) 콜백으로 전달 → GUI 는 root.after 로, CLI 는 JSON-lines 로 출력
+
+헤드리스 배치 실행:
+    python yt_engine.py -i urls.txt -o ./out --type audio
+    python yt_engine.py -i podcasts.txt -o ./out --type audio_native   (변환 없이 원본 오디오)
+    python yt_engine.py URL --section 1:02:00-1:04:00                  (구간만, ffmpeg 필요)
+    python yt_engine.py -i urls.txt --editor                            (완료 파일을 편집기에 바로 등록)
+    cat urls.txt | python yt_engine.py -o ./out --res 1080 --parallel 4
+
+  입력: 한 줄에 URL 하나 (빈 줄, '#' 주석 무시). -i 생략 또는 '-' 이면 stdin
+  출력: stdout 에 한 줄당 JSON 이벤트 1개
+        {"event": "start", "total": N}
+        {"event": "playlist", "url": ..., "title": ..., "count": N}
+        {"event": "item", "index": i, "status": "downloading|processing|done|error|skipped", "title": ..., "percent": p}
+        {"event": "progress", "fraction": ..., "finished": ..., "failed": ..., "speed": ..., ...}
+        {"event": "error", "url": ..., "message": ...}        (URL 단위 추출 실패)
+        {"event": "done", ..., "exit": code}
+  이어받기: 저장 폴더의 .ytjobs/ 에 완료 아카이브와 작업 체크포인트를 남김
+        → 같은 목록으로 다시 실행하면 완료 항목은 건너뛰고 .part 는 이어받음 (--no-resume 로 끔)
+  종료 코드: 0 전부 성공 / 1 일부 실패 / 2 사용법 오류·입력 없음 / 3 전부 실패 / 130 중단(Ctrl+C)
+
+YouTube 가 아닌 http(s) URL 도 yt-dlp generic 추출기로 처리되므로
+로컬 HTTP 서버(python -m http.server)의 미디어 파일로 동작을 확인할 수 있다.
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+import yt_dlp
+
+from info_cache import InfoCache, cache_key, VIDEO_TTL, PLAYLIST_TTL
+from job_checkpoint import JobCheckpoint, archive_id
+from bandwidth import BandwidthScheduler, DEFAULT_PER_HOST
+from postprocess import PostProcessQueue, run_post
+from segmented import SegmentedDownload
+from editor_ingest import EditorIngest, EDITOR_URL, format_fields, media_meta
+from format_index import format_index, NATIVE_AUDIO_PREFERENCE
+
+# yt-dlp 메타데이터 캐시 위치 (편집기 workspace 와 같은 폴더)
+INFO_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'workspace', '_ytinfo')
+
+# 원본 오디오 모드 포맷 선택 (편집기가 바로 여는 m4a → opus → 그 외 순)
+NATIVE_AUDIO_FORMAT = 'bestaudio[ext=m4a]/bestaudio[acodec=opus]/bestaudio/best'
+
+# 다운로드 불가 플레이리스트 항목 (Private, Deleted 등)
+SKIP_TITLES = {'[private video]', '[deleted video]', '[unavailable video]'}
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_FAILED = 3
+EXIT_INTERRUPTED = 130
+
+
+class JobCancelled(Exception):
+    """작업 취소 – progress_hook 에서 발생시켜 진행 중인 전송을 멈춘다"""
+
+
+# ─── URL / 옵션 ───
+
+def detect_url_type(url):
+    """
+    URL 타입 감지.
+    Returns: (clean_url, is_playlist)
+    - list= 파라미터 있음 (라디오 포함) → 플레이리스트
+    - 그 외 → 단일 영상
+    """
+    parsed = urlparse(url)
+    params = parse_qs(parsed.query)
+
+    if 'list' in params:
+        # list 파라미터가 있으면 플레이리스트로 처리 (RD 라디오 포함)
+        return url, True
+
+    # 단일 영상
+    clean_params = {}
+    if 'v' in params:
+        clean_params['v'] = params['v'][0]
+    clean_query = urlencode(clean_params)
+    return urlunparse(parsed._replace(query=clean_query)), False
+
+
+def entry_url(entry):
+    """flat 플레이리스트 항목 → 영상 URL"""
+    video_id = entry.get('url') or entry.get('id')
+    if video_id and not video_id.startswith('http'):
+        return f"https://www.youtube.com/watch?v={video_id}"
+    return video_id
+
+
+def filter_entries(entries):
+    """다운로드 불가 항목 제거"""
+    return [e for e in entries if e and
+            (e.get('title') or '').strip().lower() not in SKIP_TITLES and
+            e.get('id') is not None]
+
+
+def parse_time_ranges(text):
+    """
+    구간 문자열 → [(시작초, 끝초), ...].
+    예: "1:02:00-1:04:00, 95-130.5"  (h:m:s / m:s / 초, 쉼표로 여러 구간)
+    빈 문자열 → [] (전체 다운로드)
+    """
+    def seconds(part):
+        part = part.strip()
+        total = 0.0
+        for piece in part.split(':'):
+            total = total * 60 + float(piece)
+        return total
+
+    ranges = []
+    for chunk in (text or '').split(','):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        start, sep, end = chunk.partition('-')
+        try:
+            if not sep:
+                raise ValueError
+            s, e = seconds(start), seconds(end)
+        except ValueError:
+            raise ValueError(f"구간 형식 오류: '{chunk}' (예: 1:02:00-1:04:00)")
+        if e <= s:
+            raise ValueError(f"구간 끝이 시작보다 빠름: '{chunk}'")
+        ranges.append((s, e))
+    return ranges
+
+
+def range_opts(ranges):
+    """
+    구간 다운로드 옵션. yt-dlp 가 ffmpeg 로 구간만 받는다
+    (HLS/DASH 는 해당 조각만, 단일 파일 포맷은 HTTP Range 로 탐색).
+    force_keyframes_at_cuts=False → 재인코딩 없이 키프레임 단위로 자름
+    """
+    if not ranges:
+        return {}
+    return {
+        'download_ranges': yt_dlp.utils.download_range_func(None, ranges),
+        'force_keyframes_at_cuts': False,
+    }
+
+
+def _section_tmpl(tmpl, ranges):
+    """구간마다 파일이 따로 생기므로 파일명에 구간(초) 표시"""
+    if not ranges:
+        return tmpl
+    return tmpl.replace('.%(ext)s', '.%(section_start)d-%(section_end)ds.%(ext)s')
+
+
+def plan_download(single_info, selected_format, download_path, download_type, ranges=None):
+    """
+    플레이리스트 항목 다운로드 계획.
+    네트워크 단계(포맷별 1회 전송)와 후처리(병합/변환)를 분리해 두면
+    후처리는 PostProcessQueue 에서 다음 항목 전송과 겹쳐 실행된다.
+    ranges 가 있으면 구간만 받는다 (영상+오디오 병합은 ffmpeg 가 구간 전송과 함께 처리).
+    Returns: {'outtmpl', 'steps': [format, ...], 'optional': 실패해도 되는 단계 수,
+              'post': None | tuple, 'extra': 추가 ydl 옵션}
+    """
+    plan = _plan_formats(single_info, selected_format, download_path, download_type, ranges)
+    plan['outtmpl'] = _section_tmpl(plan['outtmpl'], ranges)
+    plan['extra'] = dict(plan.get('extra', {}), **range_opts(ranges))
+    return plan
+
+
+def _plan_formats(single_info, selected_format, download_path, download_type, ranges):
+    index = format_index(single_info)
+    if download_type == 'video':
+        # 선택 해상도와 가장 가까운 포맷 (병합/재인코딩이 필요 없는 조합 우선)
+        target_res = selected_format['resolution'] if selected_format else 720
+        choice = index.best_video(target_res)
+        if choice is None:
+            return {
+                'outtmpl': os.path.join(download_path, f'%(title)s.{target_res}p.%(ext)s'),
+                'steps': ['best'], 'optional': 0, 'post': None,
+            }
+        fmt_id = choice['video']['format_id']
+        res = choice['height']
+
+        if not choice['merge']:
+            return {
+                'outtmpl': os.path.join(download_path, f'%(title)s.{res}p.%(ext)s'),
+                'steps': [fmt_id], 'optional': 0, 'post': None,
+            }
+        # 영상 코덱과 짝 맞는 오디오 (스트림 복사 병합) – 만료 등으로 없으면 일반 선택으로 대체
+        audio = f"{choice['audio']['format_id']}/bestaudio[ext=m4a]/bestaudio"
+        container = choice['container']
+        if ranges:
+            # 구간 다운로드는 두 스트림을 한 번에 받아 병합 (구간별 파일 짝 맞추기 불필요)
+            return {
+                'outtmpl': os.path.join(download_path, f'%(title)s.{res}p.%(ext)s'),
+                'steps': [f"{fmt_id}+{choice['audio']['format_id']}/{fmt_id}+bestaudio/{fmt_id}"],
+                'optional': 0, 'post': None,
+                'extra': {'merge_output_format': container},
+            }
+        # 영상/오디오 따로 받아 병합 (오디오를 못 받으면 영상만 리먹스)
+        return {
+            'outtmpl': os.path.join(download_path, f'%(title)s.{res}p.f%(format_id)s.%(ext)s'),
+            'steps': [fmt_id, audio], 'optional': 1,
+            'post': ('merge', container),
+        }
+    if download_type == 'audio_native':
+        # 변환 없이 원본 오디오 스트림 그대로 (AAC m4a 우선, 없으면 opus 등)
+        best = index.best_audio(NATIVE_AUDIO_PREFERENCE)
+        return {
+            'outtmpl': os.path.join(download_path, '%(title)s.%(ext)s'),
+            'steps': [f"{best['format_id']}/{NATIVE_AUDIO_FORMAT}" if best else NATIVE_AUDIO_FORMAT],
+            'optional': 0,
+            'post': ('native', 'm4a'),
+        }
+    # MP3 변환 – 이미 mp3 인 포맷이 있으면 변환 생략 (run_post 가 그대로 통과)
+    best = index.best_audio(('mp3',))
+    return {
+        'outtmpl': os.path.join(download_path, '%(title)s.%(ext)s'),
+        'steps': [f"{best['format_id']}/bestaudio/best" if best else 'bestaudio/best'],
+        'optional': 0,
+        'post': ('audio', 'mp3', '192'),
+    }
+
+
+def step_opts(plan, fmt, thread_count, progress_hook):
+    """계획의 네트워크 단계 1개 → ydl_opts (후처리 없음)"""
+    return dict({
+        'format': fmt,
+        'outtmpl': plan['outtmpl'],
+        'concurrent_fragment_downloads': thread_count,
+        'progress_hooks': [progress_hook],
+        'noplaylist': True,
+    }, **plan.get('extra', {}))
+
+
+def build_selected_opts(selected_format, download_path, download_type,
+                        thread_count, progress_hook, ranges=None):
+    """사용자가 고른 포맷 그대로 받는 단일 영상 옵션 (GUI 단일 다운로드용)"""
+    opts = _selected_opts(selected_format, download_path, download_type,
+                          thread_count, progress_hook)
+    opts['outtmpl'] = _section_tmpl(opts['outtmpl'], ranges)
+    opts.update(range_opts(ranges))
+    return opts
+
+
+def _selected_opts(selected_format, download_path, download_type,
+                   thread_count, progress_hook):
+    if download_type == 'video':
+        format_id = selected_format['format_id']
+        resolution = selected_format['resolution']
+
+        # 오디오가 포함된 포맷이면 그대로 다운로드
+        if selected_format['has_audio']:
+            return {
+                'format': format_id,
+                'outtmpl': os.path.join(download_path, f'%(title)s.{resolution}p.%(ext)s'),
+                'concurrent_fragment_downloads': thread_count,  # 멀티스레드 설정
+                'progress_hooks': [progress_hook],
+            }
+        # 오디오가 없으면 별도 다운로드 후 병합 (목록에서 짝지어 둔 오디오 우선 → 스트림 복사)
+        paired = f"{format_id}+{selected_format['audio_id']}/" if selected_format.get('audio_id') else ''
+        return {
+            'format': f'{paired}{format_id}+bestaudio[ext=m4a]/{format_id}+bestaudio/{format_id}',
+            'outtmpl': os.path.join(download_path, f'%(title)s.{resolution}p.%(ext)s'),
+            'merge_output_format': 'mp4',
+            'keepvideo': False,
+            'concurrent_fragment_downloads': thread_count,  # 멀티스레드 설정
+            'postprocessors': [{
+                'key': 'FFmpegVideoRemuxer',
+                'preferedformat': 'mp4',
+            }],
+            'progress_hooks': [progress_hook],
+        }
+
+    # 오디오 다운로드
+    native = download_type == 'audio_native'
+    format_id = NATIVE_AUDIO_FORMAT if native else 'bestaudio/best'
+    filename_template = '%(title)s.%(ext)s'
+    if selected_format:
+        format_id = selected_format['format_id']
+        abr = selected_format.get('abr', '')
+        if abr and isinstance(abr, (int, float)):
+            filename_template = f'%(title)s.{int(abr)}kbps.%(ext)s'
+    if native:
+        # 원본 스트림 유지 – m4a/webm/opus 는 편집기가 그대로 열 수 있음
+        return {
+            'format': format_id,
+            'outtmpl': os.path.join(download_path, filename_template),
+            'concurrent_fragment_downloads': thread_count,  # 멀티스레드 설정
+            'progress_hooks': [progress_hook],
+        }
+    return {
+        'format': format_id,
+        'outtmpl': os.path.join(download_path, filename_template),
+        'concurrent_fragment_downloads': thread_count,  # 멀티스레드 설정
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': '192',
+        }],
+        'progress_hooks': [progress_hook],
+    }
+
+
+def cleanup_temp_files(paths):
+    """
+    완료된 항목의 남은 임시 파일(.temp, .part, .ytdl) 삭제.
+    폴더 전체를 지우지 않음 → 실패/중단 항목의 .part 는 다음 실행에서 이어받는다
+    """
+    for path in paths:
+        file = Path(path)
+        if file.suffix in ['.temp', '.part', '.ytdl']:
+            try:
+                file.unlink()
+            except OSError:
+                pass
+
+
+# ─── 메타데이터 추출 ───
+
+class DownloadEngine:
+    """
+    메타데이터 추출 + 다운로드 실행 (cache=None 이면 캐시 없이 매번 추출).
+    모든 다운로드는 같은 BandwidthScheduler 를 거쳐 전체 속도 상한 / 호스트별 연결 수를 공유한다
+    """
+
+    def __init__(self, cache=None, scheduler=None, post_queue=None, ingest=None):
+        self.cache = cache
+        self.scheduler = scheduler or BandwidthScheduler()
+        self.post_queue = post_queue or PostProcessQueue()
+        self.ingest = ingest            # EditorIngest – 완료 파일을 편집기에 바로 등록 (None = 안 함)
+
+    def extract(self, url, ydl_opts, ttl):
+        """디스크 캐시 우선 메타데이터 추출 (JSON 직렬화 가능한 sanitize 된 info 반환)"""
+        def extract():
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                return ydl.sanitize_info(ydl.extract_info(url, download=False))
+        if self.cache is None:
+            return extract()
+        return self.cache.get_or_extract(cache_key(url), ttl, extract)
+
+    def invalidate(self, url):
+        if self.cache is not None:
+            self.cache.invalidate(cache_key(url))
+
+    def extract_single_info(self, video_url):
+        """단일 영상 메타데이터 추출 (다운로드 없음)"""
+        info_opts = {
+            'quiet': True, 'no_warnings': True,
+            'noplaylist': True,
+            'no_check_certificates': True, 'geo_bypass': True,
+        }
+        return self.extract(video_url, info_opts, VIDEO_TTL)
+
+    def extract_playlist(self, url):
+        """플레이리스트 목록만 빠르게 추출 → (info, 다운로드 가능한 entries)"""
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'noplaylist': False,
+            'extract_flat': 'in_playlist',   # 빠른 목록만 추출
+            'no_check_certificates': True,
+            'geo_bypass': True,
+        }
+        info = self.extract(url, ydl_opts, PLAYLIST_TTL)
+        return info, filter_entries(list(info.get('entries') or []))
+
+    def download(self, ydl_opts, target, page_url=None, segmented=True):
+        """
+        스케줄러에서 연결을 빌려 다운로드.
+        target: URL 문자열 → ydl.download, 추출된 info dict → process_ie_result (재추출 없음)
+        조각 동시 연결 수는 ydl_opts['concurrent_fragment_downloads'] 를 상한으로 자동 조절.
+        info dict 로 받을 때 선택 포맷이 단일 파일(http/https)이면 분할 다운로더로 여러 연결 사용
+        (yt-dlp 후처리가 붙은 옵션은 제외).
+        Returns: {'files': 최종 파일 경로들, 'formats': 받은 포맷 요약들 (editor_ingest.format_fields)}
+        """
+        page_url = page_url or (target if isinstance(target, str) else target.get('webpage_url', ''))
+        host = urlparse(page_url).netloc.lower() or 'local'
+        want = ydl_opts.get('concurrent_fragment_downloads', 1)
+        if (segmented and not isinstance(target, str) and 'download_ranges' not in ydl_opts
+                and not ydl_opts.get('postprocessors')):
+            resolved = self.resolve_progressive(ydl_opts, target)
+            if resolved:
+                url, headers, filename, fmt = resolved
+                self.download_segmented(url, headers, filename, host=host, want=want,
+                                        hooks=ydl_opts.get('progress_hooks', []))
+                return {'files': [filename], 'formats': [fmt]}
+
+        result = {'files': [], 'formats': []}
+
+        def collect(d):
+            if d['status'] == 'finished' and d.get('info_dict'):
+                result['formats'].append(format_fields(d['info_dict']))
+
+        lease = self.scheduler.acquire(host, want)
+        ydl_opts = dict(ydl_opts)
+        ydl_opts['progress_hooks'] = [lease.report, collect] + list(ydl_opts.get('progress_hooks', []))
+        # 후처리(병합/변환)까지 끝난 최종 경로
+        ydl_opts['post_hooks'] = list(ydl_opts.get('post_hooks', [])) + [result['files'].append]
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                lease.bind(ydl.params)
+                if isinstance(target, str):
+                    ydl.download([target])
+                else:
+                    ydl.process_ie_result(target, download=True)
+        finally:
+            lease.release()
+        return result
+
+    def resolve_progressive(self, ydl_opts, info):
+        """
+        ydl_opts 의 format 으로 포맷 선택만 수행.
+        단일 파일 http(s) 포맷이면 (url, headers, 저장 경로, 포맷 요약), 조각/병합 포맷이면 None
+        """
+        opts = dict(ydl_opts, quiet=True, no_warnings=True, progress_hooks=[])
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            r = ydl.process_ie_result(copy.deepcopy(info), download=False)
+            if (r.get('requested_formats') or not r.get('url')
+                    or r.get('protocol') not in ('http', 'https')):
+                return None
+            return r['url'], r.get('http_headers') or {}, ydl.prepare_filename(r), format_fields(r)
+
+    def download_segmented(self, url, headers, filename, host, want, hooks=()):
+        """분할 다운로드 – 연결 수는 스케줄러가 빌려 준 만큼, 속도 상한도 스케줄러 몫을 따름"""
+        lease = self.scheduler.acquire(host, want)
+
+        def hook(d):
+            lease.report(d)
+            for h in hooks:
+                h(d)
+        try:
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+            SegmentedDownload(url, filename, lease.fragments, headers,
+                              progress_hook=hook, rate_limit=lambda: lease.rate_limit).run()
+        finally:
+            lease.release()
+
+    def send_to_editor(self, files, info, formats=(), audio_only=False, ranges=None):
+        """
+        완료 파일을 편집기에 등록 (ingest 가 없으면 아무것도 안 함).
+        구간 다운로드는 길이가 원본과 다르므로 메타데이터 없이 보내 편집기가 ffprobe 하게 함
+        """
+        if self.ingest is None:
+            return
+        meta = {} if ranges else media_meta(info, formats, audio_only)
+        for path in files:
+            self.ingest.submit(path, meta)
+
+    def playlist_job(self, entries, **kwargs):
+        return PlaylistJob(self, entries, **kwargs)
+
+
+# ─── 플레이리스트 작업 ───
+
+class PlaylistJob:
+    """
+    항목 묶음을 워커 풀로 동시 N개씩 다운로드.
+    메타데이터 추출은 별도 풀에서 앞서 진행 → 항목 N 전송 중에 N+parallel 추출.
+    resume=True 면 저장 폴더의 아카이브/체크포인트로 완료 항목을 건너뛰고
+    남아 있는 .part 파일에서 이어받는다.
+    on_event 는 워커 스레드에서 호출된다.
+    """
+
+    def __init__(self, engine, entries, indices=None, selected_format=None,
+                 download_path='.', download_type='video', thread_count=4,
+                 parallel=3, on_event=None, ydl_overrides=None, resume=True,
+                 ranges=None, segmented=True):
+        self.engine = engine
+        self.entries = entries
+        self.indices = list(range(len(entries))) if indices is None else list(indices)
+        self.selected_format = selected_format
+        self.download_path = download_path
+        self.download_type = download_type
+        self.thread_count = thread_count
+        self.on_event = on_event or (lambda ev: None)
+        self.ydl_overrides = ydl_overrides or {}
+        self.resume = resume
+        self.ranges = ranges or []
+        self.segmented = segmented
+
+        # 작업 전체 진행 상태 (항목별 상태는 items[index])
+        self.lock = threading.Lock()
+        self.items = {}
+        self.total = len(entries)
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes = 0
+        self.start = time.monotonic()
+        self.parallel = min(parallel, self.total) or 1
+        self.urls = [entry_url(e) for e in entries]
+        self.aids = [archive_id(e, cache_key(u)) for e, u in zip(entries, self.urls)]
+        self.pending = []           # k → 이번 실행에서 받을 항목 위치 (entries 기준)
+        self.infos = {}             # k → 메타데이터 추출 Future
+        self.prefetched = set()
+        self.leftovers = []         # 완료 항목의 임시 파일 → 작업 끝에 삭제
+        self.post_futures = []      # 후처리 큐에 넘긴 항목
+        self.checkpoint = None
+        self.cancelled = threading.Event()
+        self._extract_pool = None
+
+    def _variant(self):
+        """같은 폴더라도 결과물이 다른 작업(오디오 / 해상도별 영상)은 아카이브를 따로 쓴다"""
+        if self.download_type != 'video':
+            variant = self.download_type
+        else:
+            res = self.selected_format['resolution'] if self.selected_format else 720
+            variant = f'video-{res}'
+        if self.ranges:
+            variant += '-' + '_'.join(f'{s:g}-{e:g}' for s, e in self.ranges)
+        return variant
+
+    def run(self):
+        """모든 항목을 처리하고 최종 summary 반환"""
+        Path(self.download_path).mkdir(parents=True, exist_ok=True)
+        if self.resume:
+            self.checkpoint = JobCheckpoint(self.download_path, self._variant(), self.aids)
+
+        # 아카이브에 있는 항목은 추출/다운로드 없이 건너뜀 (set 조회, 항목당 O(1))
+        for i, (entry, index) in enumerate(zip(self.entries, self.indices)):
+            if self.checkpoint and self.checkpoint.is_done(self.aids[i]):
+                self.skipped += 1
+                self._emit(event='item', index=index, status='skipped',
+                           title=entry.get('title', entry.get('id') or f'영상 {i+1}'))
+            else:
+                self.pending.append(i)
+        if self.skipped:
+            self._emit_progress()
+        self.parallel = min(self.parallel, len(self.pending)) or 1
+
+        self._extract_pool = ThreadPoolExecutor(max_workers=self.parallel)
+        try:
+            for k in range(self.parallel):
+                self._prefetch(k)
+            with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+                futures = [
+                    pool.submit(self._download_item, self.entries[i], self.indices[i], k)
+                    for k, i in enumerate(self.pending)
+                ]
+                try:
+                    for fut in as_completed(futures):
+                        fut.result()
+                except BaseException:
+                    # Ctrl+C 등 → 대기 항목 취소, 진행 중 항목은 hook 에서 중단
+                    self.cancel()
+                    for fut in futures:
+                        fut.cancel()
+                    for fut in self.post_futures:
+                        fut.cancel()
+                    raise
+            # 마지막 전송이 끝난 뒤 남은 후처리 대기
+            wait(list(self.post_futures))
+        finally:
+            self._extract_pool.shutdown(wait=False, cancel_futures=True)
+
+        cleanup_temp_files(self.leftovers)
+        if self.checkpoint and not self.failed:
+            self.checkpoint.finish()
+        return self.summary()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _emit(self, **ev):
+        self.on_event(ev)
+
+    def _emit_progress(self):
+        self._emit(event='progress', total=self.total, **self.summary())
+
+    def _download_item(self, entry, index, k):
+        """항목 1개 다운로드 (워커 스레드에서 실행)"""
+        if self.cancelled.is_set():
+            return
+        aid = self.aids[self.pending[k]]
+        url = self.urls[self.pending[k]]
+        title = entry.get('title', entry.get('id') or f'영상 {k+1}')
+        state = {'done_bytes': 0, 'downloaded': 0, 'total': 0, 'speed': 0, 'step': -1,
+                 'files': [], 'formats': [], 'info': None}
+        with self.lock:
+            self.items[index] = state
+
+        # 현재 다운로드 중 표시 (이전 실행의 .part 가 남아 있으면 이어받기)
+        resumed = bool(self.checkpoint and self.checkpoint.partial_files(aid))
+        self._emit(event='item', index=index, status='downloading', title=title,
+                   resumed=resumed)
+
+        error = None
+        post = None
+        files = []          # 단계별로 받은 파일 (후처리 입력)
+        outputs = []        # 후처리 없이 끝나는 경우의 최종 파일
+        try:
+            # 개별 영상 정보: 미리 시작된 추출 결과 사용 + 다음 차례 항목 추출 시작
+            self._prefetch(k)
+            self._prefetch(k + self.parallel)
+            with self.lock:
+                info_future = self.infos.pop(k)
+            single_info = info_future.result()
+            state['info'] = single_info
+            title = single_info.get('title') or title
+
+            plan = plan_download(single_info, self.selected_format,
+                                 self.download_path, self.download_type, self.ranges)
+            post = plan['post']
+            hook = self._make_hook(state, index, title, aid)
+            for n, fmt in enumerate(plan['steps']):
+                ydl_opts = step_opts(plan, fmt, self.thread_count, hook)
+                ydl_opts.update(self.ydl_overrides)
+                state['finished_files'] = []
+                try:
+                    # 이미 추출한 info dict 로 바로 다운로드 (페이지 재추출 없음)
+                    # process_ie_result 가 ydl_opts 의 format 으로 포맷 선택을 다시 수행한다
+                    result = self.engine.download(ydl_opts, single_info, url,
+                                                  segmented=self.segmented)
+                except Exception:
+                    if n < len(plan['steps']) - plan['optional']:
+                        raise
+                    continue
+                files.extend(state['finished_files'])
+                outputs.extend(result['files'])
+                state['formats'].extend(result['formats'])
+        except Exception as e:
+            error = str(e)
+            # 캐시된 포맷 URL 이 만료됐을 수 있음 → 재시도 시 새로 추출
+            self.engine.invalidate(url)
+
+        # 네트워크 단계 끝 → 이 항목의 전송 상태 정리 (후처리는 별도 큐)
+        with self.lock:
+            state['speed'] = 0
+            state['done_bytes'] += state['downloaded']
+            state['downloaded'] = 0
+            self.bytes += state['done_bytes']
+            del self.items[index]
+
+        if error is None and post and files:
+            self._emit(event='item', index=index, status='processing', title=title)
+            fut = self.engine.post_queue.submit(self._post_item, post, files,
+                                                index, aid, title, state)
+            with self.lock:
+                self.post_futures.append(fut)
+        else:
+            self._finish_item(index, aid, title, state, error, outputs)
+
+    def _post_item(self, post, files, index, aid, title, state):
+        """후처리 큐 워커에서 실행 – 병합/변환 후 항목 완료 처리"""
+        outputs = []
+        try:
+            if post[0] in ('audio', 'native'):
+                # 파일별 독립 처리 (구간 다운로드면 구간마다 파일 1개)
+                for f in files:
+                    outputs.append(run_post(post, [f]))
+            else:
+                outputs.append(run_post(post, files))
+            error = None
+        except Exception as e:
+            error = str(e)
+        self._finish_item(index, aid, title, state, error, outputs)
+
+    def _finish_item(self, index, aid, title, state, error, outputs=()):
+        """항목 최종 결과 반영 (네트워크 워커 또는 후처리 워커에서 호출)"""
+        ok = error is None
+        if ok and outputs and state['info']:
+            # 편집기 등록 – 방금 쓴 파일이라 파형 디코드가 페이지 캐시에서 읽힘
+            self.engine.send_to_editor(outputs, state['info'], state['formats'],
+                                       self.download_type != 'video', self.ranges)
+        if self.checkpoint:
+            self.checkpoint.mark(aid, 'done' if ok else 'error')
+        with self.lock:
+            if ok:
+                self.done += 1
+                self.leftovers.extend(state['files'])
+            else:
+                self.failed += 1
+        if ok:
+            self._emit(event='item', index=index, status='done', title=title)
+        else:
+            self._emit(event='item', index=index, status='error', title=title, error=error)
+        self._emit_progress()
+
+    def _prefetch(self, k):
+        """k번째 항목의 메타데이터 추출을 미리 시작 (항목당 1회)"""
+        if k >= len(self.pending):
+            return
+        with self.lock:
+            if k in self.prefetched:
+                return
+            self.prefetched.add(k)
+            self.infos[k] = self._extract_pool.submit(self.engine.extract_single_info,
+                                                      self.urls[self.pending[k]])
+
+    def _make_hook(self, state, index, title, aid):
+        """항목 전용 progress_hook – 항목별 상태 갱신 후 5% 단위로만 이벤트 발생"""
+        def hook(d):
+            if self.cancelled.is_set():
+                raise JobCancelled()
+            if d['status'] == 'downloading':
+                tmp = d.get('tmpfilename')
+                if tmp and tmp not in state['files']:
+                    # 새 임시 파일 → 체크포인트에 기록 (중단 후 이어받기 / 완료 후 정리 대상)
+                    files = [tmp, d.get('filename', tmp) + '.ytdl']
+                    state['files'].extend(files)
+                    if self.checkpoint:
+                        self.checkpoint.mark(aid, 'partial', files)
+                downloaded = d.get('downloaded_bytes', 0) or 0
+                total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+                with self.lock:
+                    state['downloaded'] = downloaded
+                    state['total'] = total
+                    state['speed'] = d.get('speed') or 0
+                percent = (downloaded / total) * 100 if total else 0
+                rounded = min(100, int(percent // 5) * 5)
+                if rounded == state['step']:
+                    return
+                state['step'] = rounded
+                self._emit(event='item', index=index, status='downloading',
+                           title=title, percent=rounded)
+                self._emit_progress()
+            elif d['status'] == 'finished':
+                # 단계(포맷)마다 finished 가 옴 → 받은 파일 기록, 용량 누적 후 리셋
+                if d.get('filename'):
+                    state['finished_files'].append(d['filename'])
+                with self.lock:
+                    state['done_bytes'] += d.get('downloaded_bytes') or d.get('total_bytes') or 0
+                    state['downloaded'] = 0
+                    state['speed'] = 0
+                state['step'] = -1
+        return hook
+
+    def summary(self):
+        """작업 전체 진행률 / 속도 / 누적 용량 계산"""
+        with self.lock:
+            finished = self.done + self.failed + self.skipped
+            partial = sum(st['downloaded'] / st['total']
+                          for st in self.items.values() if st['total'])
+            speed = sum(st['speed'] for st in self.items.values())
+            received = self.bytes + sum(st['done_bytes'] + st['downloaded']
+                                        for st in self.items.values())
+            active = len(self.items)
+            processing = sum(1 for f in self.post_futures if not f.done())
+            failed = self.failed
+        elapsed = max(0.001, time.monotonic() - self.start)
+        return {
+            'fraction': min(1.0, (finished + partial) / max(1, self.total)),
+            'finished': finished,
+            'failed': failed,
+            'skipped': self.skipped,
+            'active': active,
+            'processing': processing,
+            'speed': speed,
+            'avg_speed': received / elapsed,
+            'bytes': received,
+            'elapsed': elapsed,
+        }
+
+
+# ─── CLI ───
+
+def read_urls(source):
+    """한 줄에 URL 하나, 빈 줄과 '#' 주석은 무시"""
+    for line in source:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+class _JsonLines:
+    """워커 스레드에서 동시에 호출돼도 줄이 섞이지 않는 JSON-lines 출력"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def __call__(self, ev):
+        line = json.dumps(ev, ensure_ascii=False, default=str)
+        with self.lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+
+def _parse_args(argv):
+    p = argparse.ArgumentParser(
+        prog='yt_engine',
+        description='헤드리스 yt-dlp 배치 다운로더 (진행 상황은 stdout JSON-lines)')
+    p.add_argument('urls', nargs='*', help='URL (생략 시 -i 파일 또는 stdin 에서 읽음)')
+    p.add_argument('-i', '--input', help="URL 목록 파일 ('-' = stdin)")
+    p.add_argument('-o', '--output', default=os.path.join(os.path.expanduser('~'), 'Downloads', 'YouTube'),
+                   help='저장 폴더')
+    p.add_argument('--type', choices=('video', 'audio', 'audio_native'), default='video',
+                   dest='download_type',
+                   help='audio = MP3 변환, audio_native = 원본 오디오 유지 (변환 없음)')
+    p.add_argument('--res', type=int, default=720, help='목표 해상도 (video)')
+    p.add_argument('--section', action='append', default=[], metavar='START-END',
+                   help='이 구간만 다운로드 (예: 1:02:00-1:04:00, 여러 번 지정 가능)')
+    p.add_argument('--threads', type=int, default=4, help='항목당 조각 동시 다운로드 수 상한 (1~12, 속도 보고 자동 조절)')
+    p.add_argument('--parallel', type=int, default=3, help='동시 다운로드 항목 수 (1~8)')
+    p.add_argument('--limit-rate', type=float, default=0,
+                   help='전체 다운로드 속도 상한 MB/s (0 = 무제한)')
+    p.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST,
+                   help='호스트당 최대 연결 수 (모든 항목 합)')
+    p.add_argument('--no-segmented', action='store_true',
+                   help='단일 파일 포맷도 연결 1개로 받음 (분할 다운로드 끔)')
+    p.add_argument('--editor', nargs='?', const=EDITOR_URL, metavar='URL',
+                   help=f'완료 파일을 편집기(app.py)에 바로 등록 (기본 {EDITOR_URL})')
+    p.add_argument('--no-cache', action='store_true', help='메타데이터 디스크 캐시 사용 안 함')
+    p.add_argument('--no-resume', action='store_true',
+                   help='아카이브/체크포인트 무시하고 모든 항목을 다시 받음')
+    return p.parse_args(argv)
+
+
+def main(argv=None, stdin=None, stdout=None):
+    args = _parse_args(argv)
+    stdin = stdin or sys.stdin
+    emit = _JsonLines(stdout or sys.stdout)
+
+    urls = list(args.urls)
+    if args.input and args.input != '-':
+        try:
+            with open(args.input, encoding='utf-8') as fp:
+                urls += list(read_urls(fp))
+        except OSError as e:
+            emit({'event': 'error', 'message': f'입력 파일 오류: {e}'})
+            return EXIT_USAGE
+    elif args.input == '-' or not urls:
+        urls += list(read_urls(stdin))
+    if not urls:
+        emit({'event': 'error', 'message': '입력 URL 없음'})
+        return EXIT_USAGE
+
+    try:
+        ranges = parse_time_ranges(','.join(args.section))
+    except ValueError as e:
+        emit({'event': 'error', 'message': str(e)})
+        return EXIT_USAGE
+
+    engine = DownloadEngine(
+        None if args.no_cache else InfoCache(INFO_CACHE_DIR),
+        BandwidthScheduler(max_rate=int(args.limit_rate * 1024 * 1024),
+                           per_host=max(1, args.per_host)),
+        ingest=EditorIngest(args.editor) if args.editor else None)
+    entries = []
+    bad_urls = 0
+    try:
+        # 플레이리스트는 항목으로 펼쳐 하나의 작업 풀에서 처리
+        for url in urls:
+            clean_url, is_playlist = detect_url_type(url)
+            if not is_playlist:
+                entries.append({'url': clean_url, 'id': clean_url, 'title': clean_url})
+                continue
+            try:
+                info, items = engine.extract_playlist(clean_url)
+            except Exception as e:
+                bad_urls += 1
+                emit({'event': 'error', 'url': url, 'message': str(e)})
+                continue
+            emit({'event': 'playlist', 'url': url, 'title': info.get('title'),
+                  'count': len(items)})
+            entries += items
+
+        emit({'event': 'start', 'total': len(entries)})
+        job = engine.playlist_job(
+            entries,
+            selected_format={'resolution': args.res},
+            download_path=args.output,
+            download_type=args.download_type,
+            thread_count=max(1, min(12, args.threads)),
+            parallel=max(1, min(8, args.parallel)),
+            on_event=emit,
+            # stdout 은 JSON-lines 전용 → yt-dlp 자체 출력은 끔 (오류는 stderr)
+            ydl_overrides={'quiet': True, 'no_warnings': True, 'noprogress': True},
+            resume=not args.no_resume,
+            ranges=ranges,
+            segmented=not args.no_segmented,
+        )
+        summary = job.run() if entries else job.summary()
+    except KeyboardInterrupt:
+        emit({'event': 'done', 'interrupted': True, 'exit': EXIT_INTERRUPTED})
+        return EXIT_INTERRUPTED
+    finally:
+        if engine.ingest:
+            engine.ingest.shutdown()    # 남은 등록 요청 전송 후 종료
+
+    failed = summary['failed'] + bad_urls
+    if failed == 0:
+        code = EXIT_OK
+    elif failed >= len(entries) + bad_urls:
+        code = EXIT_FAILED
+    else:
+        code = EXIT_PARTIAL
+    emit({'event': 'done', 'total': len(entries), **summary, 'exit': code})
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())